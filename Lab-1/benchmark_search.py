@@ -0,0 +1,68 @@
+"""Сравнение режимов поиска модуля binary_search на больших таблицах.
+
+Для каждого распределения ключей выводится среднее число проб на запрос
+и время одного поиска в наносекундах.
+"""
+import random
+import time
+
+import binary_search
+import carray
+
+
+SIZE = 10 ** 6
+QUERIES = 10 ** 5
+SEED = 22
+
+
+def make_tables(rng):
+    """Равномерная и скошенная отсортированные таблицы ключей."""
+    uniform = sorted(rng.choices(range(SIZE * 1000), k=SIZE))
+    skewed = sorted(int(rng.paretovariate(1.2) * 1000) for _ in range(SIZE))
+    return {'uniform': uniform, 'skewed': skewed}
+
+
+def measure(lookup, queries):
+    """Среднее число проб и время одного поиска в наносекундах."""
+    probes = sum(lookup(query)[1] for query in queries)
+    start = time.perf_counter_ns()
+    for query in queries:
+        lookup(query)
+    elapsed = time.perf_counter_ns() - start
+    return probes / len(queries), elapsed / len(queries)
+
+
+def lookups(data):
+    """Функции поиска для каждого режима."""
+    table = carray.carray('q', data)
+    learned = binary_search.LearnedIndex(table)
+    step = len(data) / (data[-1] - data[0] + 1)
+    result = {
+        mode: (lambda query, mode=mode:
+               binary_search.search(table, query, mode=mode, probes=True))
+        for mode in ['binary', 'interpolation']
+    }
+    result['exponential'] = lambda query: binary_search.search(
+        table, query, mode='exponential',
+        hint=int((query - data[0]) * step), probes=True
+    )
+    result[f'learned ({learned.segments} segments)'] = (
+        lambda query: learned.find(query, probes=True)
+    )
+    return result
+
+
+def main():
+    """Запуск сравнения."""
+    rng = random.Random(SEED)
+    for name, data in make_tables(rng).items():
+        queries = rng.choices(data, k=QUERIES)
+        print(f'{name}: {len(data)} keys, {len(queries)} queries')
+        for mode, lookup in lookups(data).items():
+            probes, nanoseconds = measure(lookup, queries)
+            print(f'  {mode:<28} {probes:6.2f} probes/query '
+                  f'{nanoseconds:8.1f} ns/lookup')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,41 +1,2060 @@
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
+#include <math.h>
+#include <stdint.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+
+
+typedef struct
+{
+    PyObject* obj;
+    PyObject** items;
+    Py_ssize_t size;
+} sequence;
+
+
+static int get_sequence(PyObject* obj, sequence* seq)
+{
+    if(PyTuple_Check(obj))
+    {
+        Py_INCREF(obj);
+        seq->obj = obj;
+        seq->items = PySequence_Fast_ITEMS(obj);
+        seq->size = PyTuple_GET_SIZE(obj);
+        return 0;
+    }
+    Py_INCREF(obj);
+    seq->obj = obj;
+    seq->items = NULL;
+    seq->size = PySequence_Size(obj);
+    if(seq->size == -1)
+    {
+        Py_DECREF(obj);
+        return -1;
+    }
+    return 0;
+}
+
+
+static int compare_at(sequence* seq, Py_ssize_t index, PyObject* key,
+                      int op)
+{
+    if(seq->items != NULL)
+        return PyObject_RichCompareBool(seq->items[index], key, op);
+    PyObject* value = PySequence_GetItem(seq->obj, index);
+    if(value == NULL)
+        return -1;
+    int result = PyObject_RichCompareBool(value, key, op);
+    Py_DECREF(value);
+    return result;
+}
+
+
+static Py_ssize_t gallop(sequence* seq, Py_ssize_t start, PyObject* key,
+                         Py_ssize_t* high)
+{
+    Py_ssize_t low = start;
+    Py_ssize_t offset = 0;
+    while(1)
+    {
+        Py_ssize_t probe = start + offset;
+        if(probe >= seq->size)
+        {
+            *high = seq->size;
+            return low;
+        }
+        int less = compare_at(seq, probe, key, Py_LT);
+        if(less == -1)
+            return -1;
+        if(!less)
+        {
+            *high = probe;
+            return low;
+        }
+        low = probe + 1;
+        offset = 2 * offset + 1;
+    }
+}
+
+
+static int search_objects(sequence* seq, PyObject** queries,
+                          Py_ssize_t count, long long* result)
+{
+    Py_ssize_t start = 0;
+    for(Py_ssize_t i = 0; i < count; i++)
+    {
+        PyObject* key = queries[i];
+        Py_ssize_t low = 0, high = seq->size;
+        int ascending = i ? PyObject_RichCompareBool(key, queries[i - 1],
+                                                     Py_GE) : 0;
+        if(ascending == -1)
+            return -1;
+        if(ascending)
+        {
+            low = gallop(seq, start, key, &high);
+            if(low == -1)
+                return -1;
+        }
+        while(low < high)
+        {
+            Py_ssize_t mid = low + (high - low) / 2;
+            int less = compare_at(seq, mid, key, Py_LT);
+            if(less == -1)
+                return -1;
+            if(less)
+                low = mid + 1;
+            else
+                high = mid;
+        }
+        start = low;
+        int equal = low < seq->size ? compare_at(seq, low, key, Py_EQ) : 0;
+        if(equal == -1)
+            return -1;
+        result[i] = equal ? low : -1;
+    }
+    return 0;
+}
+
+
+typedef union
+{
+    long long i;
+    unsigned long long u;
+    double d;
+} search_key;
+
+
+#define SEARCH_TYPE(name, type, field) static Py_ssize_t bound_##name( \
+    const void* data_items, Py_ssize_t size, const search_key* key, \
+    int right) \
+{ \
+    const type* base = (const type*) data_items; \
+    if(!size) \
+        return 0; \
+    if(right) \
+    { \
+        while(size > 1) \
+        { \
+            Py_ssize_t half = size / 2; \
+            base = base[half] <= key->field ? base + half : base; \
+            size -= half; \
+        } \
+        return (base - (const type*) data_items) + (*base <= key->field); \
+    } \
+    while(size > 1) \
+    { \
+        Py_ssize_t half = size / 2; \
+        base = base[half] < key->field ? base + half : base; \
+        size -= half; \
+    } \
+    return (base - (const type*) data_items) + (*base < key->field); \
+} \
+\
+static int equal_##name(const void* data_items, Py_ssize_t index, \
+                        const search_key* key) \
+{ \
+    return ((const type*) data_items)[index] == key->field; \
+} \
+\
+static void search_##name( \
+    const void* data_items, Py_ssize_t size, const void* query_items, \
+    Py_ssize_t count, long long* result) \
+{ \
+    const type* data = (const type*) data_items; \
+    const type* queries = (const type*) query_items; \
+    Py_ssize_t start = 0; \
+    for(Py_ssize_t i = 0; i < count; i++) \
+    { \
+        type key = queries[i]; \
+        Py_ssize_t low = 0, high = size; \
+        if(i && key >= queries[i - 1]) \
+        { \
+            Py_ssize_t offset = 0; \
+            low = start; \
+            while(1) \
+            { \
+                Py_ssize_t probe = start + offset; \
+                if(probe >= size) \
+                    break; \
+                if(!(data[probe] < key)) \
+                { \
+                    high = probe; \
+                    break; \
+                } \
+                low = probe + 1; \
+                offset = 2 * offset + 1; \
+            } \
+        } \
+        while(low < high) \
+        { \
+            Py_ssize_t mid = low + (high - low) / 2; \
+            if(data[mid] < key) \
+                low = mid + 1; \
+            else \
+                high = mid; \
+        } \
+        start = low; \
+        result[i] = low < size && data[low] == key ? low : -1; \
+    } \
+}
+
+SEARCH_TYPE(int8, int8_t, i)
+SEARCH_TYPE(int16, int16_t, i)
+SEARCH_TYPE(int32, int32_t, i)
+SEARCH_TYPE(int64, int64_t, i)
+SEARCH_TYPE(uint8, uint8_t, u)
+SEARCH_TYPE(uint16, uint16_t, u)
+SEARCH_TYPE(uint32, uint32_t, u)
+SEARCH_TYPE(uint64, uint64_t, u)
+SEARCH_TYPE(float, float, d)
+SEARCH_TYPE(double, double, d)
+
+
+#define INTERPOLATION_MIN 16
+
+#define SEARCH_MODES(name, type, field, wide) static Py_ssize_t binary_##name( \
+    const type* data, Py_ssize_t low, Py_ssize_t high, wide key, \
+    Py_ssize_t* probes) \
+{ \
+    while(low < high) \
+    { \
+        Py_ssize_t mid = low + (high - low) / 2; \
+        ++*probes; \
+        if(data[mid] < key) \
+            low = mid + 1; \
+        else \
+            high = mid; \
+    } \
+    return low; \
+} \
+\
+static Py_ssize_t bracket_##name(const type* data, Py_ssize_t low, \
+                                 Py_ssize_t high, Py_ssize_t position, \
+                                 wide key, Py_ssize_t* probes) \
+{ \
+    Py_ssize_t step = 1; \
+    ++*probes; \
+    if(data[position] < key) \
+    { \
+        low = position + 1; \
+        while(position + step < high) \
+        { \
+            ++*probes; \
+            if(!(data[position + step] < key)) \
+            { \
+                high = position + step; \
+                break; \
+            } \
+            low = position + step + 1; \
+            step *= 2; \
+        } \
+    } \
+    else \
+    { \
+        high = position; \
+        while(position - step >= low) \
+        { \
+            ++*probes; \
+            if(data[position - step] < key) \
+            { \
+                low = position - step + 1; \
+                break; \
+            } \
+            high = position - step; \
+            step *= 2; \
+        } \
+    } \
+    return binary_##name(data, low, high, key, probes); \
+} \
+\
+static Py_ssize_t exponential_##name( \
+    const void* items, Py_ssize_t size, const search_key* key, \
+    Py_ssize_t hint, Py_ssize_t* probes) \
+{ \
+    if(!size) \
+        return 0; \
+    if(hint < 0) \
+        hint = 0; \
+    else if(hint >= size) \
+        hint = size - 1; \
+    return bracket_##name((const type*) items, 0, size, hint, \
+                          key->field, probes); \
+} \
+\
+static Py_ssize_t interpolation_##name( \
+    const void* items, Py_ssize_t size, const search_key* key, \
+    Py_ssize_t hint, Py_ssize_t* probes) \
+{ \
+    const type* data = (const type*) items; \
+    wide value = key->field; \
+    (void) hint; \
+    if(size <= INTERPOLATION_MIN) \
+        return binary_##name(data, 0, size, value, probes); \
+    type below = data[0], above = data[size - 1]; \
+    *probes += 2; \
+    if(!(below < value)) \
+        return 0; \
+    if(above < value) \
+        return size; \
+    Py_ssize_t low = 1, high = size - 1; \
+    while(high - low > INTERPOLATION_MIN) \
+    { \
+        Py_ssize_t width = high - low; \
+        double estimate = (double) (low - 1) + (double) (width + 1) \
+            * (((double) value - (double) below) \
+               / ((double) above - (double) below)); \
+        Py_ssize_t position = !(estimate > (double) low) ? low \
+            : estimate >= (double) (high - 1) ? high - 1 \
+            : (Py_ssize_t) estimate; \
+        for(int step = 0; step < 2; step++) \
+        { \
+            ++*probes; \
+            if(data[position] < value) \
+            { \
+                below = data[position]; \
+                low = position + 1; \
+            } \
+            else \
+            { \
+                above = data[position]; \
+                high = position; \
+            } \
+            if(high - low <= width / 2) \
+                break; \
+            position = low + (high - low) / 2; \
+        } \
+    } \
+    return binary_##name(data, low, high, value, probes); \
+} \
+\
+static Py_ssize_t plain_##name( \
+    const void* items, Py_ssize_t size, const search_key* key, \
+    Py_ssize_t hint, Py_ssize_t* probes) \
+{ \
+    (void) hint; \
+    return binary_##name((const type*) items, 0, size, key->field, \
+                         probes); \
+}
+
+SEARCH_MODES(int8, int8_t, i, long long)
+SEARCH_MODES(int16, int16_t, i, long long)
+SEARCH_MODES(int32, int32_t, i, long long)
+SEARCH_MODES(int64, int64_t, i, long long)
+SEARCH_MODES(uint8, uint8_t, u, unsigned long long)
+SEARCH_MODES(uint16, uint16_t, u, unsigned long long)
+SEARCH_MODES(uint32, uint32_t, u, unsigned long long)
+SEARCH_MODES(uint64, uint64_t, u, unsigned long long)
+SEARCH_MODES(float, float, d, double)
+SEARCH_MODES(double, double, d, double)
+
+
+typedef Py_ssize_t (*search_mode)(const void*, Py_ssize_t, const search_key*,
+                                  Py_ssize_t, Py_ssize_t*);
+
+
+typedef struct
+{
+    char kind;
+    Py_ssize_t (*bound)(const void*, Py_ssize_t, const search_key*, int);
+    int (*equal)(const void*, Py_ssize_t, const search_key*);
+    void (*many)(const void*, Py_ssize_t, const void*, Py_ssize_t,
+                 long long*);
+    search_mode modes[3];
+} typed_search;
+
+#define TYPED_SEARCH(kind, name) \
+    {kind, bound_##name, equal_##name, search_##name, \
+     {plain_##name, interpolation_##name, exponential_##name}}
+
+static const typed_search typed_searches[] = {
+    TYPED_SEARCH('i', int8),
+    TYPED_SEARCH('i', int16),
+    TYPED_SEARCH('i', int32),
+    TYPED_SEARCH('i', int64),
+    TYPED_SEARCH('u', uint8),
+    TYPED_SEARCH('u', uint16),
+    TYPED_SEARCH('u', uint32),
+    TYPED_SEARCH('u', uint64),
+    TYPED_SEARCH('f', float),
+    TYPED_SEARCH('f', double)
+};
+
+
+static const typed_search* find_search(const Py_buffer* view)
+{
+    const char* format = view->format != NULL ? view->format : "B";
+    if(*format == '@')
+        format++;
+    if(format[0] == '\0' || format[1] != '\0')
+        return NULL;
+    int offset;
+    switch(view->itemsize)
+    {
+        case 1: offset = 0; break;
+        case 2: offset = 1; break;
+        case 4: offset = 2; break;
+        case 8: offset = 3; break;
+        default: return NULL;
+    }
+    if(strchr("bhilq", format[0]))
+        return &typed_searches[offset];
+    if(strchr("BHILQ", format[0]))
+        return &typed_searches[4 + offset];
+    if(format[0] == 'f' && view->itemsize == sizeof(float))
+        return &typed_searches[8];
+    if(format[0] == 'd' && view->itemsize == sizeof(double))
+        return &typed_searches[9];
+    return NULL;
+}
+
+
+static int get_key(char kind, Py_ssize_t itemsize, PyObject* item,
+                   search_key* key)
+{
+    int bits = 8 * (int) itemsize;
+    if(PyFloat_Check(item))
+    {
+        double value = PyFloat_AS_DOUBLE(item);
+        if(kind == 'f')
+        {
+            key->d = value;
+            return 1;
+        }
+        if(!isfinite(value) || value != floor(value))
+            return 0;
+        PyObject* integer = PyLong_FromDouble(value);
+        if(integer == NULL)
+            return -1;
+        int result = get_key(kind, itemsize, integer, key);
+        Py_DECREF(integer);
+        return result;
+    }
+    if(!PyLong_Check(item))
+        return 2;
+    int overflow;
+    long long value = PyLong_AsLongLongAndOverflow(item, &overflow);
+    if(value == -1 && PyErr_Occurred())
+        return -1;
+    if(kind == 'f')
+    {
+        if(overflow || value > (1LL << 53) || value < -(1LL << 53))
+            return 2;
+        key->d = (double) value;
+        return 1;
+    }
+    if(kind == 'i')
+    {
+        key->i = value;
+        return !overflow && (bits == 64 || (value >= -(1LL << (bits - 1))
+                                            && value < (1LL << (bits - 1))));
+    }
+    if(overflow < 0 || (!overflow && value < 0))
+        return 0;
+    if(overflow)
+    {
+        key->u = PyLong_AsUnsignedLongLong(item);
+        if(PyErr_Occurred())
+        {
+            PyErr_Clear();
+            return 0;
+        }
+        return bits == 64;
+    }
+    key->u = (unsigned long long) value;
+    return bits == 64 || key->u < (1ULL << bits);
+}
+
+
+static int wide_key(char kind, PyObject* item, search_key* key)
+{
+    int status = get_key(kind, sizeof(search_key), item, key);
+    if(status != 2 || kind != 'f' || !PyLong_Check(item))
+        return status;
+    key->d = PyLong_AsDouble(item);
+    if(key->d == -1.0 && PyErr_Occurred())
+    {
+        if(!PyErr_ExceptionMatches(PyExc_OverflowError))
+            return -1;
+        PyErr_Clear();
+        key->d = _PyLong_Sign(item) > 0 ? INFINITY : -INFINITY;
+        return 0;
+    }
+    PyObject* rounded = PyFloat_FromDouble(key->d);
+    int exact = rounded != NULL
+        ? PyObject_RichCompareBool(rounded, item, Py_EQ) : -1;
+    if(exact == 0)
+    {
+        int below = PyObject_RichCompareBool(rounded, item, Py_LT);
+        if(below == 1)
+            key->d = nextafter(key->d, INFINITY);
+        exact = below == -1 ? -1 : 0;
+    }
+    Py_XDECREF(rounded);
+    return exact;
+}
+
+
+static int exact_key(char kind, PyObject* item, search_key* key)
+{
+    int status = wide_key(kind, item, key);
+    if(status == 2)
+    {
+        PyErr_SetString(PyExc_TypeError, "numeric key required");
+        return -1;
+    }
+    return status;
+}
+
+
+static int bound_key(char kind, PyObject* item, search_key* key, int* above)
+{
+    int status = exact_key(kind, item, key);
+    if(status != 0 || (kind == 'f' && PyLong_Check(item)))
+        return status == -1 ? -1 : 1;
+    if(PyFloat_Check(item) && isfinite(PyFloat_AS_DOUBLE(item)))
+    {
+        PyObject* ceiling = PyLong_FromDouble(ceil(PyFloat_AS_DOUBLE(item)));
+        if(ceiling == NULL)
+            return -1;
+        status = bound_key(kind, ceiling, key, above);
+        Py_DECREF(ceiling);
+        return status;
+    }
+    if(PyFloat_Check(item))
+    {
+        *above = PyFloat_AS_DOUBLE(item) > 0;
+        return 0;
+    }
+    PyObject* zero = PyLong_FromLong(0);
+    *above = zero != NULL ? PyObject_RichCompareBool(item, zero, Py_GT) : -1;
+    Py_XDECREF(zero);
+    return *above == -1 ? -1 : 0;
+}
+
+
+static int get_typed(PyObject* obj, Py_buffer* view)
+{
+    view->obj = NULL;
+    if(!PyObject_CheckBuffer(obj))
+        return 0;
+    if(PyObject_GetBuffer(obj, view, PyBUF_FORMAT | PyBUF_C_CONTIGUOUS)
+       == -1)
+    {
+        PyErr_Clear();
+        return 0;
+    }
+    if(find_search(view) == NULL)
+    {
+        PyBuffer_Release(view);
+        return 0;
+    }
+    return 1;
+}
+
+
+#define COMPARE(a, b, op) ( \
+    (op) == Py_LT ? (a) < (b) : (op) == Py_LE ? (a) <= (b) \
+    : (op) == Py_EQ ? (a) == (b) : (op) == Py_NE ? (a) != (b) \
+    : (op) == Py_GT ? (a) > (b) : (a) >= (b))
+
+
+static int compare(PyObject* a, PyObject* b, int op)
+{
+    if(PyLong_CheckExact(a) && PyLong_CheckExact(b))
+    {
+        int a_overflow, b_overflow;
+        long long a_value = PyLong_AsLongLongAndOverflow(a, &a_overflow);
+        long long b_value = PyLong_AsLongLongAndOverflow(b, &b_overflow);
+        if(!a_overflow && !b_overflow)
+            return COMPARE(a_value, b_value, op);
+    }
+    else if(PyFloat_CheckExact(a) && PyFloat_CheckExact(b))
+        return COMPARE(PyFloat_AS_DOUBLE(a), PyFloat_AS_DOUBLE(b), op);
+    return PyObject_RichCompareBool(a, b, op);
+}
+
+
+static PyObject* get_element(PyObject* iterable, Py_ssize_t index,
+                             PyObject* key)
+{
+    PyObject* value;
+    if(PyList_CheckExact(iterable) && index < PyList_GET_SIZE(iterable))
+    {
+        value = PyList_GET_ITEM(iterable, index);
+        Py_INCREF(value);
+    }
+    else
+        value = PySequence_GetItem(iterable, index);
+    if(value == NULL || key == NULL)
+        return value;
+    PyObject* result = PyObject_CallOneArg(key, value);
+    Py_DECREF(value);
+    return result;
+}
+
+
+static Py_ssize_t bisect_objects(PyObject* iterable, PyObject* item,
+                                 Py_ssize_t lo, Py_ssize_t hi, PyObject* key,
+                                 int right)
+{
+    while(lo < hi)
+    {
+        Py_ssize_t mid = lo + (hi - lo) / 2;
+        PyObject* value = get_element(iterable, mid, key);
+        if(value == NULL)
+            return -1;
+        int less = right ? compare(item, value, Py_LT)
+                         : compare(value, item, Py_LT);
+        Py_DECREF(value);
+        if(less == -1)
+            return -1;
+        if(right ? less : !less)
+            hi = mid;
+        else
+            lo = mid + 1;
+    }
+    return lo;
+}
+
+
+static int get_bounds(PyObject* iterable, Py_ssize_t* lo, PyObject* hi_obj,
+                      Py_ssize_t* hi)
+{
+    if(*lo < 0)
+    {
+        PyErr_SetString(PyExc_ValueError, "lo must be non-negative");
+        return -1;
+    }
+    if(hi_obj == NULL || hi_obj == Py_None)
+        *hi = PySequence_Size(iterable);
+    else
+        *hi = PyNumber_AsSsize_t(hi_obj, PyExc_OverflowError);
+    if(*hi == -1 && PyErr_Occurred())
+        return -1;
+    return 0;
+}
+
+
+static int search_typed_range(Py_buffer* view, PyObject* item,
+                              Py_ssize_t lo, Py_ssize_t hi, int right,
+                              Py_ssize_t* index, int* found)
+{
+    if(hi > view->len / view->itemsize)
+        return 0;
+    const typed_search* search = find_search(view);
+    search_key key;
+    int status = get_key(search->kind, view->itemsize, item, &key);
+    if(status != 1)
+        return status == 2 ? 0 : status == 0 ? 2 : -1;
+    *index = lo;
+    if(lo < hi)
+        *index += search->bound((const char*) view->buf + lo * view->itemsize,
+                                hi - lo, &key, right);
+    *found = *index < hi && search->equal(view->buf, *index, &key);
+    return 1;
+}
+
+
+static PyObject* bisect(PyObject* args, PyObject* kwds, int right)
+{
+    static char* kwlist[] = {"a", "x", "lo", "hi", "key", NULL};
+    PyObject* iterable;
+    PyObject* item;
+    Py_ssize_t lo = 0, hi;
+    PyObject* hi_obj = NULL;
+    PyObject* key = Py_None;
+    if(!PyArg_ParseTupleAndKeywords(args, kwds, "OO|nO$O", kwlist,
+                                    &iterable, &item, &lo, &hi_obj, &key)
+       || get_bounds(iterable, &lo, hi_obj, &hi) == -1)
+        return NULL;
+    if(key == Py_None)
+    {
+        Py_buffer view;
+        if(get_typed(iterable, &view))
+        {
+            Py_ssize_t index;
+            int found;
+            int status = search_typed_range(&view, item, lo, hi, right,
+                                            &index, &found);
+            PyBuffer_Release(&view);
+            if(status == -1)
+                return NULL;
+            if(status == 1)
+                return PyLong_FromSsize_t(index);
+        }
+        key = NULL;
+    }
+    Py_ssize_t index = bisect_objects(iterable, item, lo, hi, key, right);
+    return index == -1 ? NULL : PyLong_FromSsize_t(index);
+}
+
+
+static PyObject* bisect_left(PyObject* module, PyObject* args,
+                             PyObject* kwds)
+{
+    return bisect(args, kwds, 0);
+}
+
+
+static PyObject* bisect_right(PyObject* module, PyObject* args,
+                              PyObject* kwds)
+{
+    return bisect(args, kwds, 1);
+}
+
+
+static PyObject* find_item(PyObject* iterable, PyObject* item, Py_ssize_t lo,
+                           Py_ssize_t hi, PyObject* key)
+{
+    Py_ssize_t index;
+    if(key == NULL)
+    {
+        Py_buffer view;
+        if(get_typed(iterable, &view))
+        {
+            int found = 0;
+            int status = search_typed_range(&view, item, lo, hi, 0, &index,
+                                            &found);
+            PyBuffer_Release(&view);
+            if(status == -1)
+                return NULL;
+            if(status == 1 && found)
+                return PyLong_FromSsize_t(index);
+            if(status)
+                Py_RETURN_NONE;
+        }
+    }
+    index = bisect_objects(iterable, item, lo, hi, key, 0);
+    if(index == -1)
+        return NULL;
+    if(index >= hi)
+        Py_RETURN_NONE;
+    PyObject* value = get_element(iterable, index, key);
+    int equal = value != NULL ? compare(value, item, Py_EQ) : -1;
+    Py_XDECREF(value);
+    if(equal == -1)
+        return NULL;
+    if(!equal)
+        Py_RETURN_NONE;
+    return PyLong_FromSsize_t(index);
+}
+
+
+static PyObject* find(PyObject* module, PyObject* args, PyObject* kwds)
+{
+    static char* kwlist[] = {"a", "x", "lo", "hi", "key", NULL};
+    PyObject* iterable;
+    PyObject* item;
+    Py_ssize_t lo = 0, hi;
+    PyObject* hi_obj = NULL;
+    PyObject* key = Py_None;
+    if(!PyArg_ParseTupleAndKeywords(args, kwds, "OO|nO$O", kwlist,
+                                    &iterable, &item, &lo, &hi_obj, &key)
+       || get_bounds(iterable, &lo, hi_obj, &hi) == -1)
+        return NULL;
+    return find_item(iterable, item, lo, hi, key == Py_None ? NULL : key);
+}
 
 
 static PyObject* binary_search(PyObject* module, PyObject* args)
 {
     PyObject* item;
-    PyObject* iterable;
-    if(!PyArg_ParseTuple(args, "OO", &iterable, &item))
+    PyObject* iterable;
+    if(!PyArg_ParseTuple(args, "OO", &iterable, &item))
+        return NULL;
+    Py_ssize_t hi = PySequence_Size(iterable);
+    if(hi == -1)
+        return NULL;
+    return find_item(iterable, item, 0, hi, NULL);
+}
+
+
+static PyObject* new_index_array(Py_ssize_t count, long long** result)
+{
+    PyObject* array_module = PyImport_ImportModule("array");
+    if(array_module == NULL)
+        return NULL;
+    PyObject* data = PyBytes_FromStringAndSize(NULL,
+                                               count * sizeof(long long));
+    PyObject* array = data != NULL
+        ? PyObject_CallMethod(array_module, "array", "CO", 'q', data)
+        : NULL;
+    Py_DECREF(array_module);
+    Py_XDECREF(data);
+    Py_buffer view;
+    if(array == NULL
+       || PyObject_GetBuffer(array, &view, PyBUF_WRITABLE) == -1)
+    {
+        Py_XDECREF(array);
+        return NULL;
+    }
+    *result = (long long*) view.buf;
+    PyBuffer_Release(&view);
+    return array;
+}
+
+
+static PyObject* search_typed(Py_buffer* data, Py_buffer* queries)
+{
+    Py_ssize_t count = queries->len / queries->itemsize;
+    long long* result;
+    PyObject* array = new_index_array(count, &result);
+    if(array == NULL)
+        return NULL;
+    const typed_search* search = find_search(data);
+    Py_BEGIN_ALLOW_THREADS
+    search->many(data->buf, data->len / data->itemsize, queries->buf, count,
+           result);
+    Py_END_ALLOW_THREADS
+    return array;
+}
+
+
+static PyObject* convert_queries(Py_buffer* data, PyObject* queries)
+{
+    PyObject* array_module = PyImport_ImportModule("array");
+    if(array_module == NULL)
+        return NULL;
+    const char* format = data->format[0] == '@'
+        ? data->format + 1 : data->format;
+    PyObject* result = PyObject_CallMethod(array_module, "array", "CO",
+                                           format[0], queries);
+    Py_DECREF(array_module);
+    return result;
+}
+
+
+static PyObject* binary_search_many(PyObject* module, PyObject* args)
+{
+    PyObject* iterable;
+    PyObject* queries;
+    if(!PyArg_ParseTuple(args, "OO", &iterable, &queries))
+        return NULL;
+
+    Py_buffer data, keys;
+    PyObject* keys_seq = NULL;
+    if(get_typed(iterable, &data))
+    {
+        PyObject* converted = NULL;
+        int typed = get_typed(queries, &keys);
+        if(typed && (keys.itemsize != data.itemsize
+                     || find_search(&keys) != find_search(&data)))
+        {
+            PyBuffer_Release(&keys);
+            typed = 0;
+        }
+        if(!typed)
+        {
+            keys_seq = PySequence_Tuple(queries);
+            if(keys_seq == NULL)
+            {
+                PyBuffer_Release(&data);
+                return NULL;
+            }
+            converted = convert_queries(&data, keys_seq);
+            if(converted == NULL)
+                PyErr_Clear();
+            else
+                typed = get_typed(converted, &keys);
+        }
+        PyObject* result = typed ? search_typed(&data, &keys) : NULL;
+        if(typed)
+            PyBuffer_Release(&keys);
+        Py_XDECREF(converted);
+        PyBuffer_Release(&data);
+        if(typed)
+        {
+            Py_XDECREF(keys_seq);
+            return result;
+        }
+    }
+
+    sequence seq;
+    if(keys_seq == NULL)
+        keys_seq = PySequence_Tuple(queries);
+    if(keys_seq == NULL)
+        return NULL;
+    if(get_sequence(iterable, &seq) == -1)
+    {
+        Py_DECREF(keys_seq);
+        return NULL;
+    }
+    long long* result;
+    PyObject* array = new_index_array(PyTuple_GET_SIZE(keys_seq), &result);
+    if(array != NULL
+       && search_objects(&seq, PySequence_Fast_ITEMS(keys_seq),
+                         PyTuple_GET_SIZE(keys_seq), result) == -1)
+        Py_CLEAR(array);
+    Py_DECREF(seq.obj);
+    Py_DECREF(keys_seq);
+    return array;
+}
+
+
+static const char* const search_modes[] = {
+    "binary", "interpolation", "exponential", NULL
+};
+
+
+static PyObject* search(PyObject* module, PyObject* args, PyObject* kwds)
+{
+    static char* kwlist[] = {"a", "x", "mode", "hint", "probes", NULL};
+    PyObject* iterable;
+    PyObject* item;
+    const char* mode_name = "binary";
+    Py_ssize_t hint = 0;
+    int count_probes = 0;
+    if(!PyArg_ParseTupleAndKeywords(args, kwds, "OO|s$np", kwlist,
+                                    &iterable, &item, &mode_name, &hint,
+                                    &count_probes))
+        return NULL;
+    int mode = 0;
+    while(search_modes[mode] != NULL && strcmp(search_modes[mode], mode_name))
+        mode++;
+    if(search_modes[mode] == NULL)
+    {
+        PyErr_Format(PyExc_ValueError, "unknown search mode '%s'", mode_name);
+        return NULL;
+    }
+    Py_buffer view;
+    if(!get_typed(iterable, &view))
+    {
+        PyErr_SetString(PyExc_TypeError, "search requires a numeric buffer");
+        return NULL;
+    }
+
+    const typed_search* typed = find_search(&view);
+    Py_ssize_t size = view.len / view.itemsize;
+    Py_ssize_t index = -1, probes = 0;
+    search_key key;
+    int status = exact_key(typed->kind, item, &key);
+    if(status == 1)
+    {
+        index = typed->modes[mode](view.buf, size, &key, hint, &probes);
+        if(index >= size || !typed->equal(view.buf, index, &key))
+            index = -1;
+    }
+    PyBuffer_Release(&view);
+    if(status == -1)
+        return NULL;
+    PyObject* result = index != -1 ? PyLong_FromSsize_t(index)
+                                   : Py_NewRef(Py_None);
+    if(!count_probes || result == NULL)
+        return result;
+    return Py_BuildValue("Nn", result, probes);
+}
+
+
+#define EYTZINGER_PREFETCH 8
+
+
+typedef struct
+{
+    PyObject_HEAD
+    char kind;
+    Py_ssize_t size;
+    search_key* keys;
+    Py_ssize_t* ranks;
+} index_object;
+
+
+static PyTypeObject index_type;
+
+
+#define EYTZINGER(field) static Py_ssize_t eytzinger_##field( \
+    const search_key* keys, Py_ssize_t size, const search_key* key) \
+{ \
+    size_t k = 1; \
+    while(k <= (size_t) size) \
+    { \
+        __builtin_prefetch(keys + k * EYTZINGER_PREFETCH); \
+        k = 2 * k + (keys[k].field < key->field); \
+    } \
+    return (Py_ssize_t) (k >> __builtin_ffsll((long long) ~k)); \
+}
+
+EYTZINGER(i)
+EYTZINGER(u)
+EYTZINGER(d)
+
+
+static Py_ssize_t index_position(const index_object* self,
+                                 const search_key* key)
+{
+    switch(self->kind)
+    {
+        case 'i': return eytzinger_i(self->keys, self->size, key);
+        case 'u': return eytzinger_u(self->keys, self->size, key);
+        default: return eytzinger_d(self->keys, self->size, key);
+    }
+}
+
+
+static int index_equal(const index_object* self, Py_ssize_t position,
+                       const search_key* key)
+{
+    if(!position)
+        return 0;
+    switch(self->kind)
+    {
+        case 'i': return self->keys[position].i == key->i;
+        case 'u': return self->keys[position].u == key->u;
+        default: return self->keys[position].d == key->d;
+    }
+}
+
+
+static void index_many(const index_object* self, const search_key* queries,
+                       Py_ssize_t count, int exact, long long* result)
+{
+    for(Py_ssize_t i = 0; i < count; i++)
+    {
+        Py_ssize_t position = index_position(self, &queries[i]);
+        if(exact)
+            result[i] = index_equal(self, position, &queries[i])
+                ? self->ranks[position] : -1;
+        else
+            result[i] = self->ranks[position];
+    }
+}
+
+
+static void decode_key(char kind, Py_ssize_t itemsize, const char* item,
+                       search_key* key)
+{
+    if(kind == 'f')
+        key->d = itemsize == sizeof(float)
+            ? (double) *(const float*) item : *(const double*) item;
+    else if(kind == 'i')
+        switch(itemsize)
+        {
+            case 1: key->i = *(const int8_t*) item; break;
+            case 2: key->i = *(const int16_t*) item; break;
+            case 4: key->i = *(const int32_t*) item; break;
+            default: key->i = *(const int64_t*) item;
+        }
+    else
+        switch(itemsize)
+        {
+            case 1: key->u = *(const uint8_t*) item; break;
+            case 2: key->u = *(const uint16_t*) item; break;
+            case 4: key->u = *(const uint32_t*) item; break;
+            default: key->u = *(const uint64_t*) item;
+        }
+}
+
+
+static void read_key(const Py_buffer* view, char kind, Py_ssize_t index,
+                     search_key* key)
+{
+    decode_key(kind, view->itemsize,
+               (const char*) view->buf + index * view->itemsize, key);
+}
+
+
+static int key_less(char kind, const search_key* a, const search_key* b)
+{
+    switch(kind)
+    {
+        case 'i': return a->i < b->i;
+        case 'u': return a->u < b->u;
+        default: return a->d < b->d;
+    }
+}
+
+
+static Py_ssize_t fill_index(index_object* self, const Py_buffer* view,
+                             Py_ssize_t index, size_t k)
+{
+    if(k <= (size_t) self->size)
+    {
+        index = fill_index(self, view, index, 2 * k);
+        read_key(view, self->kind, index, &self->keys[k]);
+        self->ranks[k] = index++;
+        index = fill_index(self, view, index, 2 * k + 1);
+    }
+    return index;
+}
+
+
+static int get_index_data(PyObject* obj, Py_buffer* view)
+{
+    if(get_typed(obj, view))
+        return 0;
+    static const char typecodes[] = "qQd";
+    PyObject* array_module = PyImport_ImportModule("array");
+    if(array_module == NULL)
+        return -1;
+    for(int i = 0; typecodes[i]; i++)
+    {
+        PyObject* array = PyObject_CallMethod(array_module, "array", "CO",
+                                              typecodes[i], obj);
+        if(array != NULL)
+        {
+            Py_DECREF(array_module);
+            int result = PyObject_GetBuffer(array, view, PyBUF_FORMAT);
+            Py_DECREF(array);
+            return result;
+        }
+        if(!PyErr_ExceptionMatches(PyExc_OverflowError)
+           && !PyErr_ExceptionMatches(PyExc_TypeError))
+            break;
+        PyErr_Clear();
+    }
+    Py_DECREF(array_module);
+    if(!PyErr_Occurred())
+        PyErr_SetString(PyExc_TypeError, "Index requires numeric keys");
+    return -1;
+}
+
+
+static int check_sorted(const Py_buffer* view, char kind)
+{
+    search_key previous, current;
+    for(Py_ssize_t i = 1; i < view->len / view->itemsize; i++)
+    {
+        read_key(view, kind, i - 1, &previous);
+        read_key(view, kind, i, &current);
+        if(key_less(kind, &current, &previous)
+           || (kind == 'f' && !(previous.d <= current.d)))
+        {
+            PyErr_SetString(PyExc_ValueError, "keys must be sorted");
+            return -1;
+        }
+    }
+    return 0;
+}
+
+
+static int index_init(index_object* self, PyObject* args, PyObject* kwds)
+{
+    PyObject* sorted;
+    if(!PyArg_ParseTuple(args, "O", &sorted))
+        return -1;
+    Py_buffer view;
+    if(get_index_data(sorted, &view) == -1)
+        return -1;
+
+    char kind = find_search(&view)->kind;
+    Py_ssize_t size = view.len / view.itemsize;
+    search_key* keys = PyMem_Malloc((size + 1) * sizeof(search_key));
+    Py_ssize_t* ranks = PyMem_Malloc((size + 1) * sizeof(Py_ssize_t));
+    if(keys == NULL || ranks == NULL)
+    {
+        PyMem_Free(keys);
+        PyMem_Free(ranks);
+        PyBuffer_Release(&view);
+        PyErr_NoMemory();
+        return -1;
+    }
+    if(check_sorted(&view, kind) == -1)
+    {
+        PyMem_Free(keys);
+        PyMem_Free(ranks);
+        PyBuffer_Release(&view);
+        return -1;
+    }
+
+    PyMem_Free(self->keys);
+    PyMem_Free(self->ranks);
+    self->kind = kind;
+    self->size = size;
+    self->keys = keys;
+    self->ranks = ranks;
+    self->ranks[0] = size;
+    fill_index(self, &view, 0, 1);
+    PyBuffer_Release(&view);
+    return 0;
+}
+
+
+static PyObject* index_find(index_object* self, PyObject* item)
+{
+    search_key key;
+    int status = exact_key(self->kind, item, &key);
+    if(status == -1)
+        return NULL;
+    Py_ssize_t position = status ? index_position(self, &key) : 0;
+    if(!index_equal(self, position, &key))
+        Py_RETURN_NONE;
+    return PyLong_FromSsize_t(self->ranks[position]);
+}
+
+
+static PyObject* index_lower_bound(index_object* self, PyObject* item)
+{
+    search_key key;
+    int above;
+    int status = bound_key(self->kind, item, &key, &above);
+    if(status == -1)
+        return NULL;
+    if(status)
+        return PyLong_FromSsize_t(self->ranks[index_position(self, &key)]);
+    return PyLong_FromSsize_t(above ? self->size : 0);
+}
+
+
+static PyObject* index_objects(index_object* self, PyObject* queries,
+                               int exact)
+{
+    PyObject* seq = PySequence_Fast(queries, "queries must be iterable");
+    if(seq == NULL)
+        return NULL;
+    long long* result;
+    Py_ssize_t count = PySequence_Fast_GET_SIZE(seq);
+    PyObject* array = new_index_array(count, &result);
+    for(Py_ssize_t i = 0; array != NULL && i < count; i++)
+    {
+        PyObject* item = PySequence_Fast_GET_ITEM(seq, i);
+        PyObject* index = exact ? index_find(self, item)
+                                : index_lower_bound(self, item);
+        if(index == NULL)
+            Py_CLEAR(array);
+        else
+        {
+            result[i] = index == Py_None ? -1 : PyLong_AsLongLong(index);
+            Py_DECREF(index);
+        }
+    }
+    Py_DECREF(seq);
+    return array;
+}
+
+
+static PyObject* index_batch(index_object* self, PyObject* queries,
+                             int exact)
+{
+    static const char typecodes[] = {'q', 'Q', 'd'};
+    char typecode = typecodes[self->kind == 'i' ? 0 : self->kind == 'u'
+                                                      ? 1 : 2];
+    PyObject* array_module = PyImport_ImportModule("array");
+    if(array_module == NULL)
+        return NULL;
+    Py_buffer view;
+    int typed = get_typed(queries, &view);
+    if(typed && (find_search(&view)->kind != self->kind
+                 || view.itemsize != sizeof(search_key)))
+    {
+        PyBuffer_Release(&view);
+        typed = 0;
+    }
+    PyObject* converted = NULL;
+    if(!typed)
+    {
+        converted = PyObject_CallMethod(array_module, "array", "CO",
+                                        typecode, queries);
+        Py_DECREF(array_module);
+        if(converted == NULL
+           && (PyErr_ExceptionMatches(PyExc_OverflowError)
+               || PyErr_ExceptionMatches(PyExc_TypeError)))
+        {
+            PyErr_Clear();
+            return index_objects(self, queries, exact);
+        }
+        if(converted == NULL)
+            return NULL;
+        if(PyObject_GetBuffer(converted, &view, PyBUF_SIMPLE) == -1)
+        {
+            Py_DECREF(converted);
+            return NULL;
+        }
+    }
+    else
+        Py_DECREF(array_module);
+
+    long long* result;
+    Py_ssize_t count = view.len / (Py_ssize_t) sizeof(search_key);
+    PyObject* array = new_index_array(count, &result);
+    if(array != NULL)
+    {
+        Py_BEGIN_ALLOW_THREADS
+        index_many(self, (const search_key*) view.buf, count, exact, result);
+        Py_END_ALLOW_THREADS
+    }
+    PyBuffer_Release(&view);
+    Py_XDECREF(converted);
+    return array;
+}
+
+
+static PyObject* index_find_many(index_object* self, PyObject* queries)
+{
+    return index_batch(self, queries, 1);
+}
+
+
+static PyObject* index_lower_bound_many(index_object* self, PyObject* queries)
+{
+    return index_batch(self, queries, 0);
+}
+
+
+static Py_ssize_t index_len(index_object* self)
+{
+    return self->size;
+}
+
+
+static PyObject* index_sizeof(index_object* self, PyObject* args)
+{
+    return PyLong_FromSize_t(sizeof(index_object)
+                             + (self->keys != NULL ? self->size + 1 : 0)
+                               * (sizeof(search_key) + sizeof(Py_ssize_t)));
+}
+
+
+static void index_dealloc(index_object* self)
+{
+    PyMem_Free(self->keys);
+    PyMem_Free(self->ranks);
+    Py_TYPE(self)->tp_free(self);
+}
+
+
+static PyMethodDef index_methods[] = {
+    {"__sizeof__", (PyCFunction) index_sizeof, METH_NOARGS, ""},
+    {"find", (PyCFunction) index_find, METH_O, ""},
+    {"lower_bound", (PyCFunction) index_lower_bound, METH_O, ""},
+    {"find_many", (PyCFunction) index_find_many, METH_O, ""},
+    {"lower_bound_many", (PyCFunction) index_lower_bound_many, METH_O, ""},
+    {NULL}
+};
+
+
+static PySequenceMethods index_sequence_methods = {
+    .sq_length = (lenfunc) index_len
+};
+
+
+static PyTypeObject index_type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "binary_search.Index",
+    .tp_basicsize = sizeof(index_object),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_new = PyType_GenericNew,
+    .tp_init = (initproc) index_init,
+    .tp_dealloc = (destructor) index_dealloc,
+    .tp_methods = index_methods,
+    .tp_as_sequence = &index_sequence_methods
+};
+
+
+typedef struct
+{
+    double key;
+    double slope;
+    Py_ssize_t start;
+} segment;
+
+
+typedef struct
+{
+    PyObject_HEAD
+    char kind;
+    Py_ssize_t size;
+    Py_ssize_t epsilon;
+    search_key* keys;
+    Py_ssize_t count;
+    segment* segments;
+} learned_object;
+
+
+static PyTypeObject learned_type;
+
+
+static double key_value(char kind, const search_key* key)
+{
+    switch(kind)
+    {
+        case 'i': return (double) key->i;
+        case 'u': return (double) key->u;
+        default: return key->d;
+    }
+}
+
+
+static Py_ssize_t build_segments(learned_object* self)
+{
+    Py_ssize_t count = 0;
+    double low = 0, high = INFINITY;
+    for(Py_ssize_t i = 0; i < self->size; i++)
+    {
+        if(i && !key_less(self->kind, &self->keys[i - 1], &self->keys[i]))
+            continue;
+        double x = key_value(self->kind, &self->keys[i]);
+        if(count)
+        {
+            segment* last = &self->segments[count - 1];
+            if(!(x > last->key))
+                continue;
+            double dx = x - last->key;
+            double dy = (double) (i - last->start);
+            double lower = (dy - (double) self->epsilon) / dx;
+            double upper = (dy + (double) self->epsilon) / dx;
+            if(lower <= high && upper >= low)
+            {
+                low = lower > low ? lower : low;
+                high = upper < high ? upper : high;
+                continue;
+            }
+            last->slope = isinf(high) ? 0 : (low + high) / 2;
+        }
+        self->segments[count].key = x;
+        self->segments[count].start = i;
+        self->segments[count].slope = 0;
+        count++;
+        low = 0;
+        high = INFINITY;
+    }
+    if(count && !isinf(high))
+        self->segments[count - 1].slope = (low + high) / 2;
+    return count;
+}
+
+
+static int learned_init(learned_object* self, PyObject* args, PyObject* kwds)
+{
+    static char* kwlist[] = {"sorted", "epsilon", NULL};
+    PyObject* sorted;
+    Py_ssize_t epsilon = 64;
+    if(!PyArg_ParseTupleAndKeywords(args, kwds, "O|n", kwlist, &sorted,
+                                    &epsilon))
+        return -1;
+    if(epsilon < 1)
+    {
+        PyErr_SetString(PyExc_ValueError, "epsilon must be positive");
+        return -1;
+    }
+    Py_buffer view;
+    if(get_index_data(sorted, &view) == -1)
+        return -1;
+    char kind = find_search(&view)->kind;
+    if(check_sorted(&view, kind) == -1)
+    {
+        PyBuffer_Release(&view);
+        return -1;
+    }
+
+    Py_ssize_t size = view.len / view.itemsize;
+    search_key* keys = PyMem_Malloc((size + 1) * sizeof(search_key));
+    segment* segments = PyMem_Malloc((size + 1) * sizeof(segment));
+    if(keys == NULL || segments == NULL)
+    {
+        PyMem_Free(keys);
+        PyMem_Free(segments);
+        PyBuffer_Release(&view);
+        PyErr_NoMemory();
+        return -1;
+    }
+    for(Py_ssize_t i = 0; i < size; i++)
+        read_key(&view, kind, i, &keys[i]);
+    PyBuffer_Release(&view);
+
+    PyMem_Free(self->keys);
+    PyMem_Free(self->segments);
+    self->kind = kind;
+    self->size = size;
+    self->epsilon = epsilon;
+    self->keys = keys;
+    self->segments = segments;
+    self->count = build_segments(self);
+    segment* shrunk = PyMem_Realloc(segments,
+                                    (self->count + 1) * sizeof(segment));
+    if(shrunk != NULL)
+        self->segments = shrunk;
+    return 0;
+}
+
+
+static Py_ssize_t learned_position(const learned_object* self,
+                                   const search_key* key, Py_ssize_t* probes)
+{
+    double x = key_value(self->kind, key);
+    Py_ssize_t low = 0, high = self->count;
+    while(low < high)
+    {
+        Py_ssize_t mid = low + (high - low) / 2;
+        ++*probes;
+        if(self->segments[mid].key <= x)
+            low = mid + 1;
+        else
+            high = mid;
+    }
+    Py_ssize_t hint = 0;
+    if(low)
+    {
+        const segment* model = &self->segments[low - 1];
+        double predicted = (double) model->start
+                           + model->slope * (x - model->key);
+        if(predicted >= (double) self->size)
+            hint = self->size;
+        else if(predicted > 0)
+            hint = (Py_ssize_t) predicted;
+    }
+    const typed_search* typed = &typed_searches[
+        self->kind == 'i' ? 3 : self->kind == 'u' ? 7 : 9];
+    return typed->modes[2](self->keys, self->size, key, hint, probes);
+}
+
+
+static PyObject* learned_result(Py_ssize_t index, Py_ssize_t probes,
+                                int count_probes)
+{
+    PyObject* result = index != -1 ? PyLong_FromSsize_t(index)
+                                   : Py_NewRef(Py_None);
+    if(!count_probes || result == NULL)
+        return result;
+    return Py_BuildValue("Nn", result, probes);
+}
+
+
+static PyObject* learned_find(learned_object* self, PyObject* args,
+                              PyObject* kwds)
+{
+    static char* kwlist[] = {"x", "probes", NULL};
+    PyObject* item;
+    int count_probes = 0;
+    if(!PyArg_ParseTupleAndKeywords(args, kwds, "O|$p", kwlist, &item,
+                                    &count_probes))
+        return NULL;
+    search_key key;
+    int status = exact_key(self->kind, item, &key);
+    if(status == -1)
+        return NULL;
+    Py_ssize_t index = -1, probes = 0;
+    if(status)
+    {
+        index = learned_position(self, &key, &probes);
+        if(index >= self->size
+           || key_less(self->kind, &key, &self->keys[index]))
+            index = -1;
+    }
+    return learned_result(index, probes, count_probes);
+}
+
+
+static PyObject* learned_lower_bound(learned_object* self, PyObject* args,
+                                     PyObject* kwds)
+{
+    static char* kwlist[] = {"x", "probes", NULL};
+    PyObject* item;
+    int count_probes = 0;
+    if(!PyArg_ParseTupleAndKeywords(args, kwds, "O|$p", kwlist, &item,
+                                    &count_probes))
+        return NULL;
+    search_key key;
+    int above;
+    int status = bound_key(self->kind, item, &key, &above);
+    if(status == -1)
         return NULL;
-    int left = 0;
-    int right = (int) PySequence_Size(iterable) - 1;
-    int mid;
-    while(left < right)
+    Py_ssize_t probes = 0;
+    Py_ssize_t index = status ? learned_position(self, &key, &probes)
+                              : above ? self->size : 0;
+    return learned_result(index, probes, count_probes);
+}
+
+
+static Py_ssize_t learned_len(learned_object* self)
+{
+    return self->size;
+}
+
+
+static PyObject* learned_sizeof(learned_object* self, PyObject* args)
+{
+    if(self->keys == NULL)
+        return PyLong_FromSize_t(sizeof(learned_object));
+    return PyLong_FromSize_t(sizeof(learned_object)
+                             + (self->size + 1) * sizeof(search_key)
+                             + (self->count + 1) * sizeof(segment));
+}
+
+
+static PyObject* get_segments(learned_object* self, void* closure)
+{
+    return PyLong_FromSsize_t(self->count);
+}
+
+
+static PyObject* get_epsilon(learned_object* self, void* closure)
+{
+    return PyLong_FromSsize_t(self->epsilon);
+}
+
+
+static void learned_dealloc(learned_object* self)
+{
+    PyMem_Free(self->keys);
+    PyMem_Free(self->segments);
+    Py_TYPE(self)->tp_free(self);
+}
+
+
+static PyMethodDef learned_methods[] = {
+    {"__sizeof__", (PyCFunction) learned_sizeof, METH_NOARGS, ""},
+    {"find", (PyCFunction) learned_find, METH_VARARGS | METH_KEYWORDS, ""},
+    {"lower_bound", (PyCFunction) learned_lower_bound,
+     METH_VARARGS | METH_KEYWORDS, ""},
+    {NULL}
+};
+
+
+static PyGetSetDef learned_getset[] = {
+    {"segments", (getter) get_segments, NULL, "", NULL},
+    {"epsilon", (getter) get_epsilon, NULL, "", NULL},
+    {NULL}
+};
+
+
+static PySequenceMethods learned_sequence_methods = {
+    .sq_length = (lenfunc) learned_len
+};
+
+
+static PyTypeObject learned_type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "binary_search.LearnedIndex",
+    .tp_basicsize = sizeof(learned_object),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_new = PyType_GenericNew,
+    .tp_init = (initproc) learned_init,
+    .tp_dealloc = (destructor) learned_dealloc,
+    .tp_methods = learned_methods,
+    .tp_getset = learned_getset,
+    .tp_as_sequence = &learned_sequence_methods
+};
+
+
+typedef struct
+{
+    PyObject_HEAD
+    char kind;
+    int swap;
+    int closed;
+    Py_ssize_t itemsize;
+    Py_ssize_t record_size;
+    Py_ssize_t key_offset;
+    Py_ssize_t size;
+    Py_ssize_t stride;
+    Py_ssize_t count;
+    search_key* sparse;
+    char* map;
+    size_t length;
+    Py_ssize_t readers;
+} record_object;
+
+
+static PyTypeObject record_type;
+
+
+static int parse_key_type(const char* format, const typed_search** typed,
+                          Py_ssize_t* itemsize, int* swap)
+{
+    static const char codes[] = "bBhHiIlLqQfd";
+    static const Py_ssize_t sizes[] = {
+        1, 1, 2, 2, 4, 4, sizeof(long), sizeof(long), 8, 8, 4, 8
+    };
+    const char* type = format;
+    char order = '@';
+    if(type[0] && strchr("@=<>!", type[0]))
+        order = *type++;
+    const char* code = type[0] && !type[1] ? strchr(codes, type[0]) : NULL;
+    if(code == NULL)
+    {
+        PyErr_Format(PyExc_ValueError, "unsupported key type '%s'", format);
+        return -1;
+    }
+    *itemsize = sizes[code - codes];
+    if(order != '@' && (*code == 'l' || *code == 'L'))
+        *itemsize = 4;
+    Py_buffer view = {.format = (char*) type, .itemsize = *itemsize};
+    *typed = find_search(&view);
+#if PY_LITTLE_ENDIAN
+    *swap = order == '>' || order == '!';
+#else
+    *swap = order == '<';
+#endif
+    return 0;
+}
+
+
+static void record_key(const record_object* self, Py_ssize_t index,
+                       search_key* key)
+{
+    union
+    {
+        char bytes[sizeof(search_key)];
+        search_key aligned;
+    } item;
+    const char* source = self->map + index * self->record_size
+                         + self->key_offset;
+    for(Py_ssize_t i = 0; i < self->itemsize; i++)
+        item.bytes[i] = source[self->swap ? self->itemsize - 1 - i : i];
+    decode_key(self->kind, self->itemsize, item.bytes, key);
+}
+
+
+static int record_before(char kind, const search_key* item,
+                         const search_key* key, int right)
+{
+    return right ? !key_less(kind, key, item) : key_less(kind, item, key);
+}
+
+
+static Py_ssize_t record_bound(const record_object* self,
+                               const search_key* key, int right)
+{
+    Py_ssize_t low = 0, high = self->size;
+    if(self->sparse != NULL)
+    {
+        Py_ssize_t first = 0, last = self->count;
+        while(first < last)
+        {
+            Py_ssize_t mid = first + (last - first) / 2;
+            if(record_before(self->kind, &self->sparse[mid], key, right))
+                first = mid + 1;
+            else
+                last = mid;
+        }
+        if(first)
+            low = (first - 1) * self->stride + 1;
+        if(first < self->count)
+            high = first * self->stride;
+    }
+    while(low < high)
     {
-        mid = (left + right) / 2;
-        if(PyObject_RichCompareBool(
-                item, PySequence_GetItem(iterable, mid), Py_LE
-            ))
-            right = mid;
+        Py_ssize_t mid = low + (high - low) / 2;
+        search_key item;
+        record_key(self, mid, &item);
+        if(record_before(self->kind, &item, key, right))
+            low = mid + 1;
         else
-            left = mid + 1;
+            high = mid;
+    }
+    return low;
+}
+
+
+static int check_unused(record_object* self)
+{
+    if(self->readers > 0)
+    {
+        PyErr_SetString(PyExc_BufferError,
+                        "cannot unmap a file that is being searched");
+        return -1;
+    }
+    return 0;
+}
+
+
+static void record_unmap(record_object* self)
+{
+    if(self->map != NULL)
+        munmap(self->map, self->length);
+    PyMem_Free(self->sparse);
+    self->map = NULL;
+    self->sparse = NULL;
+    self->length = 0;
+    self->size = 0;
+    self->count = 0;
+}
+
+
+static int record_init(record_object* self, PyObject* args, PyObject* kwds)
+{
+    static char* kwlist[] = {"path", "record_size", "key_offset",
+                             "key_type", "stride", NULL};
+    PyObject* path;
+    Py_ssize_t record_size, key_offset = 0, stride = 0;
+    const char* key_type = "q";
+    if(!PyArg_ParseTupleAndKeywords(args, kwds, "O&n|nsn", kwlist,
+                                    PyUnicode_FSConverter, &path,
+                                    &record_size, &key_offset, &key_type,
+                                    &stride))
+        return -1;
+    const typed_search* typed;
+    Py_ssize_t itemsize;
+    int swap;
+    if(parse_key_type(key_type, &typed, &itemsize, &swap) == -1)
+    {
+        Py_DECREF(path);
+        return -1;
+    }
+    if(key_offset < 0 || record_size < key_offset + itemsize)
+    {
+        Py_DECREF(path);
+        PyErr_SetString(PyExc_ValueError, "key does not fit into the record");
+        return -1;
+    }
+    if(stride < 0)
+    {
+        Py_DECREF(path);
+        PyErr_SetString(PyExc_ValueError, "stride must be non-negative");
+        return -1;
+    }
+
+    int fd = open(PyBytes_AS_STRING(path), O_RDONLY);
+    struct stat info;
+    if(fd == -1 || fstat(fd, &info) == -1)
+    {
+        PyErr_SetFromErrnoWithFilenameObject(PyExc_OSError, path);
+        if(fd != -1)
+            close(fd);
+        Py_DECREF(path);
+        return -1;
+    }
+    Py_DECREF(path);
+    size_t length = (size_t) info.st_size;
+    if(length % (size_t) record_size)
+    {
+        close(fd);
+        PyErr_SetString(PyExc_ValueError,
+                        "file size not a multiple of record size");
+        return -1;
+    }
+    char* map = NULL;
+    if(length)
+    {
+        map = mmap(NULL, length, PROT_READ, MAP_SHARED, fd, 0);
+        if(map == MAP_FAILED)
+        {
+            PyErr_SetFromErrno(PyExc_OSError);
+            close(fd);
+            return -1;
+        }
+        madvise(map, length, MADV_RANDOM);
+    }
+    close(fd);
+    if(check_unused(self) == -1)
+    {
+        if(map != NULL)
+            munmap(map, length);
+        return -1;
+    }
+
+    record_unmap(self);
+    self->kind = typed->kind;
+    self->swap = swap;
+    self->closed = 0;
+    self->itemsize = itemsize;
+    self->record_size = record_size;
+    self->key_offset = key_offset;
+    self->map = map;
+    self->length = length;
+    self->size = (Py_ssize_t) (length / (size_t) record_size);
+    self->stride = stride;
+    if(stride && self->size)
+    {
+        Py_ssize_t count = (self->size + stride - 1) / stride;
+        self->sparse = PyMem_Malloc(count * sizeof(search_key));
+        if(self->sparse == NULL)
+        {
+            record_unmap(self);
+            PyErr_NoMemory();
+            return -1;
+        }
+        self->readers++;
+        Py_BEGIN_ALLOW_THREADS
+        for(Py_ssize_t i = 0; i < count; i++)
+            record_key(self, i * stride, &self->sparse[i]);
+        Py_END_ALLOW_THREADS
+        self->readers--;
+        self->count = count;
+    }
+    return 0;
+}
+
+
+static int check_mapped(record_object* self)
+{
+    if(self->closed)
+    {
+        PyErr_SetString(PyExc_ValueError, "I/O operation on closed file");
+        return -1;
+    }
+    return 0;
+}
+
+
+static PyObject* record_search(record_object* self, PyObject* item,
+                               int right)
+{
+    search_key key;
+    int above;
+    int status = right ? exact_key(self->kind, item, &key) : 0;
+    if(status == -1 || check_mapped(self) == -1)
+        return NULL;
+    if(!status)
+    {
+        right = 0;
+        status = bound_key(self->kind, item, &key, &above);
+        if(status == -1)
+            return NULL;
+        if(!status)
+            return PyLong_FromSsize_t(above ? self->size : 0);
+    }
+    return PyLong_FromSsize_t(record_bound(self, &key, right));
+}
+
+
+static PyObject* record_lower_bound(record_object* self, PyObject* item)
+{
+    return record_search(self, item, 0);
+}
+
+
+static PyObject* record_upper_bound(record_object* self, PyObject* item)
+{
+    return record_search(self, item, 1);
+}
+
+
+static PyObject* record_find(record_object* self, PyObject* item)
+{
+    search_key key;
+    int status = exact_key(self->kind, item, &key);
+    if(status == -1 || check_mapped(self) == -1)
+        return NULL;
+    if(!status)
+        Py_RETURN_NONE;
+    Py_ssize_t index = record_bound(self, &key, 0);
+    int missing = index >= self->size;
+    if(!missing)
+    {
+        search_key found;
+        record_key(self, index, &found);
+        missing = key_less(self->kind, &key, &found);
     }
-    if(right < 0 || PyObject_RichCompareBool(
-            item, PySequence_GetItem(iterable, left), Py_NE
-        ))
+    if(missing)
+        Py_RETURN_NONE;
+    return PyLong_FromSsize_t(index);
+}
+
+
+static PyObject* record_item(record_object* self, Py_ssize_t index)
+{
+    if(check_mapped(self) == -1)
+        return NULL;
+    if(index < 0 || index >= self->size)
     {
-        Py_INCREF(Py_None);
-        return Py_None;
+        PyErr_SetString(PyExc_IndexError, "record index out of range");
+        return NULL;
     }
-    item = PyLong_FromLong(left);
-    Py_INCREF(item);
-    return item;
+    return PyBytes_FromStringAndSize(self->map + index * self->record_size,
+                                     self->record_size);
+}
+
+
+static Py_ssize_t record_len(record_object* self)
+{
+    return self->size;
+}
+
+
+static PyObject* record_close(record_object* self, PyObject* args)
+{
+    if(check_unused(self) == -1)
+        return NULL;
+    record_unmap(self);
+    self->closed = 1;
+    Py_RETURN_NONE;
+}
+
+
+static PyObject* record_enter(record_object* self, PyObject* args)
+{
+    Py_INCREF(self);
+    return (PyObject*) self;
+}
+
+
+static PyObject* record_exit(record_object* self, PyObject* args)
+{
+    return record_close(self, NULL);
+}
+
+
+static PyObject* record_sizeof(record_object* self, PyObject* args)
+{
+    return PyLong_FromSize_t(sizeof(record_object)
+                             + self->count * sizeof(search_key));
+}
+
+
+static PyObject* get_record_size(record_object* self, void* closure)
+{
+    return PyLong_FromSsize_t(self->record_size);
+}
+
+
+static PyObject* get_stride(record_object* self, void* closure)
+{
+    return PyLong_FromSsize_t(self->stride);
+}
+
+
+static void record_dealloc(record_object* self)
+{
+    record_unmap(self);
+    Py_TYPE(self)->tp_free(self);
 }
 
 
+static PyMethodDef record_methods[] = {
+    {"__sizeof__", (PyCFunction) record_sizeof, METH_NOARGS, ""},
+    {"__enter__", (PyCFunction) record_enter, METH_NOARGS, ""},
+    {"__exit__", (PyCFunction) record_exit, METH_VARARGS, ""},
+    {"close", (PyCFunction) record_close, METH_NOARGS, ""},
+    {"find", (PyCFunction) record_find, METH_O, ""},
+    {"lower_bound", (PyCFunction) record_lower_bound, METH_O, ""},
+    {"upper_bound", (PyCFunction) record_upper_bound, METH_O, ""},
+    {NULL}
+};
+
+
+static PyGetSetDef record_getset[] = {
+    {"record_size", (getter) get_record_size, NULL, "", NULL},
+    {"stride", (getter) get_stride, NULL, "", NULL},
+    {NULL}
+};
+
+
+static PySequenceMethods record_sequence_methods = {
+    .sq_length = (lenfunc) record_len,
+    .sq_item = (ssizeargfunc) record_item
+};
+
+
+static PyTypeObject record_type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "binary_search.RecordFile",
+    .tp_basicsize = sizeof(record_object),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_new = PyType_GenericNew,
+    .tp_init = (initproc) record_init,
+    .tp_dealloc = (destructor) record_dealloc,
+    .tp_methods = record_methods,
+    .tp_getset = record_getset,
+    .tp_as_sequence = &record_sequence_methods
+};
+
+
 static PyMethodDef binary_search_funcs[] = {
     {"binary_search", (PyCFunction) binary_search, METH_VARARGS, ""},
+    {"bisect_left", (PyCFunction) bisect_left, METH_VARARGS | METH_KEYWORDS,
+     ""},
+    {"bisect_right", (PyCFunction) bisect_right,
+     METH_VARARGS | METH_KEYWORDS, ""},
+    {"find", (PyCFunction) find, METH_VARARGS | METH_KEYWORDS, ""},
+    {"binary_search_many", (PyCFunction) binary_search_many, METH_VARARGS,
+     ""},
+    {"search", (PyCFunction) search, METH_VARARGS | METH_KEYWORDS, ""},
     {NULL}
 };
 
@@ -49,7 +2068,35 @@ static PyModuleDef binary_search_module = {
 
 PyMODINIT_FUNC PyInit_binary_search()
 {
+    if(PyType_Ready(&index_type) < 0 || PyType_Ready(&learned_type) < 0
+       || PyType_Ready(&record_type) < 0)
+        return NULL;
     PyObject* module = PyModule_Create(&binary_search_module);
+    if(module == NULL)
+        return NULL;
     PyModule_AddFunctions(module, &binary_search_funcs[0]);
+    Py_INCREF(&index_type);
+    if(PyModule_AddObject(module, "Index", (PyObject*) &index_type) < 0)
+    {
+        Py_DECREF(&index_type);
+        Py_DECREF(module);
+        return NULL;
+    }
+    Py_INCREF(&learned_type);
+    if(PyModule_AddObject(module, "LearnedIndex", (PyObject*) &learned_type)
+       < 0)
+    {
+        Py_DECREF(&learned_type);
+        Py_DECREF(module);
+        return NULL;
+    }
+    Py_INCREF(&record_type);
+    if(PyModule_AddObject(module, "RecordFile", (PyObject*) &record_type)
+       < 0)
+    {
+        Py_DECREF(&record_type);
+        Py_DECREF(module);
+        return NULL;
+    }
     return module;
 }
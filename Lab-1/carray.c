@@ -1,19 +1,4605 @@
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
+#include <errno.h>
 #include <float.h>
+#include <math.h>
+#include <stdbool.h>
+#include <stdint.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+
+
+typedef signed char signed_char;
+typedef unsigned char unsigned_char;
+typedef unsigned short unsigned_short;
+typedef unsigned int unsigned_int;
+typedef unsigned long unsigned_long;
+typedef long long long_long;
+typedef unsigned long long unsigned_long_long;
+typedef bool boolean;
+
+#define SIGNED_TYPES(M) \
+    M(signed_char) M(short) M(int) M(long) M(long_long)
+#define UNSIGNED_INTEGER_TYPES(M) \
+    M(unsigned_char) M(unsigned_short) M(unsigned_int) M(unsigned_long) \
+    M(unsigned_long_long)
+#define UNSIGNED_TYPES(M) UNSIGNED_INTEGER_TYPES(M) M(boolean)
+#define INTEGER_TYPES(M) SIGNED_TYPES(M) UNSIGNED_TYPES(M)
+#define FLOAT_TYPES(M) M(float) M(double)
+#define ALL_TYPES(M) INTEGER_TYPES(M) FLOAT_TYPES(M)
+
+
+typedef struct
+{
+    char* format;
+    const char* name;
+    short t_size;
+    int (*store)(PyObject*, void*);
+    PyObject* (*load)(const void*);
+    int (*to_key)(PyObject*, void*);
+    void (*reversed)(const void*, void*, size_t);
+    PyObject* (*sum)(PyObject*);
+    void (*extreme)(PyObject*, int, void*);
+    Py_ssize_t (*find)(PyObject*, const void*, size_t, size_t);
+    size_t (*count)(PyObject*, const void*);
+    PyObject* (*tolist)(PyObject*);
+    int (*sort)(void*, size_t);
+    size_t (*search)(const void*, size_t, const void*, int);
+    int (*arith)(int, const void*, size_t, const void*, size_t, void*,
+                 size_t);
+    int (*divide)(const void*, size_t, const void*, size_t, double*, size_t);
+    void (*compare)(int, const void*, size_t, const void*, size_t, bool*,
+                    size_t);
+    int (*text)(const void*, char*);
+    int (*parse)(const char*, void*);
+} object_methods;
+
+
+typedef union
+{
+    long long i;
+    double d;
+} item_buffer;
+
+
+typedef struct
+{
+    PyObject_HEAD
+    short t_size;
+    object_methods* methods;
+    size_t size;
+    size_t capacity;
+    void* items;
+    Py_ssize_t exports;
+    Py_buffer* base;
+    int fd;
+    int readonly;
+    int shared;
+    size_t header;
+    char* map;
+} carray_object;
+
+
+#define HEADER_MAGIC "CARR"
+
+typedef struct
+{
+    char magic[4];
+    char typecode;
+    char reserved[3];
+    uint64_t size;
+} file_header;
+
+
+static PyTypeObject carray_type;
+
+
+static int get_signed(PyObject* num, long long min, long long max,
+                      const char* name, long long* value)
+{
+    if(!PyLong_Check(num))
+    {
+        PyErr_Format(PyExc_TypeError, "value must be C %s", name);
+        return -1;
+    }
+    int overflow;
+    *value = PyLong_AsLongLongAndOverflow(num, &overflow);
+    if(*value == -1 && PyErr_Occurred())
+        return -1;
+    if(overflow || *value < min || *value > max)
+    {
+        PyErr_Format(PyExc_OverflowError, "value out of range for C %s",
+                     name);
+        return -1;
+    }
+    return 0;
+}
+
+
+static int get_unsigned(PyObject* num, unsigned long long max,
+                        const char* name, unsigned long long* value)
+{
+    if(!PyLong_Check(num))
+    {
+        PyErr_Format(PyExc_TypeError, "value must be C %s", name);
+        return -1;
+    }
+    int overflow;
+    long long small = PyLong_AsLongLongAndOverflow(num, &overflow);
+    if(small == -1 && PyErr_Occurred())
+        return -1;
+    if(overflow > 0)
+        *value = PyLong_AsUnsignedLongLong(num);
+    if(overflow < 0 || (!overflow && small < 0)
+       || (overflow > 0 && PyErr_Occurred())
+       || (!overflow && (unsigned long long) small > max))
+    {
+        PyErr_Clear();
+        PyErr_Format(PyExc_OverflowError, "value out of range for C %s",
+                     name);
+        return -1;
+    }
+    if(!overflow)
+        *value = (unsigned long long) small;
+    return 0;
+}
+
+
+static int get_floating(PyObject* num, double max, const char* name,
+                        double* value)
+{
+    *value = PyFloat_CheckExact(num)
+        ? PyFloat_AS_DOUBLE(num) : PyFloat_AsDouble(num);
+    if(*value == -1.0 && PyErr_Occurred())
+    {
+        if(PyErr_ExceptionMatches(PyExc_TypeError))
+        {
+            PyErr_Clear();
+            PyErr_Format(PyExc_TypeError, "value must be C %s", name);
+        }
+        return -1;
+    }
+    if(isfinite(*value) && fabs(*value) > max)
+    {
+        PyErr_Format(PyExc_OverflowError, "value out of range for C %s",
+                     name);
+        return -1;
+    }
+    return 0;
+}
+
+
+#define STORE_SIGNED(type, min, max, name) static int store_##type( \
+    PyObject* num, void* item) \
+{ \
+    long long value; \
+    if(get_signed(num, min, max, name, &value) == -1) \
+        return -1; \
+    *(type*) item = (type) value; \
+    return 0; \
+}
+
+#define STORE_UNSIGNED(type, max, name) static int store_##type( \
+    PyObject* num, void* item) \
+{ \
+    unsigned long long value; \
+    if(get_unsigned(num, max, name, &value) == -1) \
+        return -1; \
+    *(type*) item = (type) value; \
+    return 0; \
+}
+
+#define STORE_FLOAT(type, max, name) static int store_##type( \
+    PyObject* num, void* item) \
+{ \
+    double value; \
+    if(get_floating(num, max, name, &value) == -1) \
+        return -1; \
+    *(type*) item = (type) value; \
+    return 0; \
+}
+
+STORE_SIGNED(signed_char, SCHAR_MIN, SCHAR_MAX, "signed char")
+STORE_SIGNED(short, SHRT_MIN, SHRT_MAX, "short")
+STORE_SIGNED(int, INT_MIN, INT_MAX, "int")
+STORE_SIGNED(long, LONG_MIN, LONG_MAX, "long")
+STORE_SIGNED(long_long, LLONG_MIN, LLONG_MAX, "long long")
+STORE_UNSIGNED(unsigned_char, UCHAR_MAX, "unsigned char")
+STORE_UNSIGNED(unsigned_short, USHRT_MAX, "unsigned short")
+STORE_UNSIGNED(unsigned_int, UINT_MAX, "unsigned int")
+STORE_UNSIGNED(unsigned_long, ULONG_MAX, "unsigned long")
+STORE_UNSIGNED(unsigned_long_long, ULLONG_MAX, "unsigned long long")
+STORE_UNSIGNED(boolean, 1, "bool")
+STORE_FLOAT(float, FLT_MAX, "float")
+STORE_FLOAT(double, DBL_MAX, "double")
+
+
+static int signed_key(PyObject* num, long long min, long long max,
+                      long long* key)
+{
+    if(PyFloat_Check(num))
+    {
+        double value = PyFloat_AS_DOUBLE(num);
+        if(value != floor(value) || value < (double) min
+           || value >= (double) max + 1.0)
+            return 0;
+        *key = (long long) value;
+        return 1;
+    }
+    if(!PyLong_Check(num))
+        return 0;
+    int overflow;
+    *key = PyLong_AsLongLongAndOverflow(num, &overflow);
+    if(*key == -1 && PyErr_Occurred())
+        return -1;
+    return !overflow && *key >= min && *key <= max;
+}
+
+
+static int unsigned_key(PyObject* num, unsigned long long max,
+                        unsigned long long* key)
+{
+    if(PyFloat_Check(num))
+    {
+        double value = PyFloat_AS_DOUBLE(num);
+        if(value != floor(value) || value < 0.0
+           || value >= (double) max + 1.0)
+            return 0;
+        *key = (unsigned long long) value;
+        return 1;
+    }
+    if(!PyLong_Check(num))
+        return 0;
+    int overflow;
+    long long small = PyLong_AsLongLongAndOverflow(num, &overflow);
+    if(small == -1 && PyErr_Occurred())
+        return -1;
+    if(overflow < 0 || (!overflow && small < 0))
+        return 0;
+    if(overflow > 0)
+    {
+        *key = PyLong_AsUnsignedLongLong(num);
+        if(PyErr_Occurred())
+        {
+            if(!PyErr_ExceptionMatches(PyExc_OverflowError))
+                return -1;
+            PyErr_Clear();
+            return 0;
+        }
+    }
+    else
+        *key = (unsigned long long) small;
+    return *key <= max;
+}
+
+
+static int floating_key(PyObject* num, double* key)
+{
+    if(PyFloat_Check(num))
+        *key = PyFloat_AS_DOUBLE(num);
+    else if(PyLong_Check(num))
+    {
+        *key = PyLong_AsDouble(num);
+        if(*key == -1.0 && PyErr_Occurred())
+        {
+            if(!PyErr_ExceptionMatches(PyExc_OverflowError))
+                return -1;
+            PyErr_Clear();
+            return 0;
+        }
+        if(fabs(*key) >= 9007199254740992.0)
+        {
+            PyObject* exact = PyLong_FromDouble(*key);
+            int equal = exact == NULL
+                ? -1 : PyObject_RichCompareBool(exact, num, Py_EQ);
+            Py_XDECREF(exact);
+            if(equal != 1)
+                return equal;
+        }
+    }
+    else
+        return 0;
+    return *key == *key;
+}
+
+
+#define KEY_SIGNED(type, min, max) static int type##_key( \
+    PyObject* num, void* key) \
+{ \
+    long long value; \
+    int found = signed_key(num, min, max, &value); \
+    if(found == 1) \
+        *(type*) key = (type) value; \
+    return found; \
+}
+
+#define KEY_UNSIGNED(type, max) static int type##_key( \
+    PyObject* num, void* key) \
+{ \
+    unsigned long long value; \
+    int found = unsigned_key(num, max, &value); \
+    if(found == 1) \
+        *(type*) key = (type) value; \
+    return found; \
+}
+
+#define KEY_FLOAT(type) static int type##_key(PyObject* num, void* key) \
+{ \
+    double value; \
+    int found = floating_key(num, &value); \
+    if(found != 1) \
+        return found; \
+    *(type*) key = (type) value; \
+    return *(type*) key == value; \
+}
+
+KEY_SIGNED(signed_char, SCHAR_MIN, SCHAR_MAX)
+KEY_SIGNED(short, SHRT_MIN, SHRT_MAX)
+KEY_SIGNED(int, INT_MIN, INT_MAX)
+KEY_SIGNED(long, LONG_MIN, LONG_MAX)
+KEY_SIGNED(long_long, LLONG_MIN, LLONG_MAX)
+KEY_UNSIGNED(unsigned_char, UCHAR_MAX)
+KEY_UNSIGNED(unsigned_short, USHRT_MAX)
+KEY_UNSIGNED(unsigned_int, UINT_MAX)
+KEY_UNSIGNED(unsigned_long, ULONG_MAX)
+KEY_UNSIGNED(unsigned_long_long, ULLONG_MAX)
+KEY_UNSIGNED(boolean, 1)
+KEY_FLOAT(float)
+KEY_FLOAT(double)
+
+
+#define LOAD(type, convert) static PyObject* load_##type(const void* item) \
+{ \
+    return convert(*(const type*) item); \
+}
+
+LOAD(signed_char, PyLong_FromLong)
+LOAD(short, PyLong_FromLong)
+LOAD(int, PyLong_FromLong)
+LOAD(long, PyLong_FromLong)
+LOAD(long_long, PyLong_FromLongLong)
+LOAD(unsigned_char, PyLong_FromUnsignedLong)
+LOAD(unsigned_short, PyLong_FromUnsignedLong)
+LOAD(unsigned_int, PyLong_FromUnsignedLong)
+LOAD(unsigned_long, PyLong_FromUnsignedLong)
+LOAD(unsigned_long_long, PyLong_FromUnsignedLongLong)
+LOAD(boolean, PyBool_FromLong)
+LOAD(float, PyFloat_FromDouble)
+LOAD(double, PyFloat_FromDouble)
+
+
+#define TEXT_SIZE 32
+
+#define TEXT_INTEGER(type, wide, spec) static int text_##type( \
+    const void* item, char* buffer) \
+{ \
+    return snprintf(buffer, TEXT_SIZE, spec, (wide) *(const type*) item); \
+}
+
+#define TEXT_FLOAT(type) static int text_##type( \
+    const void* item, char* buffer) \
+{ \
+    char* text = PyOS_double_to_string((double) *(const type*) item, 'r', \
+                                       0, Py_DTSF_ADD_DOT_0, NULL); \
+    if(text == NULL) \
+        return -1; \
+    int length = snprintf(buffer, TEXT_SIZE, "%s", text); \
+    PyMem_Free(text); \
+    return length; \
+}
+
+#define TEXT_SIGNED(type) TEXT_INTEGER(type, long long, "%lld")
+#define TEXT_UNSIGNED(type) TEXT_INTEGER(type, unsigned long long, "%llu")
+
+SIGNED_TYPES(TEXT_SIGNED)
+UNSIGNED_INTEGER_TYPES(TEXT_UNSIGNED)
+FLOAT_TYPES(TEXT_FLOAT)
+
+
+static int text_boolean(const void* item, char* buffer)
+{
+    return snprintf(buffer, TEXT_SIZE, "%s",
+                    *(const boolean*) item ? "True" : "False");
+}
+
+
+static int parse_error(const char* text, const char* name)
+{
+    PyErr_Format(PyExc_ValueError, "could not convert '%s' to C %s",
+                 text, name);
+    return -1;
+}
+
+
+static int range_error(const char* name)
+{
+    PyErr_Format(PyExc_OverflowError, "value out of range for C %s", name);
+    return -1;
+}
+
+
+#define PARSE_SIGNED(type, min, max, name) static int parse_##type( \
+    const char* text, void* item) \
+{ \
+    char* end; \
+    errno = 0; \
+    long long value = strtoll(text, &end, 10); \
+    if(end == text || *end) \
+        return parse_error(text, name); \
+    if(errno == ERANGE || value < min || value > max) \
+        return range_error(name); \
+    *(type*) item = (type) value; \
+    return 0; \
+}
+
+#define PARSE_UNSIGNED(type, max, name) static int parse_##type( \
+    const char* text, void* item) \
+{ \
+    char* end; \
+    errno = 0; \
+    unsigned long long value = strtoull(text, &end, 10); \
+    if(end == text || *end) \
+        return parse_error(text, name); \
+    if(errno == ERANGE || (*text == '-' && value) || value > max) \
+        return range_error(name); \
+    *(type*) item = (type) value; \
+    return 0; \
+}
+
+#define PARSE_FLOAT(type, max, name) static int parse_##type( \
+    const char* text, void* item) \
+{ \
+    char* end; \
+    double value = PyOS_string_to_double(text, &end, NULL); \
+    if(value == -1.0 && PyErr_Occurred()) \
+    { \
+        PyErr_Clear(); \
+        return parse_error(text, name); \
+    } \
+    if(*end) \
+        return parse_error(text, name); \
+    if(isfinite(value) && fabs(value) > max) \
+        return range_error(name); \
+    *(type*) item = (type) value; \
+    return 0; \
+}
+
+PARSE_SIGNED(signed_char, SCHAR_MIN, SCHAR_MAX, "signed char")
+PARSE_SIGNED(short, SHRT_MIN, SHRT_MAX, "short")
+PARSE_SIGNED(int, INT_MIN, INT_MAX, "int")
+PARSE_SIGNED(long, LONG_MIN, LONG_MAX, "long")
+PARSE_SIGNED(long_long, LLONG_MIN, LLONG_MAX, "long long")
+PARSE_UNSIGNED(unsigned_char, UCHAR_MAX, "unsigned char")
+PARSE_UNSIGNED(unsigned_short, USHRT_MAX, "unsigned short")
+PARSE_UNSIGNED(unsigned_int, UINT_MAX, "unsigned int")
+PARSE_UNSIGNED(unsigned_long, ULONG_MAX, "unsigned long")
+PARSE_UNSIGNED(unsigned_long_long, ULLONG_MAX, "unsigned long long")
+PARSE_FLOAT(float, FLT_MAX, "float")
+PARSE_FLOAT(double, DBL_MAX, "double")
+
+
+static int parse_boolean(const char* text, void* item)
+{
+    if(strcmp(text, "True") == 0 || strcmp(text, "1") == 0)
+        *(boolean*) item = true;
+    else if(strcmp(text, "False") == 0 || strcmp(text, "0") == 0)
+        *(boolean*) item = false;
+    else
+        return parse_error(text, "bool");
+    return 0;
+}
+
+
+static int check_writable(carray_object* self)
+{
+    if(self->readonly)
+    {
+        PyErr_SetString(PyExc_TypeError, "cannot modify read-only array");
+        return -1;
+    }
+    return 0;
+}
+
+
+static int set_item(carray_object* self, Py_ssize_t index, PyObject* num)
+{
+    if(check_writable(self) == -1)
+        return -1;
+    if(index >= 0 && (size_t) index < self->size)
+        return self->methods->store(
+            num, (char*) self->items + index * self->t_size
+        );
+    PyErr_SetString(PyExc_IndexError, "index out of range");
+    return -1;
+}
+
+
+static PyObject* get_item(carray_object* self, Py_ssize_t index)
+{
+    if(index >= 0 && (size_t) index < self->size)
+        return self->methods->load(
+            (char*) self->items + index * self->t_size
+        );
+    PyErr_SetString(PyExc_IndexError, "index out of range");
+    return NULL;
+}
+
+
+static int check_resizable(carray_object* self)
+{
+    if(check_writable(self) == -1)
+        return -1;
+    if(self->base != NULL)
+    {
+        PyErr_SetString(PyExc_BufferError, "cannot resize a carray view");
+        return -1;
+    }
+    if(self->exports > 0)
+    {
+        PyErr_SetString(PyExc_BufferError,
+                        "cannot resize an array that is exporting buffers");
+        return -1;
+    }
+    if(self->shared)
+    {
+        PyErr_SetString(PyExc_BufferError, "cannot resize a shared array");
+        return -1;
+    }
+    return 0;
+}
+
+
+static int remap(carray_object* self, size_t capacity)
+{
+    size_t old_length = self->header + self->capacity * self->t_size;
+    size_t length = self->header + capacity * self->t_size;
+    if(length > old_length && ftruncate(self->fd, (off_t) length) == -1)
+    {
+        PyErr_SetFromErrno(PyExc_OSError);
+        return -1;
+    }
+    char* map = NULL;
+    if(length)
+    {
+        int prot = self->readonly ? PROT_READ : PROT_READ | PROT_WRITE;
+        map = mmap(NULL, length, prot, MAP_SHARED, self->fd, 0);
+        if(map == MAP_FAILED)
+        {
+            PyErr_SetFromErrno(PyExc_OSError);
+            if(length > old_length)
+                (void) ftruncate(self->fd, (off_t) old_length);
+            return -1;
+        }
+    }
+    if(self->map != NULL)
+        munmap(self->map, old_length);
+    if(length < old_length)
+        (void) ftruncate(self->fd, (off_t) length);
+    self->map = map;
+    self->items = map != NULL ? map + self->header : NULL;
+    self->capacity = capacity;
+    return 0;
+}
+
+
+static int set_capacity(carray_object* self, size_t capacity)
+{
+    if(capacity > (size_t) PY_SSIZE_T_MAX / self->t_size)
+    {
+        PyErr_NoMemory();
+        return -1;
+    }
+    if(self->fd != -1)
+        return remap(self, capacity);
+    void* items = PyMem_Realloc(self->items, capacity * self->t_size);
+    if(items == NULL)
+    {
+        PyErr_NoMemory();
+        return -1;
+    }
+    self->items = items;
+    self->capacity = capacity;
+    return 0;
+}
+
+
+static int grow_capacity(carray_object* self, size_t size)
+{
+    if(size <= self->capacity)
+        return 0;
+    size_t capacity = self->capacity + self->capacity / 2 + 1;
+    return set_capacity(self, capacity > size ? capacity : size);
+}
+
+
+static int increase_capacity(carray_object* self)
+{
+    return grow_capacity(self, self->size + 1);
+}
+
+
+static void reduce_capacity(carray_object* self)
+{
+    if(self->size < self->capacity / 4
+       && set_capacity(self, self->size * 2) == -1)
+        PyErr_Clear();
+}
+
+
+static int sync_mapping(carray_object* self)
+{
+    if(self->readonly)
+        return 0;
+    if(self->capacity != self->size
+       && (check_resizable(self) == -1 || remap(self, self->size) == -1))
+        return -1;
+    if(self->map != NULL
+       && msync(self->map, self->header + self->size * self->t_size,
+                MS_SYNC) == -1)
+    {
+        PyErr_SetFromErrno(PyExc_OSError);
+        return -1;
+    }
+    if(self->header)
+    {
+        file_header header = {HEADER_MAGIC, self->methods->format[0],
+                              {0}, (uint64_t) self->size};
+        if(pwrite(self->fd, &header, sizeof(header), 0)
+           != (ssize_t) sizeof(header))
+        {
+            PyErr_SetFromErrno(PyExc_OSError);
+            return -1;
+        }
+    }
+    return 0;
+}
+
+
+static int close_mapping(carray_object* self)
+{
+    if(self->exports > 0)
+    {
+        PyErr_SetString(PyExc_BufferError,
+                        "cannot close an array that is exporting buffers");
+        return -1;
+    }
+    int result = sync_mapping(self);
+    if(self->map != NULL)
+        munmap(self->map, self->header + self->capacity * self->t_size);
+    close(self->fd);
+    self->fd = -1;
+    self->readonly = 0;
+    self->shared = 0;
+    self->header = 0;
+    self->map = NULL;
+    self->items = NULL;
+    self->size = 0;
+    self->capacity = 0;
+    return result;
+}
+
+
+static carray_object* new_carray(object_methods* methods, size_t size)
+{
+    carray_object* self = (carray_object*) carray_type.tp_alloc(
+        &carray_type, 0
+    );
+    if(self == NULL)
+        return NULL;
+    self->fd = -1;
+    self->t_size = methods->t_size;
+    self->methods = methods;
+    if(size && set_capacity(self, size) == -1)
+    {
+        Py_DECREF(self);
+        return NULL;
+    }
+    self->size = size;
+    return self;
+}
+
+
+typedef struct
+{
+    void* items;
+    Py_ssize_t size;
+    Py_buffer view;
+} typed_data;
+
+
+static char format_kind(const char* format)
+{
+    if(format == NULL)
+        return 'u';
+    if(*format == '@')
+        format++;
+    if(format[0] == '\0' || format[1] != '\0')
+        return '\0';
+    if(strchr("bhilqn", format[0]))
+        return 'i';
+    if(strchr("BHILQN", format[0]))
+        return 'u';
+    if(strchr("efd", format[0]))
+        return 'f';
+    return format[0];
+}
+
+
+static int get_typed_data(object_methods* methods, PyObject* obj,
+                          typed_data* data)
+{
+    data->view.obj = NULL;
+    if(PyObject_CheckBuffer(obj))
+    {
+        if(PyObject_GetBuffer(obj, &data->view,
+                              PyBUF_FORMAT | PyBUF_C_CONTIGUOUS) == 0)
+        {
+            if(data->view.itemsize == methods->t_size
+               && format_kind(data->view.format)
+                  == format_kind(methods->format))
+            {
+                data->items = data->view.buf;
+                data->size = data->view.len / data->view.itemsize;
+                return 0;
+            }
+            PyBuffer_Release(&data->view);
+        }
+        else
+            PyErr_Clear();
+    }
+
+    PyObject* seq = PySequence_Fast(obj, "argument must be iterable");
+    if(seq == NULL)
+        return -1;
+    data->size = PySequence_Fast_GET_SIZE(seq);
+    data->items = PyMem_Malloc(data->size * methods->t_size);
+    if(data->items == NULL)
+    {
+        Py_DECREF(seq);
+        PyErr_NoMemory();
+        return -1;
+    }
+    PyObject** items = PySequence_Fast_ITEMS(seq);
+    for(Py_ssize_t i = 0; i < data->size; i++)
+        if(methods->store(
+            items[i], (char*) data->items + i * methods->t_size
+        ) == -1)
+        {
+            PyMem_Free(data->items);
+            Py_DECREF(seq);
+            return -1;
+        }
+    Py_DECREF(seq);
+    return 0;
+}
+
+
+static void release_typed_data(typed_data* data)
+{
+    if(data->view.obj != NULL)
+        PyBuffer_Release(&data->view);
+    else
+        PyMem_Free(data->items);
+}
+
+
+static int detach_typed_data(carray_object* self, typed_data* data)
+{
+    size_t nbytes = data->size * self->t_size;
+    const char* start = (const char*) data->items;
+    const char* items = (const char*) self->items;
+    if(data->view.obj == NULL || !nbytes || !self->size
+       || start + nbytes <= items
+       || items + self->size * self->t_size <= start)
+        return 0;
+    void* copy = PyMem_Malloc(nbytes);
+    if(copy == NULL)
+    {
+        PyErr_NoMemory();
+        return -1;
+    }
+    memcpy(copy, start, nbytes);
+    PyBuffer_Release(&data->view);
+    data->view.obj = NULL;
+    data->items = copy;
+    return 0;
+}
+
+
+static int append_items(carray_object* self, const void* items, size_t size)
+{
+    if(check_resizable(self) == -1)
+        return -1;
+    if(grow_capacity(self, self->size + size) == -1)
+        return -1;
+    memcpy((char*) self->items + self->size * self->t_size,
+           items, size * self->t_size);
+    self->size += size;
+    return 0;
+}
+
+
+static int extend(carray_object* self, PyObject* iterable)
+{
+    if(iterable == (PyObject*) self)
+    {
+        size_t size = self->size;
+        if(check_resizable(self) == -1 || grow_capacity(self, size * 2) == -1)
+            return -1;
+        return append_items(self, self->items, size);
+    }
+    typed_data data;
+    if(get_typed_data(self->methods, iterable, &data) == -1)
+        return -1;
+    int result = append_items(self, data.items, data.size);
+    release_typed_data(&data);
+    return result;
+}
+
+
+static PyObject* carray_extend(carray_object* self, PyObject* iterable)
+{
+    if(extend(self, iterable) == -1)
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+
+static PyObject* carray_frombytes(carray_object* self, PyObject* args)
+{
+    Py_buffer buffer;
+    if(!PyArg_ParseTuple(args, "y*", &buffer))
+        return NULL;
+    if(buffer.len % self->t_size)
+    {
+        PyBuffer_Release(&buffer);
+        PyErr_SetString(PyExc_ValueError,
+                        "bytes length not a multiple of item size");
+        return NULL;
+    }
+    int result = append_items(self, buffer.buf, buffer.len / self->t_size);
+    PyBuffer_Release(&buffer);
+    if(result == -1)
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+
+static PyObject* carray_fromfile(carray_object* self, PyObject* args)
+{
+    PyObject* file;
+    Py_ssize_t count;
+    if(!PyArg_ParseTuple(args, "On", &file, &count))
+        return NULL;
+    if(count < 0)
+    {
+        PyErr_SetString(PyExc_ValueError, "negative count");
+        return NULL;
+    }
+    if(count > PY_SSIZE_T_MAX / self->t_size)
+        return PyErr_NoMemory();
+    Py_ssize_t nbytes = count * self->t_size;
+    PyObject* bytes = PyObject_CallMethod(file, "read", "n", nbytes);
+    if(bytes == NULL)
+        return NULL;
+    if(!PyBytes_Check(bytes))
+    {
+        Py_DECREF(bytes);
+        PyErr_SetString(PyExc_TypeError, "read() didn't return bytes");
+        return NULL;
+    }
+    Py_ssize_t size = PyBytes_GET_SIZE(bytes) / self->t_size;
+    int result = append_items(self, PyBytes_AS_STRING(bytes), size);
+    Py_DECREF(bytes);
+    if(result == -1)
+        return NULL;
+    if(size != count)
+    {
+        PyErr_SetString(PyExc_EOFError, "read() didn't return enough bytes");
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+
+#define BLOCKSIZE (64 * 1024)
+
+static PyObject* carray_tofile(carray_object* self, PyObject* file)
+{
+    Py_ssize_t nbytes = (Py_ssize_t) (self->size * self->t_size);
+    self->exports++;
+    for(Py_ssize_t offset = 0; offset < nbytes; offset += BLOCKSIZE)
+    {
+        Py_ssize_t size = nbytes - offset;
+        PyObject* bytes = PyBytes_FromStringAndSize(
+            (char*) self->items + offset, size < BLOCKSIZE ? size : BLOCKSIZE
+        );
+        PyObject* result = bytes == NULL
+            ? NULL : PyObject_CallMethod(file, "write", "O", bytes);
+        Py_XDECREF(bytes);
+        if(result == NULL)
+        {
+            self->exports--;
+            return NULL;
+        }
+        Py_DECREF(result);
+    }
+    self->exports--;
+    Py_RETURN_NONE;
+}
+
+
+static PyObject* carray_tobytes(carray_object* self, PyObject* args)
+{
+    return PyBytes_FromStringAndSize(
+        (char*) self->items, (Py_ssize_t) (self->size * self->t_size)
+    );
+}
+
+
+static PyObject* carray_copy(carray_object* self, PyObject* args)
+{
+    carray_object* copy = new_carray(self->methods, self->size);
+    if(copy == NULL)
+        return NULL;
+    if(self->size)
+        memcpy(copy->items, self->items, self->size * self->t_size);
+    return (PyObject*) copy;
+}
+
+
+static PyObject* carray_reduce_ex(carray_object* self, PyObject* args)
+{
+    int protocol;
+    if(!PyArg_ParseTuple(args, "i", &protocol))
+        return NULL;
+    PyObject* module = PyImport_ImportModule("carray");
+    if(module == NULL)
+        return NULL;
+    PyObject* reconstruct = PyObject_GetAttrString(module, "_reconstruct");
+    Py_DECREF(module);
+    if(reconstruct == NULL)
+        return NULL;
+    PyObject* data = protocol >= 5
+        ? PyPickleBuffer_FromObject((PyObject*) self)
+        : carray_tobytes(self, NULL);
+    if(data == NULL)
+    {
+        Py_DECREF(reconstruct);
+        return NULL;
+    }
+    return Py_BuildValue("N(CN)", reconstruct, self->methods->format[0],
+                         data);
+}
+
+
+static PyObject* carray_flush(carray_object* self, PyObject* args)
+{
+    if(self->fd != -1 && sync_mapping(self) == -1)
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+
+static PyObject* carray_close(carray_object* self, PyObject* args)
+{
+    if(self->fd != -1 && close_mapping(self) == -1)
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+
+static PyObject* carray_reserve(carray_object* self, PyObject* args)
+{
+    Py_ssize_t capacity;
+    if(!PyArg_ParseTuple(args, "n", &capacity))
+        return NULL;
+    if(capacity < 0)
+    {
+        PyErr_SetString(PyExc_ValueError, "negative capacity");
+        return NULL;
+    }
+    if(check_resizable(self) == -1
+       || ((size_t) capacity > self->capacity
+           && set_capacity(self, (size_t) capacity) == -1))
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+
+static PyObject* carray_shrink_to_fit(carray_object* self, PyObject* args)
+{
+    if(check_resizable(self) == -1
+       || (self->capacity != self->size
+           && set_capacity(self, self->size) == -1))
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+
+static PyObject* carray_clear(carray_object* self, PyObject* args,
+                              PyObject* kwds)
+{
+    static char* kwlist[] = {"keep_capacity", NULL};
+    int keep_capacity = 1;
+    if(!PyArg_ParseTupleAndKeywords(args, kwds, "|p", kwlist,
+                                    &keep_capacity)
+       || check_resizable(self) == -1)
+        return NULL;
+    self->size = 0;
+    if(!keep_capacity && set_capacity(self, 0) == -1)
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+
+static PyObject* get_capacity(carray_object* self, void* closure)
+{
+    return PyLong_FromSize_t(self->capacity);
+}
+
+
+static PyGetSetDef carray_getset[] = {
+    {"capacity", (getter) get_capacity, NULL, "", NULL},
+    {NULL}
+};
+
+
+static PyObject* carray_enter(carray_object* self, PyObject* args)
+{
+    Py_INCREF(self);
+    return (PyObject*) self;
+}
+
+
+static PyObject* carray_exit(carray_object* self, PyObject* args)
+{
+    return carray_close(self, NULL);
+}
+
+
+static PyObject* carray_append(carray_object* self, PyObject* args)
+{
+    PyObject* num;
+    item_buffer item;
+    if(!PyArg_ParseTuple(args, "O", &num)
+       || self->methods->store(num, &item) == -1
+       || check_resizable(self) == -1)
+        return NULL;
+    if(increase_capacity(self) == -1)
+        return NULL;
+    memcpy((char*) self->items + self->size * self->t_size,
+           &item, self->t_size);
+    self->size++;
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+static Py_ssize_t get_index(size_t size, Py_ssize_t index)
+{
+    if (index < 0)
+        return (Py_ssize_t) size + index;
+    return index;
+}
+
+
+static PyObject* carray_insert(carray_object* self, PyObject* args)
+{
+    Py_ssize_t index;
+    PyObject* num;
+    item_buffer item;
+    if(!PyArg_ParseTuple(args, "nO", &index, &num)
+       || self->methods->store(num, &item) == -1
+       || check_resizable(self) == -1)
+        return NULL;
+    index = get_index(self->size, index);
+    if(index < 0)
+        index = 0;
+    else if((size_t) index > self->size)
+        index = (Py_ssize_t) self->size;
+    if(increase_capacity(self) == -1)
+        return NULL;
+    char* items = (char*) self->items;
+    memmove(items + (index + 1) * self->t_size, items + index * self->t_size,
+            (self->size - index) * self->t_size);
+    memcpy(items + index * self->t_size, &item, self->t_size);
+    self->size++;
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
+
+static PyObject* carray_pop(carray_object* self, PyObject* args)
+{
+    Py_ssize_t index = (Py_ssize_t) self->size - 1;
+    if(!PyArg_ParseTuple(args, "|n", &index) || check_resizable(self) == -1)
+        return NULL;
+    index = get_index(self->size, index);
+    if(index >= 0 && (size_t) index < self->size)
+    {
+        char* items = (char*) self->items;
+        PyObject* num = self->methods->load(items + index * self->t_size);
+        memmove(items + index * self->t_size,
+                items + (index + 1) * self->t_size,
+                (self->size - index - 1) * self->t_size);
+        self->size--;
+        reduce_capacity(self);
+        return num;
+    }
+    PyErr_SetString(PyExc_IndexError, "index out of range");
+    return NULL;
+}
+
+
+#define GIL_THRESHOLD (1 << 16)
+#define SCAN_BLOCK 64
+#define SUM_CHUNK ((size_t) 1 << 30)
+#define PAIRWISE_BLOCK 128
+
+#define BEGIN_NOGIL(c_self) \
+    PyThreadState* _save = NULL; \
+    if((c_self)->size >= GIL_THRESHOLD) \
+    { \
+        (c_self)->exports++; \
+        _save = PyEval_SaveThread(); \
+    }
+
+#define END_NOGIL(c_self) \
+    if(_save != NULL) \
+    { \
+        PyEval_RestoreThread(_save); \
+        (c_self)->exports--; \
+    }
+
+
+static PyObject* join_sum(PyObject* high, unsigned long long low)
+{
+    PyObject* result = NULL;
+    PyObject* shift = PyLong_FromLong(32);
+    PyObject* low_num = PyLong_FromUnsignedLongLong(low);
+    PyObject* shifted = high != NULL && shift != NULL
+        ? PyNumber_Lshift(high, shift) : NULL;
+    if(shifted != NULL && low_num != NULL)
+        result = PyNumber_Add(shifted, low_num);
+    Py_XDECREF(shifted);
+    Py_XDECREF(low_num);
+    Py_XDECREF(shift);
+    Py_XDECREF(high);
+    return result;
+}
+
+
+#define SUM_INTEGER(type, wide, from_wide) static PyObject* sum_##type( \
+    PyObject* self) \
+{ \
+    carray_object* c_self = (carray_object*) self; \
+    const type* items = (const type*) c_self->items; \
+    wide high = 0; \
+    unsigned long long low = 0; \
+    BEGIN_NOGIL(c_self) \
+    for(size_t start = 0; start < c_self->size; start += SUM_CHUNK) \
+    { \
+        size_t stop = c_self->size - start < SUM_CHUNK \
+            ? c_self->size : start + SUM_CHUNK; \
+        wide chunk_high = 0; \
+        unsigned long long chunk_low = 0; \
+        for(size_t i = start; i < stop; i++) \
+        { \
+            chunk_high += (wide) items[i] >> 32; \
+            chunk_low += (unsigned long long) items[i] & 0xFFFFFFFFULL; \
+        } \
+        high += chunk_high + (wide) (chunk_low >> 32); \
+        low += chunk_low & 0xFFFFFFFFULL; \
+    } \
+    END_NOGIL(c_self) \
+    high += (wide) (low >> 32); \
+    return join_sum(from_wide(high), low & 0xFFFFFFFFULL); \
+}
+
+#define SUM_SIGNED(type) SUM_INTEGER(type, long long, PyLong_FromLongLong)
+#define SUM_UNSIGNED(type) \
+    SUM_INTEGER(type, unsigned long long, PyLong_FromUnsignedLongLong)
+
+SIGNED_TYPES(SUM_SIGNED)
+UNSIGNED_TYPES(SUM_UNSIGNED)
+
+
+#define SUM_FLOAT(type) static double pairwise_sum_##type( \
+    const type* items, size_t size) \
+{ \
+    if(size < 8) \
+    { \
+        double result = 0.0; \
+        for(size_t i = 0; i < size; i++) \
+            result += items[i]; \
+        return result; \
+    } \
+    if(size <= PAIRWISE_BLOCK) \
+    { \
+        double r[8]; \
+        size_t i; \
+        for(i = 0; i < 8; i++) \
+            r[i] = items[i]; \
+        for(i = 8; i < size - size % 8; i += 8) \
+            for(size_t j = 0; j < 8; j++) \
+                r[j] += items[i + j]; \
+        double result = ((r[0] + r[1]) + (r[2] + r[3])) \
+            + ((r[4] + r[5]) + (r[6] + r[7])); \
+        for(; i < size; i++) \
+            result += items[i]; \
+        return result; \
+    } \
+    size_t half = size / 2; \
+    half -= half % 8; \
+    return pairwise_sum_##type(items, half) \
+        + pairwise_sum_##type(items + half, size - half); \
+} \
+\
+static PyObject* sum_##type(PyObject* self) \
+{ \
+    carray_object* c_self = (carray_object*) self; \
+    double result; \
+    BEGIN_NOGIL(c_self) \
+    result = pairwise_sum_##type((const type*) c_self->items, c_self->size); \
+    END_NOGIL(c_self) \
+    return PyFloat_FromDouble(result); \
+}
+
+FLOAT_TYPES(SUM_FLOAT)
+
+
+#define EXTREME_LOOP(condition) \
+    if(maximum) \
+    { \
+        for(size_t i = 1; i < c_self->size; i++) \
+        { \
+            condition; \
+            result = items[i] > result ? items[i] : result; \
+        } \
+    } \
+    else \
+    { \
+        for(size_t i = 1; i < c_self->size; i++) \
+        { \
+            condition; \
+            result = items[i] < result ? items[i] : result; \
+        } \
+    }
+
+#define EXTREME_INTEGER(type) static void extreme_##type( \
+    PyObject* self, int maximum, void* value) \
+{ \
+    carray_object* c_self = (carray_object*) self; \
+    const type* items = (const type*) c_self->items; \
+    type result = items[0]; \
+    BEGIN_NOGIL(c_self) \
+    EXTREME_LOOP() \
+    END_NOGIL(c_self) \
+    *(type*) value = result; \
+}
+
+#define EXTREME_FLOAT(type) static void extreme_##type( \
+    PyObject* self, int maximum, void* value) \
+{ \
+    carray_object* c_self = (carray_object*) self; \
+    const type* items = (const type*) c_self->items; \
+    type result = items[0]; \
+    int nan = result != result; \
+    BEGIN_NOGIL(c_self) \
+    EXTREME_LOOP(nan |= items[i] != items[i]) \
+    END_NOGIL(c_self) \
+    *(type*) value = nan ? (type) Py_NAN : result; \
+}
+
+INTEGER_TYPES(EXTREME_INTEGER)
+FLOAT_TYPES(EXTREME_FLOAT)
+
+
+#define FIND_LOOP(equal) \
+    for(size_t block = start; block < stop && index == -1; \
+        block += SCAN_BLOCK) \
+    { \
+        size_t end = stop - block < SCAN_BLOCK ? stop : block + SCAN_BLOCK; \
+        int found = 0; \
+        for(size_t i = block; i < end; i++) \
+            found |= equal; \
+        for(size_t i = block; found && index == -1; i++) \
+            if(equal) \
+                index = (Py_ssize_t) i; \
+    }
+
+#define FIND_INTEGER(type) static Py_ssize_t find_##type( \
+    PyObject* self, const void* key, size_t start, size_t stop) \
+{ \
+    carray_object* c_self = (carray_object*) self; \
+    const type* items = (const type*) c_self->items; \
+    type value = *(const type*) key; \
+    Py_ssize_t index = -1; \
+    BEGIN_NOGIL(c_self) \
+    FIND_LOOP(items[i] == value) \
+    END_NOGIL(c_self) \
+    return index; \
+}
+
+#define FIND_FLOAT(type) static Py_ssize_t find_##type( \
+    PyObject* self, const void* key, size_t start, size_t stop) \
+{ \
+    carray_object* c_self = (carray_object*) self; \
+    const type* items = (const type*) c_self->items; \
+    type value = *(const type*) key; \
+    Py_ssize_t index = -1; \
+    BEGIN_NOGIL(c_self) \
+    if(value != value) \
+    { \
+        FIND_LOOP(items[i] != items[i]) \
+    } \
+    else \
+    { \
+        FIND_LOOP(items[i] == value) \
+    } \
+    END_NOGIL(c_self) \
+    return index; \
+}
+
+INTEGER_TYPES(FIND_INTEGER)
+FLOAT_TYPES(FIND_FLOAT)
+
+
+#define COUNT(type) static size_t count_##type(PyObject* self, \
+                                               const void* key) \
+{ \
+    carray_object* c_self = (carray_object*) self; \
+    const type* items = (const type*) c_self->items; \
+    type value = *(const type*) key; \
+    size_t count = 0; \
+    BEGIN_NOGIL(c_self) \
+    for(size_t i = 0; i < c_self->size; i++) \
+        count += items[i] == value; \
+    END_NOGIL(c_self) \
+    return count; \
+}
+
+ALL_TYPES(COUNT)
+
+
+#define INSERTION_THRESHOLD 32
+
+#define INSERTION_SORT(type, less) static void insertion_sort_##type( \
+    type* items, size_t size) \
+{ \
+    for(size_t i = 1; i < size; i++) \
+    { \
+        type value = items[i]; \
+        size_t j = i; \
+        for(; j > 0 && less(value, items[j - 1]); j--) \
+            items[j] = items[j - 1]; \
+        items[j] = value; \
+    } \
+}
+
+#define LESS(a, b) ((a) < (b))
+
+#define RADIX_SORT(type, sign) INSERTION_SORT(type, LESS) \
+\
+static int sort_##type(void* data, size_t size) \
+{ \
+    type* items = (type*) data; \
+    if(size < INSERTION_THRESHOLD) \
+    { \
+        insertion_sort_##type(items, size); \
+        return 0; \
+    } \
+    const unsigned long long flip = sign \
+        ? 1ULL << (8 * sizeof(type) - 1) : 0; \
+    size_t (*counts)[256] = PyMem_RawCalloc(sizeof(type), \
+                                            sizeof(*counts)); \
+    type* buffer = PyMem_RawMalloc(size * sizeof(type)); \
+    if(counts == NULL || buffer == NULL) \
+    { \
+        PyMem_RawFree(counts); \
+        PyMem_RawFree(buffer); \
+        return -1; \
+    } \
+    for(size_t i = 0; i < size; i++) \
+    { \
+        unsigned long long key = (unsigned long long) items[i] ^ flip; \
+        for(size_t byte = 0; byte < sizeof(type); byte++) \
+            counts[byte][(key >> (8 * byte)) & 0xFF]++; \
+    } \
+    type* source = items; \
+    type* target = buffer; \
+    for(size_t byte = 0; byte < sizeof(type); byte++) \
+    { \
+        size_t* count = counts[byte]; \
+        unsigned long long first = \
+            (((unsigned long long) source[0] ^ flip) >> (8 * byte)) & 0xFF; \
+        if(count[first] == size) \
+            continue; \
+        size_t offset = 0; \
+        for(size_t digit = 0; digit < 256; digit++) \
+        { \
+            size_t next = offset + count[digit]; \
+            count[digit] = offset; \
+            offset = next; \
+        } \
+        for(size_t i = 0; i < size; i++) \
+        { \
+            unsigned long long key = (unsigned long long) source[i] ^ flip; \
+            target[count[(key >> (8 * byte)) & 0xFF]++] = source[i]; \
+        } \
+        type* swap = source; \
+        source = target; \
+        target = swap; \
+    } \
+    if(source != items) \
+        memcpy(items, source, size * sizeof(type)); \
+    PyMem_RawFree(counts); \
+    PyMem_RawFree(buffer); \
+    return 0; \
+}
+
+#define SORT_SIGNED(type) RADIX_SORT(type, 1)
+#define SORT_UNSIGNED(type) RADIX_SORT(type, 0)
+
+SIGNED_TYPES(SORT_SIGNED)
+UNSIGNED_TYPES(SORT_UNSIGNED)
+
+
+#define SWAP(type, a, b) \
+    { \
+        type swap = (a); \
+        (a) = (b); \
+        (b) = swap; \
+    }
+
+#define INTROSORT(type) INSERTION_SORT(type, LESS) \
+\
+static void sift_down_##type(type* items, size_t root, size_t size) \
+{ \
+    type value = items[root]; \
+    for(size_t child = 2 * root + 1; child < size; child = 2 * root + 1) \
+    { \
+        if(child + 1 < size && items[child] < items[child + 1]) \
+            child++; \
+        if(!(value < items[child])) \
+            break; \
+        items[root] = items[child]; \
+        root = child; \
+    } \
+    items[root] = value; \
+} \
+\
+static void heap_sort_##type(type* items, size_t size) \
+{ \
+    for(size_t i = size / 2; i-- > 0;) \
+        sift_down_##type(items, i, size); \
+    for(size_t end = size - 1; end > 0; end--) \
+    { \
+        SWAP(type, items[0], items[end]) \
+        sift_down_##type(items, 0, end); \
+    } \
+} \
+\
+static void introsort_##type(type* items, size_t size, int depth) \
+{ \
+    while(size > INSERTION_THRESHOLD) \
+    { \
+        if(!depth--) \
+        { \
+            heap_sort_##type(items, size); \
+            return; \
+        } \
+        size_t middle = size / 2; \
+        if(items[middle] < items[0]) \
+            SWAP(type, items[middle], items[0]) \
+        if(items[size - 1] < items[middle]) \
+        { \
+            SWAP(type, items[size - 1], items[middle]) \
+            if(items[middle] < items[0]) \
+                SWAP(type, items[middle], items[0]) \
+        } \
+        type pivot = items[middle]; \
+        size_t i = 0; \
+        size_t j = size - 1; \
+        for(;;) \
+        { \
+            while(items[i] < pivot) \
+                i++; \
+            while(pivot < items[j]) \
+                j--; \
+            if(i >= j) \
+                break; \
+            SWAP(type, items[i], items[j]) \
+            i++; \
+            j--; \
+        } \
+        if(j + 1 < size - j - 1) \
+        { \
+            introsort_##type(items, j + 1, depth); \
+            items += j + 1; \
+            size -= j + 1; \
+        } \
+        else \
+        { \
+            introsort_##type(items + j + 1, size - j - 1, depth); \
+            size = j + 1; \
+        } \
+    } \
+    insertion_sort_##type(items, size); \
+} \
+\
+static int sort_##type(void* data, size_t size) \
+{ \
+    type* items = (type*) data; \
+    size_t count = 0; \
+    for(size_t i = 0; i < size; i++) \
+        if(items[i] == items[i]) \
+        { \
+            type value = items[i]; \
+            items[i] = items[count]; \
+            items[count++] = value; \
+        } \
+    int depth = 0; \
+    for(size_t n = count; n > 1; n >>= 1) \
+        depth += 2; \
+    introsort_##type(items, count, depth); \
+    return 0; \
+}
+
+FLOAT_TYPES(INTROSORT)
+
+
+#define SEARCH(type, less) static size_t search_##type( \
+    const void* data, size_t size, const void* key, int right) \
+{ \
+    const type* items = (const type*) data; \
+    type value = *(const type*) key; \
+    size_t low = 0; \
+    size_t high = size; \
+    while(low < high) \
+    { \
+        size_t middle = low + (high - low) / 2; \
+        if(right ? !less(value, items[middle]) \
+                 : less(items[middle], value)) \
+            low = middle + 1; \
+        else \
+            high = middle; \
+    } \
+    return low; \
+}
+
+#define NAN_LESS(a, b) ((a) < (b) || ((b) != (b) && (a) == (a)))
+
+#define SEARCH_INTEGER(type) SEARCH(type, LESS)
+#define SEARCH_FLOAT(type) SEARCH(type, NAN_LESS)
+
+INTEGER_TYPES(SEARCH_INTEGER)
+FLOAT_TYPES(SEARCH_FLOAT)
+
+
+enum {OP_ADD, OP_SUB, OP_MUL, OP_DIV, OP_FLOORDIV, OP_MOD};
+
+#define ARITH_LOOP(expression) \
+    for(size_t i = 0; i < size; i++) \
+    { \
+        x = a[i * a_step]; \
+        y = b[i * b_step]; \
+        r[i] = expression; \
+    }
+
+#define HAS_ZERO(b, b_step, size) \
+    for(size_t i = 0; i < size; i++) \
+        if(b[i * b_step] == 0) \
+            return -1;
+
+#define SIGNED_FLOORDIV(type) (y == (type) -1 \
+    ? (type) (0ULL - (unsigned long long) x) \
+    : (type) (x / y - (x % y != 0 && (x < 0) != (y < 0))))
+#define UNSIGNED_FLOORDIV(type) ((type) (x / y))
+#define SIGNED_MOD(type) (y == (type) -1 \
+    ? (type) 0 \
+    : (type) (x % y + (x % y != 0 && (x % y < 0) != (y < 0) ? y : 0)))
+#define UNSIGNED_MOD(type) ((type) (x % y))
+
+#define ARITH_INTEGER(type, sign) static int arith_##type( \
+    int op, const void* left, size_t a_step, const void* right, \
+    size_t b_step, void* result, size_t size) \
+{ \
+    const type* a = (const type*) left; \
+    const type* b = (const type*) right; \
+    type* r = (type*) result; \
+    type x, y; \
+    if(op >= OP_DIV) \
+        HAS_ZERO(b, b_step, size) \
+    switch(op) \
+    { \
+    case OP_ADD: \
+        ARITH_LOOP((type) ((unsigned long long) x \
+                           + (unsigned long long) y)) \
+        break; \
+    case OP_SUB: \
+        ARITH_LOOP((type) ((unsigned long long) x \
+                           - (unsigned long long) y)) \
+        break; \
+    case OP_MUL: \
+        ARITH_LOOP((type) ((unsigned long long) x \
+                           * (unsigned long long) y)) \
+        break; \
+    case OP_DIV: \
+    case OP_FLOORDIV: \
+        ARITH_LOOP(sign##_FLOORDIV(type)) \
+        break; \
+    case OP_MOD: \
+        ARITH_LOOP(sign##_MOD(type)) \
+        break; \
+    } \
+    return 0; \
+} \
+\
+static int divide_##type(const void* left, size_t a_step, \
+                         const void* right, size_t b_step, double* r, \
+                         size_t size) \
+{ \
+    const type* a = (const type*) left; \
+    const type* b = (const type*) right; \
+    double x, y; \
+    HAS_ZERO(b, b_step, size) \
+    ARITH_LOOP(x / y) \
+    return 0; \
+}
+
+static double float_floor_divide(double x, double y)
+{
+    double mod = fmod(x, y);
+    double div = (x - mod) / y;
+    if(mod && (y < 0) != (mod < 0))
+        div -= 1.0;
+    if(!div)
+        return copysign(0.0, x / y);
+    double floor_div = floor(div);
+    return div - floor_div > 0.5 ? floor_div + 1.0 : floor_div;
+}
+
+static double float_remainder(double x, double y)
+{
+    double mod = fmod(x, y);
+    if(!mod)
+        return copysign(0.0, y);
+    return (y < 0) != (mod < 0) ? mod + y : mod;
+}
+
+#define ARITH_FLOAT(type) static int arith_##type( \
+    int op, const void* left, size_t a_step, const void* right, \
+    size_t b_step, void* result, size_t size) \
+{ \
+    const type* a = (const type*) left; \
+    const type* b = (const type*) right; \
+    type* r = (type*) result; \
+    double x, y; \
+    if(op >= OP_DIV) \
+        HAS_ZERO(b, b_step, size) \
+    switch(op) \
+    { \
+    case OP_ADD: \
+        ARITH_LOOP((type) (x + y)) \
+        break; \
+    case OP_SUB: \
+        ARITH_LOOP((type) (x - y)) \
+        break; \
+    case OP_MUL: \
+        ARITH_LOOP((type) (x * y)) \
+        break; \
+    case OP_DIV: \
+        ARITH_LOOP((type) (x / y)) \
+        break; \
+    case OP_FLOORDIV: \
+        ARITH_LOOP((type) float_floor_divide(x, y)) \
+        break; \
+    case OP_MOD: \
+        ARITH_LOOP((type) float_remainder(x, y)) \
+        break; \
+    } \
+    return 0; \
+}
+
+#define divide_float NULL
+#define divide_double NULL
+#define arith_boolean NULL
+#define divide_boolean NULL
+
+#define ARITH_SIGNED(type) ARITH_INTEGER(type, SIGNED)
+#define ARITH_UNSIGNED(type) ARITH_INTEGER(type, UNSIGNED)
+
+SIGNED_TYPES(ARITH_SIGNED)
+UNSIGNED_INTEGER_TYPES(ARITH_UNSIGNED)
+FLOAT_TYPES(ARITH_FLOAT)
+
+
+#define COMPARE(type) static void compare_##type( \
+    int op, const void* left, size_t a_step, const void* right, \
+    size_t b_step, bool* r, size_t size) \
+{ \
+    const type* a = (const type*) left; \
+    const type* b = (const type*) right; \
+    type x, y; \
+    switch(op) \
+    { \
+    case Py_LT: \
+        ARITH_LOOP(x < y) \
+        break; \
+    case Py_LE: \
+        ARITH_LOOP(x <= y) \
+        break; \
+    case Py_GT: \
+        ARITH_LOOP(x > y) \
+        break; \
+    case Py_GE: \
+        ARITH_LOOP(x >= y) \
+        break; \
+    case Py_EQ: \
+        ARITH_LOOP(x == y) \
+        break; \
+    case Py_NE: \
+        ARITH_LOOP(x != y) \
+        break; \
+    } \
+}
+
+ALL_TYPES(COMPARE)
+
+
+static PyObject* carray_sum(carray_object* self, PyObject* args)
+{
+    return self->methods->sum((PyObject*) self);
+}
+
+
+static PyObject* carray_mean(carray_object* self, PyObject* args)
+{
+    if(!self->size)
+    {
+        PyErr_SetString(PyExc_ValueError, "mean of empty array");
+        return NULL;
+    }
+    PyObject* sum = self->methods->sum((PyObject*) self);
+    PyObject* size = PyLong_FromSize_t(self->size);
+    PyObject* mean = sum != NULL && size != NULL
+        ? PyNumber_TrueDivide(sum, size) : NULL;
+    Py_XDECREF(sum);
+    Py_XDECREF(size);
+    return mean;
+}
+
+
+static int get_extreme(carray_object* self, int maximum, void* value)
+{
+    if(!self->size)
+    {
+        PyErr_SetString(PyExc_ValueError,
+                        maximum ? "max() arg is an empty array"
+                                : "min() arg is an empty array");
+        return -1;
+    }
+    self->methods->extreme((PyObject*) self, maximum, value);
+    return 0;
+}
+
+
+static PyObject* carray_min(carray_object* self, PyObject* args)
+{
+    item_buffer value;
+    if(get_extreme(self, 0, &value) == -1)
+        return NULL;
+    return self->methods->load(&value);
+}
+
+
+static PyObject* carray_max(carray_object* self, PyObject* args)
+{
+    item_buffer value;
+    if(get_extreme(self, 1, &value) == -1)
+        return NULL;
+    return self->methods->load(&value);
+}
+
+
+static PyObject* carray_argmin(carray_object* self, PyObject* args)
+{
+    item_buffer value;
+    if(get_extreme(self, 0, &value) == -1)
+        return NULL;
+    return PyLong_FromSsize_t(
+        self->methods->find((PyObject*) self, &value, 0, self->size)
+    );
+}
+
+
+static PyObject* carray_argmax(carray_object* self, PyObject* args)
+{
+    item_buffer value;
+    if(get_extreme(self, 1, &value) == -1)
+        return NULL;
+    return PyLong_FromSsize_t(
+        self->methods->find((PyObject*) self, &value, 0, self->size)
+    );
+}
+
+
+static PyObject* carray_count(carray_object* self, PyObject* num)
+{
+    item_buffer key;
+    int found = self->methods->to_key(num, &key);
+    if(found == -1)
+        return NULL;
+    return PyLong_FromSize_t(
+        found ? self->methods->count((PyObject*) self, &key) : 0
+    );
+}
+
+
+static PyObject* carray_index(carray_object* self, PyObject* args)
+{
+    PyObject* num;
+    Py_ssize_t start = 0;
+    Py_ssize_t stop = PY_SSIZE_T_MAX;
+    if(!PyArg_ParseTuple(args, "O|nn", &num, &start, &stop))
+        return NULL;
+    PySlice_AdjustIndices((Py_ssize_t) self->size, &start, &stop, 1);
+    item_buffer key;
+    int found = self->methods->to_key(num, &key);
+    if(found == -1)
+        return NULL;
+    Py_ssize_t index = found && start < stop
+        ? self->methods->find((PyObject*) self, &key, start, stop) : -1;
+    if(index == -1)
+    {
+        PyErr_SetString(PyExc_ValueError, "carray.index(x): x not in array");
+        return NULL;
+    }
+    return PyLong_FromSsize_t(index);
+}
+
+
+static int carray_contains(carray_object* self, PyObject* num)
+{
+    item_buffer key;
+    int found = self->methods->to_key(num, &key);
+    if(found != 1)
+        return found;
+    return self->methods->find((PyObject*) self, &key, 0, self->size) != -1;
+}
+
+
+static PyObject* carray_remove(carray_object* self, PyObject* args)
+{
+    PyObject* num;
+    if(!PyArg_ParseTuple(args, "O", &num))
+        return NULL;
+    item_buffer key;
+    int found = self->methods->to_key(num, &key);
+    if(found == -1)
+        return NULL;
+    Py_ssize_t index = found
+        ? self->methods->find((PyObject*) self, &key, 0, self->size) : -1;
+    if(index != -1)
+    {
+        if(check_resizable(self) == -1)
+            return NULL;
+        char* items = (char*) self->items;
+        memmove(items + index * self->t_size,
+                items + (index + 1) * self->t_size,
+                (self->size - index - 1) * self->t_size);
+        self->size--;
+        reduce_capacity(self);
+    }
+    Py_RETURN_NONE;
+}
+
+
+static void reverse_items(carray_object* self)
+{
+    char* items = (char*) self->items;
+    size_t t_size = self->t_size;
+    item_buffer swap;
+    for(size_t i = 0, j = self->size - 1; i < j; i++, j--)
+    {
+        memcpy(&swap, items + i * t_size, t_size);
+        memcpy(items + i * t_size, items + j * t_size, t_size);
+        memcpy(items + j * t_size, &swap, t_size);
+    }
+}
+
+
+static PyObject* carray_sort(carray_object* self, PyObject* args,
+                             PyObject* kwds)
+{
+    static char* kwlist[] = {"reverse", NULL};
+    int reverse = 0;
+    if(!PyArg_ParseTupleAndKeywords(args, kwds, "|p", kwlist, &reverse)
+       || check_writable(self) == -1)
+        return NULL;
+    if(self->size < 2)
+        Py_RETURN_NONE;
+    int result;
+    BEGIN_NOGIL(self)
+    result = self->methods->sort(self->items, self->size);
+    if(result == 0 && reverse)
+        reverse_items(self);
+    END_NOGIL(self)
+    if(result == -1)
+        return PyErr_NoMemory();
+    Py_RETURN_NONE;
+}
+
+
+static object_methods* find_methods(int typecode);
+
+
+typedef Py_ssize_t (*key_search)(PyObject*, PyObject*, int);
+
+
+static carray_object* search_keys(PyObject* keys, key_search search,
+                                  PyObject* self, int right)
+{
+    PyObject* seq = PySequence_Fast(keys, "argument must be iterable");
+    if(seq == NULL)
+        return NULL;
+    Py_ssize_t size = PySequence_Fast_GET_SIZE(seq);
+    carray_object* result = new_carray(find_methods('q'), size);
+    for(Py_ssize_t i = 0; result != NULL && i < size; i++)
+    {
+        Py_ssize_t position = search(self, PySequence_Fast_GET_ITEM(seq, i),
+                                     right);
+        if(position == -1)
+            Py_CLEAR(result);
+        else
+            ((long long*) result->items)[i] = position;
+    }
+    Py_DECREF(seq);
+    return result;
+}
+
+
+static Py_ssize_t search_value(carray_object* self, PyObject* value,
+                               int right)
+{
+    size_t low = 0, high = self->size;
+    while(low < high)
+    {
+        size_t mid = low + (high - low) / 2;
+        PyObject* item = self->methods->load(
+            (const char*) self->items + mid * self->t_size
+        );
+        if(item == NULL)
+            return -1;
+        int before = PyObject_RichCompareBool(item, value,
+                                              right ? Py_LE : Py_LT);
+        Py_DECREF(item);
+        if(before == -1)
+            return -1;
+        if(before)
+            low = mid + 1;
+        else
+            high = mid;
+        if(high > self->size)
+            high = self->size;
+        if(low > high)
+            low = high;
+    }
+    return (Py_ssize_t) low;
+}
+
+
+static Py_ssize_t search_key(carray_object* self, PyObject* value,
+                             int right)
+{
+    item_buffer key;
+    if(self->methods->store(value, &key) == 0)
+        return (Py_ssize_t) self->methods->search(self->items, self->size,
+                                                  &key, right);
+    if(!PyErr_ExceptionMatches(PyExc_OverflowError)
+       && !PyErr_ExceptionMatches(PyExc_TypeError))
+        return -1;
+    PyErr_Clear();
+    return search_value(self, value, right);
+}
+
+
+static PyObject* carray_searchsorted(carray_object* self, PyObject* args,
+                                     PyObject* kwds)
+{
+    static char* kwlist[] = {"value", "side", NULL};
+    PyObject* value;
+    const char* side = "left";
+    if(!PyArg_ParseTupleAndKeywords(args, kwds, "O|s", kwlist,
+                                    &value, &side))
+        return NULL;
+    int right = strcmp(side, "right") == 0;
+    if(!right && strcmp(side, "left") != 0)
+    {
+        PyErr_SetString(PyExc_ValueError, "side must be 'left' or 'right'");
+        return NULL;
+    }
+
+    if(PyLong_Check(value) || PyFloat_Check(value))
+    {
+        Py_ssize_t position = search_key(self, value, right);
+        return position == -1 ? NULL : PyLong_FromSsize_t(position);
+    }
+
+    PyObject* keys = value;
+    if(PyObject_CheckBuffer(value))
+        Py_INCREF(keys);
+    else if((keys = PySequence_Fast(value, "argument must be iterable"))
+            == NULL)
+        return NULL;
+    typed_data data;
+    carray_object* result = NULL;
+    if(get_typed_data(self->methods, keys, &data) == 0)
+    {
+        result = new_carray(find_methods('q'), data.size);
+        if(result != NULL)
+        {
+            long long* positions = (long long*) result->items;
+            const char* items = (const char*) data.items;
+            self->exports++;
+            BEGIN_NOGIL(result)
+            for(Py_ssize_t i = 0; i < data.size; i++)
+                positions[i] = (long long) self->methods->search(
+                    self->items, self->size, items + i * self->t_size, right
+                );
+            END_NOGIL(result)
+            self->exports--;
+        }
+        release_typed_data(&data);
+    }
+    else if(PyErr_ExceptionMatches(PyExc_OverflowError)
+            || PyErr_ExceptionMatches(PyExc_TypeError))
+    {
+        PyErr_Clear();
+        result = search_keys(keys, (key_search) search_key, (PyObject*) self,
+                             right);
+    }
+    Py_DECREF(keys);
+    return (PyObject*) result;
+}
+
+
+typedef struct
+{
+    const void* items;
+    size_t step;
+    item_buffer scalar;
+    typed_data data;
+} operand;
+
+
+static int is_operand(PyObject* obj)
+{
+    return PyLong_Check(obj) || PyFloat_Check(obj)
+        || PyObject_CheckBuffer(obj) || PySequence_Check(obj);
+}
+
+
+static int get_operand(carray_object* self, PyObject* obj, operand* value)
+{
+    value->data.view.obj = NULL;
+    value->data.items = NULL;
+    if(PyLong_Check(obj) || PyFloat_Check(obj))
+    {
+        value->items = &value->scalar;
+        value->step = 0;
+        return self->methods->store(obj, &value->scalar);
+    }
+    if(get_typed_data(self->methods, obj, &value->data) == -1)
+        return -1;
+    if((size_t) value->data.size != self->size)
+    {
+        release_typed_data(&value->data);
+        PyErr_SetString(PyExc_ValueError, "operands have different lengths");
+        return -1;
+    }
+    value->items = value->data.items;
+    value->step = 1;
+    return 0;
+}
+
+
+static int detach_operand(carray_object* self, operand* value)
+{
+    if(!value->step)
+        return 0;
+    if(detach_typed_data(self, &value->data) == -1)
+        return -1;
+    value->items = value->data.items;
+    return 0;
+}
+
+
+static void release_operand(operand* value)
+{
+    if(value->step)
+        release_typed_data(&value->data);
+}
+
+
+static PyObject* binary_op(PyObject* left, PyObject* right, int op,
+                           int inplace)
+{
+    int reflected = !PyObject_TypeCheck(left, &carray_type);
+    carray_object* self = (carray_object*) (reflected ? right : left);
+    PyObject* other = reflected ? left : right;
+    if(!is_operand(other))
+        Py_RETURN_NOTIMPLEMENTED;
+    if(self->methods->arith == NULL)
+    {
+        PyErr_Format(PyExc_TypeError, "unsupported operation for %s arrays",
+                     self->methods->name);
+        return NULL;
+    }
+    if(inplace && check_writable(self) == -1)
+        return NULL;
+    operand value;
+    if(get_operand(self, other, &value) == -1)
+        return NULL;
+    if(inplace && detach_operand(self, &value) == -1)
+    {
+        release_operand(&value);
+        return NULL;
+    }
+
+    const void* a = reflected ? value.items : self->items;
+    const void* b = reflected ? self->items : value.items;
+    size_t a_step = reflected ? value.step : 1;
+    size_t b_step = reflected ? 1 : value.step;
+    carray_object* result;
+    int status;
+    if(op == OP_DIV && self->methods->divide != NULL)
+    {
+        if(inplace)
+        {
+            release_operand(&value);
+            PyErr_SetString(PyExc_TypeError,
+                            "cannot divide an integer array in place");
+            return NULL;
+        }
+        result = new_carray(find_methods('d'), self->size);
+        if(result == NULL)
+        {
+            release_operand(&value);
+            return NULL;
+        }
+        BEGIN_NOGIL(self)
+        status = self->methods->divide(a, a_step, b, b_step,
+                                       (double*) result->items, self->size);
+        END_NOGIL(self)
+    }
+    else
+    {
+        if(inplace)
+        {
+            result = self;
+            Py_INCREF(result);
+        }
+        else
+            result = new_carray(self->methods, self->size);
+        if(result == NULL)
+        {
+            release_operand(&value);
+            return NULL;
+        }
+        BEGIN_NOGIL(self)
+        status = self->methods->arith(op, a, a_step, b, b_step,
+                                      result->items, self->size);
+        END_NOGIL(self)
+    }
+    release_operand(&value);
+    if(status == -1)
+    {
+        Py_DECREF(result);
+        PyErr_SetString(PyExc_ZeroDivisionError, "division by zero");
+        return NULL;
+    }
+    return (PyObject*) result;
+}
+
+
+#define NUMBER_OP(name, op) \
+static PyObject* carray_##name(PyObject* left, PyObject* right) \
+{ \
+    return binary_op(left, right, op, 0); \
+} \
+\
+static PyObject* carray_inplace_##name(PyObject* left, PyObject* right) \
+{ \
+    return binary_op(left, right, op, 1); \
+}
+
+NUMBER_OP(add, OP_ADD)
+NUMBER_OP(subtract, OP_SUB)
+NUMBER_OP(multiply, OP_MUL)
+NUMBER_OP(true_divide, OP_DIV)
+NUMBER_OP(floor_divide, OP_FLOORDIV)
+NUMBER_OP(remainder, OP_MOD)
+
+
+static bool compare_outside(int op, int sign)
+{
+    if(sign < 0)
+        return op == Py_GT || op == Py_GE || op == Py_NE;
+    return op == Py_LT || op == Py_LE || op == Py_NE;
+}
+
+
+static int compare_scalar(carray_object* self, PyObject* obj, int* op,
+                          void* scalar, bool* constant)
+{
+    if(self->methods->store(obj, scalar) == 0)
+        return 0;
+    if(!PyErr_ExceptionMatches(PyExc_OverflowError)
+       && !PyErr_ExceptionMatches(PyExc_TypeError))
+        return -1;
+    PyErr_Clear();
+    if(PyFloat_Check(obj))
+    {
+        double y = PyFloat_AS_DOUBLE(obj);
+        if(isnan(y))
+        {
+            *constant = *op == Py_NE;
+            return 1;
+        }
+        if(isinf(y))
+        {
+            *constant = compare_outside(*op, y < 0 ? -1 : 1);
+            return 1;
+        }
+        if(y != floor(y))
+        {
+            if(*op == Py_EQ || *op == Py_NE)
+            {
+                *constant = *op == Py_NE;
+                return 1;
+            }
+            if(*op == Py_LT)
+                *op = Py_LE;
+            else if(*op == Py_GE)
+                *op = Py_GT;
+            y = floor(y);
+        }
+        PyObject* integer = PyLong_FromDouble(y);
+        if(integer == NULL)
+            return -1;
+        int result = compare_scalar(self, integer, op, scalar, constant);
+        Py_DECREF(integer);
+        return result;
+    }
+    int overflow;
+    long long value = PyLong_AsLongLongAndOverflow(obj, &overflow);
+    if(value == -1 && PyErr_Occurred())
+        return -1;
+    *constant = compare_outside(*op, overflow ? overflow : value < 0 ? -1 : 1);
+    return 1;
+}
+
+
+static PyObject* compare_objects(carray_object* self, PyObject* other,
+                                 int op)
+{
+    carray_object* mask = new_carray(find_methods('?'), self->size);
+    if(mask == NULL)
+        return NULL;
+    bool* r = (bool*) mask->items;
+    self->exports++;
+    for(size_t i = 0; i < mask->size; i++)
+    {
+        PyObject* item = self->methods->load(
+            (const char*) self->items + i * self->t_size
+        );
+        int result = item == NULL
+            ? -1 : PyObject_RichCompareBool(item, other, op);
+        Py_XDECREF(item);
+        if(result == -1)
+        {
+            Py_CLEAR(mask);
+            break;
+        }
+        r[i] = result;
+    }
+    self->exports--;
+    return (PyObject*) mask;
+}
+
+
+static PyObject* compare_mask(carray_object* self, PyObject* other, int op)
+{
+    operand value;
+    bool constant = false;
+    int outside = 0;
+    if(PyLong_Check(other) || PyFloat_Check(other))
+    {
+        if(format_kind(self->methods->format) == 'f')
+        {
+            if(self->methods->store(other, &value.scalar) == -1)
+            {
+                if(!PyErr_ExceptionMatches(PyExc_OverflowError))
+                    return NULL;
+                PyErr_Clear();
+                return compare_objects(self, other, op);
+            }
+        }
+        else
+        {
+            outside = compare_scalar(self, other, &op, &value.scalar,
+                                     &constant);
+            if(outside == -1)
+                return NULL;
+        }
+        value.items = &value.scalar;
+        value.step = 0;
+    }
+    else if(get_operand(self, other, &value) == -1)
+        return NULL;
+    carray_object* mask = new_carray(find_methods('?'), self->size);
+    if(mask != NULL && outside)
+        memset(mask->items, constant, self->size);
+    else if(mask != NULL)
+    {
+        BEGIN_NOGIL(self)
+        self->methods->compare(op, self->items, 1, value.items, value.step,
+                               (bool*) mask->items, self->size);
+        END_NOGIL(self)
+    }
+    release_operand(&value);
+    return (PyObject*) mask;
+}
+
+
+static PyObject* carray_compress(carray_object* self, PyObject* mask)
+{
+    typed_data data;
+    if(get_typed_data(find_methods('?'), mask, &data) == -1)
+        return NULL;
+    if((size_t) data.size != self->size)
+    {
+        release_typed_data(&data);
+        PyErr_SetString(PyExc_ValueError, "mask has a different length");
+        return NULL;
+    }
+    const bool* selected = (const bool*) data.items;
+    size_t size = 0;
+    for(size_t i = 0; i < self->size; i++)
+        size += selected[i];
+    carray_object* result = new_carray(self->methods, size);
+    if(result != NULL)
+    {
+        char* target = (char*) result->items;
+        for(size_t i = 0; i < self->size; i++)
+            if(selected[i])
+            {
+                memcpy(target, (char*) self->items + i * self->t_size,
+                       self->t_size);
+                target += self->t_size;
+            }
+    }
+    release_typed_data(&data);
+    return (PyObject*) result;
+}
+
+
+static PyObject* carray_take(carray_object* self, PyObject* indices)
+{
+    typed_data data;
+    if(get_typed_data(find_methods('q'), indices, &data) == -1)
+        return NULL;
+    const long long* positions = (const long long*) data.items;
+    carray_object* result = new_carray(self->methods, (size_t) data.size);
+    for(Py_ssize_t i = 0; result != NULL && i < data.size; i++)
+    {
+        long long index = positions[i] < 0
+            ? positions[i] + (long long) self->size : positions[i];
+        if(index < 0 || (size_t) index >= self->size)
+        {
+            PyErr_SetString(PyExc_IndexError, "index out of range");
+            Py_CLEAR(result);
+            break;
+        }
+        memcpy((char*) result->items + i * self->t_size,
+               (char*) self->items + index * self->t_size, self->t_size);
+    }
+    release_typed_data(&data);
+    return (PyObject*) result;
+}
+
+
+#define REPR_THRESHOLD 1000
+#define REPR_EDGE 3
+
+
+static int write_items(carray_object* self, _PyUnicodeWriter* writer,
+                       PyObject* sep, size_t start, size_t stop)
+{
+    char buffer[TEXT_SIZE];
+    for(size_t i = start; i < stop; i++)
+    {
+        int length = self->methods->text(
+            (char*) self->items + i * self->t_size, buffer
+        );
+        if(length < 0
+           || (i > start && _PyUnicodeWriter_WriteStr(writer, sep) == -1)
+           || _PyUnicodeWriter_WriteASCIIString(writer, buffer,
+                                                length) == -1)
+            return -1;
+    }
+    return 0;
+}
+
+
+static PyObject* get_info(carray_object* self)
+{
+    PyObject* sep = PyUnicode_FromString(", ");
+    if(sep == NULL)
+        return NULL;
+    _PyUnicodeWriter writer;
+    _PyUnicodeWriter_Init(&writer);
+    writer.overallocate = 1;
+    int result = _PyUnicodeWriter_WriteASCIIString(&writer, "carray<", 7);
+    if(result == 0)
+        result = _PyUnicodeWriter_WriteASCIIString(
+            &writer, self->methods->name, -1
+        );
+    if(result == 0)
+        result = _PyUnicodeWriter_WriteASCIIString(&writer, ">(", 2);
+    if(result == 0 && self->size > REPR_THRESHOLD)
+    {
+        result = write_items(self, &writer, sep, 0, REPR_EDGE);
+        if(result == 0)
+            result = _PyUnicodeWriter_WriteASCIIString(&writer,
+                                                       ", ..., ", 7);
+        if(result == 0)
+            result = write_items(self, &writer, sep,
+                                 self->size - REPR_EDGE, self->size);
+    }
+    else if(result == 0)
+        result = write_items(self, &writer, sep, 0, self->size);
+    if(result == 0)
+        result = _PyUnicodeWriter_WriteChar(&writer, ')');
+    Py_DECREF(sep);
+    if(result == -1)
+    {
+        _PyUnicodeWriter_Dealloc(&writer);
+        return NULL;
+    }
+    return _PyUnicodeWriter_Finish(&writer);
+}
+
+
+static PyObject* carray_tostring(carray_object* self, PyObject* args,
+                                 PyObject* kwds)
+{
+    static char* kwlist[] = {"sep", NULL};
+    PyObject* sep = NULL;
+    if(!PyArg_ParseTupleAndKeywords(args, kwds, "|U", kwlist, &sep))
+        return NULL;
+    if(sep == NULL)
+        sep = PyUnicode_FromString(",");
+    else
+        Py_INCREF(sep);
+    if(sep == NULL)
+        return NULL;
+    _PyUnicodeWriter writer;
+    _PyUnicodeWriter_Init(&writer);
+    writer.min_length = (Py_ssize_t) self->size
+                        * (2 + PyUnicode_GET_LENGTH(sep));
+    int result = write_items(self, &writer, sep, 0, self->size);
+    Py_DECREF(sep);
+    if(result == -1)
+    {
+        _PyUnicodeWriter_Dealloc(&writer);
+        return NULL;
+    }
+    return _PyUnicodeWriter_Finish(&writer);
+}
+
+
+static char* strip_token(char* token)
+{
+    while(Py_ISSPACE(*token))
+        token++;
+    char* end = token + strlen(token);
+    while(end > token && Py_ISSPACE(end[-1]))
+        *--end = '\0';
+    return token;
+}
+
+
+static PyObject* carray_fromstring(carray_object* self, PyObject* args,
+                                   PyObject* kwds)
+{
+    static char* kwlist[] = {"text", "sep", NULL};
+    const char* text;
+    const char* sep = ",";
+    if(!PyArg_ParseTupleAndKeywords(args, kwds, "s|s", kwlist, &text, &sep)
+       || check_resizable(self) == -1)
+        return NULL;
+    if(!*sep)
+    {
+        PyErr_SetString(PyExc_ValueError, "empty separator");
+        return NULL;
+    }
+    char* copy = PyMem_Malloc(strlen(text) + 1);
+    if(copy == NULL)
+        return PyErr_NoMemory();
+    strcpy(copy, text);
+
+    size_t sep_length = strlen(sep);
+    size_t size = self->size;
+    char* token = copy;
+    int result = 0;
+    if(*strip_token(copy) || strstr(copy, sep) != NULL)
+        while(token != NULL)
+        {
+            char* next = strstr(token, sep);
+            if(next != NULL)
+            {
+                *next = '\0';
+                next += sep_length;
+            }
+            result = grow_capacity(self, size + 1);
+            if(result == 0)
+                result = self->methods->parse(
+                    strip_token(token),
+                    (char*) self->items + size * self->t_size
+                );
+            if(result == -1)
+                break;
+            size++;
+            token = next;
+        }
+    PyMem_Free(copy);
+    if(result == -1)
+        return NULL;
+    self->size = size;
+    Py_RETURN_NONE;
+}
+
+
+static PyObject* get_sizeof(carray_object* self, PyObject* args)
+{
+    size_t size = sizeof(carray_object);
+    if(self->base == NULL && self->fd == -1)
+        size += self->capacity * self->t_size;
+    return PyLong_FromSize_t(size);
+}
+
+
+static Py_ssize_t get_len(carray_object* self)
+{
+    return (Py_ssize_t) self->size;
+}
+
+
+static PyObject* get_view(carray_object* self, size_t start, size_t size)
+{
+    carray_object* view = new_carray(self->methods, 0);
+    if(view == NULL)
+        return NULL;
+    view->base = PyMem_Malloc(sizeof(Py_buffer));
+    if(view->base == NULL)
+    {
+        Py_DECREF(view);
+        return PyErr_NoMemory();
+    }
+    if(PyObject_GetBuffer((PyObject*) self, view->base,
+                          self->readonly ? PyBUF_SIMPLE : PyBUF_WRITABLE)
+       == -1)
+    {
+        PyMem_Free(view->base);
+        view->base = NULL;
+        Py_DECREF(view);
+        return NULL;
+    }
+    view->readonly = self->readonly;
+    view->items = (char*) view->base->buf + start * self->t_size;
+    view->size = size;
+    view->capacity = size;
+    return (PyObject*) view;
+}
+
+
+static PyObject* get_slice(carray_object* self, Py_ssize_t start,
+                           Py_ssize_t step, Py_ssize_t size)
+{
+    if(step == 1)
+        return get_view(self, (size_t) start, (size_t) size);
+    carray_object* result = new_carray(self->methods, (size_t) size);
+    if(result == NULL)
+        return NULL;
+    for(Py_ssize_t i = 0; i < size; i++)
+        memcpy((char*) result->items + i * self->t_size,
+               (char*) self->items + (start + i * step) * self->t_size,
+               self->t_size);
+    return (PyObject*) result;
+}
+
+
+static Py_ssize_t get_subscript_index(carray_object* self, PyObject* item)
+{
+    Py_ssize_t index = PyNumber_AsSsize_t(item, PyExc_IndexError);
+    if(index == -1 && PyErr_Occurred())
+        return -1;
+    if(index < 0)
+        index += (Py_ssize_t) self->size;
+    if(index < 0 || index >= (Py_ssize_t) self->size)
+    {
+        PyErr_SetString(PyExc_IndexError, "index out of range");
+        return -1;
+    }
+    return index;
+}
+
+
+static PyObject* carray_subscript(carray_object* self, PyObject* item)
+{
+    if(PyIndex_Check(item))
+    {
+        Py_ssize_t index = get_subscript_index(self, item);
+        if(index == -1)
+            return NULL;
+        return self->methods->load((char*) self->items
+                                   + index * self->t_size);
+    }
+    if(PySlice_Check(item))
+    {
+        Py_ssize_t start, stop, step;
+        if(PySlice_Unpack(item, &start, &stop, &step) == -1)
+            return NULL;
+        Py_ssize_t size = PySlice_AdjustIndices(
+            (Py_ssize_t) self->size, &start, &stop, step
+        );
+        return get_slice(self, start, step, size);
+    }
+    PyErr_SetString(PyExc_TypeError,
+                    "carray indices must be integers or slices");
+    return NULL;
+}
+
+
+static int delete_items(carray_object* self, size_t start, size_t count)
+{
+    if(check_resizable(self) == -1)
+        return -1;
+    memmove((char*) self->items + start * self->t_size,
+            (char*) self->items + (start + count) * self->t_size,
+            (self->size - start - count) * self->t_size);
+    self->size -= count;
+    reduce_capacity(self);
+    return 0;
+}
+
+
+static int delete_slice(carray_object* self, Py_ssize_t start,
+                        Py_ssize_t step, Py_ssize_t size)
+{
+    if(size <= 0)
+        return 0;
+    if(step == 1)
+        return delete_items(self, (size_t) start, (size_t) size);
+    if(step < 0)
+    {
+        start += step * (size - 1);
+        step = -step;
+    }
+    if(check_resizable(self) == -1)
+        return -1;
+    char* items = (char*) self->items;
+    size_t t_size = self->t_size;
+    size_t dest = (size_t) start;
+    for(Py_ssize_t i = 0; i < size; i++)
+    {
+        size_t src = (size_t) (start + i * step) + 1;
+        size_t end = i < size - 1 ? (size_t) (start + (i + 1) * step)
+                                  : self->size;
+        memmove(items + dest * t_size, items + src * t_size,
+                (end - src) * t_size);
+        dest += end - src;
+    }
+    self->size -= (size_t) size;
+    reduce_capacity(self);
+    return 0;
+}
+
+
+static int replace_slice(carray_object* self, Py_ssize_t start,
+                         Py_ssize_t size, const void* items,
+                         Py_ssize_t count)
+{
+    size_t t_size = self->t_size;
+    if(count != size)
+    {
+        size_t new_size = self->size - (size_t) size + (size_t) count;
+        if(check_resizable(self) == -1
+           || grow_capacity(self, new_size) == -1)
+            return -1;
+        memmove((char*) self->items + (start + count) * t_size,
+                (char*) self->items + (start + size) * t_size,
+                (self->size - (size_t) (start + size)) * t_size);
+        self->size = new_size;
+    }
+    memmove((char*) self->items + start * t_size, items, count * t_size);
+    if(count < size)
+        reduce_capacity(self);
+    return 0;
+}
+
+
+static int assign_slice(carray_object* self, Py_ssize_t start,
+                        Py_ssize_t step, Py_ssize_t size, PyObject* value)
+{
+    if(value == NULL)
+        return delete_slice(self, start, step, size);
+    if(value == (PyObject*) self)
+    {
+        carray_object* copy = new_carray(self->methods, self->size);
+        if(copy == NULL)
+            return -1;
+        memcpy(copy->items, self->items, self->size * self->t_size);
+        int result = assign_slice(self, start, step, size, (PyObject*) copy);
+        Py_DECREF(copy);
+        return result;
+    }
+
+    typed_data data;
+    if(get_typed_data(self->methods, value, &data) == -1)
+        return -1;
+    if(step != 1 && detach_typed_data(self, &data) == -1)
+    {
+        release_typed_data(&data);
+        return -1;
+    }
+    int result = 0;
+    if(step == 1)
+        result = replace_slice(self, start, size, data.items, data.size);
+    else if(data.size != size)
+    {
+        PyErr_Format(PyExc_ValueError,
+                     "attempt to assign array of size %zd "
+                     "to extended slice of size %zd", data.size, size);
+        result = -1;
+    }
+    else
+        for(Py_ssize_t i = 0; i < size; i++)
+            memcpy((char*) self->items + (start + i * step) * self->t_size,
+                   (char*) data.items + i * self->t_size, self->t_size);
+    release_typed_data(&data);
+    return result;
+}
+
+
+static int carray_ass_subscript(carray_object* self, PyObject* item,
+                                PyObject* value)
+{
+    if(check_writable(self) == -1)
+        return -1;
+    if(PyIndex_Check(item))
+    {
+        Py_ssize_t index = get_subscript_index(self, item);
+        if(index == -1)
+            return -1;
+        if(value == NULL)
+            return delete_items(self, (size_t) index, 1);
+        return self->methods->store(value, (char*) self->items
+                                           + index * self->t_size);
+    }
+    if(PySlice_Check(item))
+    {
+        Py_ssize_t start, stop, step;
+        if(PySlice_Unpack(item, &start, &stop, &step) == -1)
+            return -1;
+        Py_ssize_t size = PySlice_AdjustIndices(
+            (Py_ssize_t) self->size, &start, &stop, step
+        );
+        return assign_slice(self, start, step, size, value);
+    }
+    PyErr_SetString(PyExc_TypeError,
+                    "carray indices must be integers or slices");
+    return -1;
+}
+
+
+static int equal_buffer(carray_object* self, PyObject* other)
+{
+    Py_buffer view;
+    if(PyObject_GetBuffer(other, &view, PyBUF_FORMAT | PyBUF_C_CONTIGUOUS)
+       == -1)
+    {
+        PyErr_Clear();
+        return -1;
+    }
+    int equal = -1;
+    if(view.itemsize == self->t_size && view.format != NULL
+       && strcmp(view.format, self->methods->format) == 0)
+    {
+        equal = (size_t) (view.len / view.itemsize) == self->size;
+        for(size_t block = 0; equal == 1 && block < self->size;
+            block += SCAN_BLOCK)
+        {
+            bool mask[SCAN_BLOCK];
+            size_t size = self->size - block < SCAN_BLOCK
+                ? self->size - block : SCAN_BLOCK;
+            self->methods->compare(
+                Py_EQ, (char*) self->items + block * self->t_size, 1,
+                (char*) view.buf + block * self->t_size, 1, mask, size
+            );
+            equal = memchr(mask, 0, size) == NULL;
+        }
+    }
+    PyBuffer_Release(&view);
+    return equal;
+}
+
+
+static PyObject* carray_compare(carray_object* self, PyObject* other, int op)
+{
+    if(op != Py_EQ && op != Py_NE)
+    {
+        if(!is_operand(other))
+            Py_RETURN_NOTIMPLEMENTED;
+        return compare_mask(self, other, op);
+    }
+    int equal = PyObject_CheckBuffer(other) ? equal_buffer(self, other) : -1;
+    if(equal != -1)
+        return PyBool_FromLong(equal == (op == Py_EQ));
+    Py_ssize_t size = PySequence_Size(other);
+    if(size == -1)
+    {
+        PyErr_Clear();
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+    if(self->size != (size_t) size)
+        return PyBool_FromLong(op == Py_NE);
+    for(size_t i = 0; i < self->size; i++)
+    {
+        PyObject* item = self->methods->load(
+            (char*) self->items + i * self->t_size
+        );
+        PyObject* other_item = PySequence_GetItem(other, (Py_ssize_t) i);
+        int equal = item != NULL && other_item != NULL
+            ? PyObject_RichCompareBool(item, other_item, Py_EQ) : -1;
+        Py_XDECREF(item);
+        Py_XDECREF(other_item);
+        if(equal == -1)
+            return NULL;
+        if(!equal)
+            return PyBool_FromLong(op == Py_NE);
+    }
+    return PyBool_FromLong(op == Py_EQ);
+}
+
+
+typedef struct
+{
+    PyObject_HEAD
+    carray_object* array;
+    size_t index;
+} carray_iterator;
+
+
+static PyTypeObject carray_iterator_type;
+
+
+static PyObject* carray_iter(carray_object* self)
+{
+    carray_iterator* iterator = PyObject_New(carray_iterator,
+                                             &carray_iterator_type);
+    if(iterator == NULL)
+        return NULL;
+    Py_INCREF(self);
+    iterator->array = self;
+    iterator->index = 0;
+    return (PyObject*) iterator;
+}
+
+
+static PyObject* carray_iterator_next(carray_iterator* self)
+{
+    carray_object* array = self->array;
+    if(array == NULL)
+        return NULL;
+    if(self->index < array->size)
+        return array->methods->load((char*) array->items
+                                    + self->index++ * array->t_size);
+    self->array = NULL;
+    Py_DECREF(array);
+    return NULL;
+}
+
+
+static PyObject* carray_iterator_length_hint(carray_iterator* self,
+                                             PyObject* args)
+{
+    if(self->array == NULL || self->index >= self->array->size)
+        return PyLong_FromLong(0);
+    return PyLong_FromSize_t(self->array->size - self->index);
+}
+
+
+static void carray_iterator_dealloc(carray_iterator* self)
+{
+    Py_XDECREF(self->array);
+    PyObject_Free(self);
+}
+
+
+static PyMethodDef carray_iterator_methods[] = {
+    {"__length_hint__", (PyCFunction) carray_iterator_length_hint,
+     METH_NOARGS, ""},
+    {NULL}
+};
+
+
+static PyTypeObject carray_iterator_type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "carray.carray_iterator",
+    .tp_basicsize = sizeof(carray_iterator),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_dealloc = (destructor) carray_iterator_dealloc,
+    .tp_iter = PyObject_SelfIter,
+    .tp_iternext = (iternextfunc) carray_iterator_next,
+    .tp_methods = carray_iterator_methods
+};
+
+
+#define TOLIST(type) static PyObject* tolist_##type(PyObject* self) \
+{ \
+    carray_object* c_self = (carray_object*) self; \
+    const type* items = (const type*) c_self->items; \
+    PyObject* list = PyList_New((Py_ssize_t) c_self->size); \
+    if(list == NULL) \
+        return NULL; \
+    for(size_t i = 0; i < c_self->size; i++) \
+    { \
+        PyObject* item = load_##type(&items[i]); \
+        if(item == NULL) \
+        { \
+            Py_DECREF(list); \
+            return NULL; \
+        } \
+        PyList_SET_ITEM(list, (Py_ssize_t) i, item); \
+    } \
+    return list; \
+}
+
+ALL_TYPES(TOLIST)
+
+
+static PyObject* carray_tolist(carray_object* self, PyObject* args)
+{
+    return self->methods->tolist((PyObject*) self);
+}
+
+
+#define REVERSED(type) static void reversed_##type( \
+    const void* source, void* target, size_t size) \
+{ \
+    const type* items = (const type*) source; \
+    type* result = (type*) target; \
+    for(size_t i = 0; i < size; i++) \
+        result[i] = items[size - i - 1]; \
+}
+
+ALL_TYPES(REVERSED)
+
+
+static PyObject* carray_reversed(carray_object* self, PyObject* args)
+{
+    carray_object* r_self = new_carray(self->methods, self->size);
+    if(r_self == NULL)
+        return NULL;
+    self->methods->reversed(self->items, r_self->items, self->size);
+    return (PyObject*) r_self;
+}
+
+
+#define TYPE_METHODS(type, typecode, format, name) \
+    {typecode, {format, name, sizeof(type), store_##type, load_##type, \
+     type##_key, reversed_##type, sum_##type, extreme_##type, find_##type, \
+     count_##type, tolist_##type, sort_##type, search_##type, \
+     arith_##type, divide_##type, compare_##type, text_##type, \
+     parse_##type}}
+
+static struct
+{
+    char typecode;
+    object_methods methods;
+} type_methods[] = {
+    TYPE_METHODS(signed_char, 'b', "b", "signed char"),
+    TYPE_METHODS(unsigned_char, 'B', "B", "unsigned char"),
+    TYPE_METHODS(short, 'h', "h", "short"),
+    TYPE_METHODS(unsigned_short, 'H', "H", "unsigned short"),
+    TYPE_METHODS(int, 'i', "i", "int"),
+    TYPE_METHODS(unsigned_int, 'I', "I", "unsigned int"),
+    TYPE_METHODS(long, 'l', "l", "long"),
+    TYPE_METHODS(unsigned_long, 'L', "L", "unsigned long"),
+    TYPE_METHODS(long_long, 'q', "q", "long long"),
+    TYPE_METHODS(unsigned_long_long, 'Q', "Q", "unsigned long long"),
+    TYPE_METHODS(float, 'f', "f", "float"),
+    TYPE_METHODS(double, 'd', "d", "double"),
+    TYPE_METHODS(boolean, '?', "?", "bool"),
+    {0}
+};
+
+
+static PyMethodDef carray_methods[] = {
+    {"__sizeof__", (PyCFunction) get_sizeof, METH_NOARGS, ""},
+    {"tostring", (PyCFunction) carray_tostring,
+     METH_VARARGS | METH_KEYWORDS, ""},
+    {"fromstring", (PyCFunction) carray_fromstring,
+     METH_VARARGS | METH_KEYWORDS, ""},
+    {"__reversed__", (PyCFunction) carray_reversed, METH_NOARGS, ""},
+    {"append", (PyCFunction) carray_append, METH_VARARGS, ""},
+    {"extend", (PyCFunction) carray_extend, METH_O, ""},
+    {"frombytes", (PyCFunction) carray_frombytes, METH_VARARGS, ""},
+    {"fromfile", (PyCFunction) carray_fromfile, METH_VARARGS, ""},
+    {"tofile", (PyCFunction) carray_tofile, METH_O, ""},
+    {"tobytes", (PyCFunction) carray_tobytes, METH_NOARGS, ""},
+    {"flush", (PyCFunction) carray_flush, METH_NOARGS, ""},
+    {"reserve", (PyCFunction) carray_reserve, METH_VARARGS, ""},
+    {"shrink_to_fit", (PyCFunction) carray_shrink_to_fit, METH_NOARGS, ""},
+    {"clear", (PyCFunction) carray_clear, METH_VARARGS | METH_KEYWORDS, ""},
+    {"__copy__", (PyCFunction) carray_copy, METH_NOARGS, ""},
+    {"__deepcopy__", (PyCFunction) carray_copy, METH_O, ""},
+    {"__reduce_ex__", (PyCFunction) carray_reduce_ex, METH_VARARGS, ""},
+    {"close", (PyCFunction) carray_close, METH_NOARGS, ""},
+    {"__enter__", (PyCFunction) carray_enter, METH_NOARGS, ""},
+    {"__exit__", (PyCFunction) carray_exit, METH_VARARGS, ""},
+    {"tolist", (PyCFunction) carray_tolist, METH_NOARGS, ""},
+    {"insert", (PyCFunction) carray_insert, METH_VARARGS, ""},
+    {"pop", (PyCFunction) carray_pop, METH_VARARGS, ""},
+    {"remove", (PyCFunction) carray_remove, METH_VARARGS, ""},
+    {"sum", (PyCFunction) carray_sum, METH_NOARGS, ""},
+    {"mean", (PyCFunction) carray_mean, METH_NOARGS, ""},
+    {"min", (PyCFunction) carray_min, METH_NOARGS, ""},
+    {"max", (PyCFunction) carray_max, METH_NOARGS, ""},
+    {"argmin", (PyCFunction) carray_argmin, METH_NOARGS, ""},
+    {"argmax", (PyCFunction) carray_argmax, METH_NOARGS, ""},
+    {"count", (PyCFunction) carray_count, METH_O, ""},
+    {"index", (PyCFunction) carray_index, METH_VARARGS, ""},
+    {"compress", (PyCFunction) carray_compress, METH_O, ""},
+    {"take", (PyCFunction) carray_take, METH_O, ""},
+    {"sort", (PyCFunction) carray_sort, METH_VARARGS | METH_KEYWORDS, ""},
+    {"searchsorted", (PyCFunction) carray_searchsorted,
+     METH_VARARGS | METH_KEYWORDS, ""},
+    {NULL}
+};
+
+
+static PyObject* carray_new(PyTypeObject* type, PyObject* args, PyObject* kwds)
+{
+    carray_object* self = (carray_object*) type->tp_alloc(type, 0);
+    if(self != NULL)
+    {
+        self->size = 0;
+        self->capacity = 0;
+        self->items = NULL;
+        self->exports = 0;
+        self->base = NULL;
+        self->fd = -1;
+        self->readonly = 0;
+        self->shared = 0;
+        self->header = 0;
+        self->map = NULL;
+    }
+    return (PyObject*) self;
+}
+
+
+static object_methods* find_methods(int typecode)
+{
+    for(int i = 0; type_methods[i].typecode; i++)
+        if(type_methods[i].typecode == typecode)
+            return &type_methods[i].methods;
+    PyErr_SetString(PyExc_ValueError, "incorrect data type");
+    return NULL;
+}
+
+
+static int carray_init(carray_object* self, PyObject* args, PyObject* kwds)
+{
+    int typecode;
+    PyObject* iterable = NULL;
+
+    if(!PyArg_ParseTuple(args, "C|O", &typecode, &iterable)
+       || check_resizable(self) == -1)
+        return -1;
+
+    object_methods* methods = find_methods(typecode);
+    if(methods == NULL)
+        return -1;
+    self->methods = methods;
+    self->t_size = methods->t_size;
+
+    if(self->fd != -1)
+    {
+        if(close_mapping(self) == -1)
+            return -1;
+    }
+    else
+        PyMem_Free(self->items);
+    self->items = NULL;
+    self->size = 0;
+    self->capacity = 0;
+    if(iterable && extend(self, iterable) == -1)
+        return -1;
+    return 0;
+}
+
+
+static int read_header(int fd, size_t file_size, int* typecode,
+                       size_t* size)
+{
+    file_header header;
+    if(file_size < sizeof(header)
+       || pread(fd, &header, sizeof(header), 0) != (ssize_t) sizeof(header)
+       || memcmp(header.magic, HEADER_MAGIC, sizeof(header.magic)) != 0)
+    {
+        PyErr_SetString(PyExc_ValueError, "not a carray file");
+        return -1;
+    }
+    if(*typecode && *typecode != header.typecode)
+    {
+        PyErr_Format(PyExc_ValueError, "file holds typecode '%c'",
+                     header.typecode);
+        return -1;
+    }
+    *typecode = header.typecode;
+    *size = (size_t) header.size;
+    return 0;
+}
+
+
+static PyObject* map_descriptor(int fd, int flags, int typecode, int header,
+                                size_t file_size)
+{
+    size_t size = 0;
+    object_methods* methods = NULL;
+    if(header && (file_size || flags == O_RDONLY))
+    {
+        if(read_header(fd, file_size, &typecode, &size) == -1)
+            goto error;
+    }
+    else if(!typecode)
+    {
+        PyErr_SetString(PyExc_TypeError, "typecode is required");
+        goto error;
+    }
+    methods = find_methods(typecode);
+    if(methods == NULL)
+        goto error;
+    if(header)
+    {
+        if(file_size
+           && file_size < sizeof(file_header) + size * methods->t_size)
+        {
+            PyErr_SetString(PyExc_ValueError, "file is truncated");
+            goto error;
+        }
+    }
+    else if(file_size % methods->t_size)
+    {
+        PyErr_SetString(PyExc_ValueError,
+                        "file size not a multiple of item size");
+        goto error;
+    }
+    else
+        size = file_size / methods->t_size;
+    if(header && !file_size
+       && ftruncate(fd, (off_t) sizeof(file_header)) == -1)
+    {
+        PyErr_SetFromErrno(PyExc_OSError);
+        goto error;
+    }
+
+    carray_object* self = (carray_object*) carray_new(&carray_type,
+                                                      NULL, NULL);
+    if(self == NULL)
+        goto error;
+    self->methods = methods;
+    self->t_size = methods->t_size;
+    self->fd = fd;
+    self->readonly = flags == O_RDONLY;
+    self->header = header ? sizeof(file_header) : 0;
+    self->capacity = size;
+    if(remap(self, size) == -1)
+    {
+        Py_DECREF(self);
+        return NULL;
+    }
+    self->size = size;
+    if(header && sync_mapping(self) == -1)
+    {
+        Py_DECREF(self);
+        return NULL;
+    }
+    return (PyObject*) self;
+
+error:
+    close(fd);
+    return NULL;
+}
+
+
+static PyObject* carray_open(PyObject* module, PyObject* args,
+                             PyObject* kwds)
+{
+    static char* kwlist[] = {"path", "typecode", "mode", "header", NULL};
+    PyObject* path;
+    int typecode = 0;
+    const char* mode = "r";
+    int header = 0;
+    if(!PyArg_ParseTupleAndKeywords(args, kwds, "O&|Csp", kwlist,
+                                    PyUnicode_FSConverter, &path,
+                                    &typecode, &mode, &header))
+        return NULL;
+
+    int flags;
+    if(strcmp(mode, "r") == 0)
+        flags = O_RDONLY;
+    else if(strcmp(mode, "r+") == 0)
+        flags = O_RDWR;
+    else if(strcmp(mode, "w+") == 0)
+        flags = O_RDWR | O_CREAT | O_TRUNC;
+    else
+    {
+        Py_DECREF(path);
+        PyErr_SetString(PyExc_ValueError, "mode must be 'r', 'r+' or 'w+'");
+        return NULL;
+    }
+    int fd = open(PyBytes_AS_STRING(path), flags, 0666);
+    struct stat info;
+    if(fd == -1 || fstat(fd, &info) == -1)
+    {
+        PyErr_SetFromErrnoWithFilenameObject(PyExc_OSError, path);
+        if(fd != -1)
+            close(fd);
+        Py_DECREF(path);
+        return NULL;
+    }
+    Py_DECREF(path);
+    return map_descriptor(fd, flags, typecode, header,
+                          (size_t) info.st_size);
+}
+
+
+static PyObject* shared_path(const char* name)
+{
+    return PyBytes_FromFormat(name[0] == '/' ? "%s" : "/%s", name);
+}
+
+
+static PyObject* carray_create_shared(PyObject* module, PyObject* args,
+                                      PyObject* kwds)
+{
+    static char* kwlist[] = {"name", "typecode", "data", NULL};
+    const char* name;
+    int typecode;
+    PyObject* data = NULL;
+    if(!PyArg_ParseTupleAndKeywords(args, kwds, "sC|O", kwlist,
+                                    &name, &typecode, &data)
+       || find_methods(typecode) == NULL)
+        return NULL;
+    PyObject* path = shared_path(name);
+    if(path == NULL)
+        return NULL;
+    int fd = shm_open(PyBytes_AS_STRING(path), O_RDWR | O_CREAT | O_EXCL,
+                      0600);
+    if(fd == -1)
+    {
+        PyErr_SetFromErrnoWithFilenameObject(PyExc_OSError, path);
+        Py_DECREF(path);
+        return NULL;
+    }
+    carray_object* self = (carray_object*) map_descriptor(fd, O_RDWR,
+                                                          typecode, 1, 0);
+    if(self != NULL
+       && ((data != NULL && extend(self, data) == -1)
+           || sync_mapping(self) == -1))
+        Py_CLEAR(self);
+    if(self == NULL)
+        shm_unlink(PyBytes_AS_STRING(path));
+    else
+        self->shared = 1;
+    Py_DECREF(path);
+    return (PyObject*) self;
+}
+
+
+static PyObject* carray_attach_shared(PyObject* module, PyObject* args,
+                                      PyObject* kwds)
+{
+    static char* kwlist[] = {"name", "readonly", NULL};
+    const char* name;
+    int readonly = 0;
+    if(!PyArg_ParseTupleAndKeywords(args, kwds, "s|p", kwlist,
+                                    &name, &readonly))
+        return NULL;
+    PyObject* path = shared_path(name);
+    if(path == NULL)
+        return NULL;
+    int flags = readonly ? O_RDONLY : O_RDWR;
+    int fd = shm_open(PyBytes_AS_STRING(path), flags, 0);
+    struct stat info;
+    if(fd == -1 || fstat(fd, &info) == -1)
+    {
+        PyErr_SetFromErrnoWithFilenameObject(PyExc_OSError, path);
+        if(fd != -1)
+            close(fd);
+        Py_DECREF(path);
+        return NULL;
+    }
+    Py_DECREF(path);
+    if(!info.st_size)
+    {
+        close(fd);
+        PyErr_SetString(PyExc_ValueError, "not a carray file");
+        return NULL;
+    }
+    carray_object* self = (carray_object*) map_descriptor(
+        fd, flags, 0, 1, (size_t) info.st_size
+    );
+    if(self != NULL)
+        self->shared = 1;
+    return (PyObject*) self;
+}
+
+
+static PyObject* carray_unlink_shared(PyObject* module, PyObject* args)
+{
+    const char* name;
+    if(!PyArg_ParseTuple(args, "s", &name))
+        return NULL;
+    PyObject* path = shared_path(name);
+    if(path == NULL)
+        return NULL;
+    if(shm_unlink(PyBytes_AS_STRING(path)) == -1)
+        PyErr_SetFromErrnoWithFilenameObject(PyExc_OSError, path);
+    Py_DECREF(path);
+    if(PyErr_Occurred())
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+
+static PyObject* carray_reconstruct(PyObject* module, PyObject* args)
+{
+    int typecode;
+    Py_buffer buffer;
+    if(!PyArg_ParseTuple(args, "Cy*", &typecode, &buffer))
+        return NULL;
+    carray_object* self = NULL;
+    object_methods* methods = find_methods(typecode);
+    if(methods != NULL && buffer.len % methods->t_size)
+        PyErr_SetString(PyExc_ValueError,
+                        "bytes length not a multiple of item size");
+    else if(methods != NULL)
+        self = (carray_object*) carray_new(&carray_type, NULL, NULL);
+    if(self != NULL)
+    {
+        self->methods = methods;
+        self->t_size = methods->t_size;
+        if(append_items(self, buffer.buf, buffer.len / self->t_size) == -1)
+            Py_CLEAR(self);
+    }
+    PyBuffer_Release(&buffer);
+    return (PyObject*) self;
+}
+
+
+static void carray_dealloc(carray_object* self)
+{
+    if(self->base != NULL)
+    {
+        PyBuffer_Release(self->base);
+        PyMem_Free(self->base);
+    }
+    else if(self->fd != -1)
+    {
+        if(close_mapping(self) == -1)
+            PyErr_WriteUnraisable((PyObject*) self);
+    }
+    else
+        PyMem_Free(self->items);
+    Py_TYPE(self)->tp_free(self);
+}
+
+
+static int carray_getbuffer(carray_object* self, Py_buffer* view, int flags)
+{
+    static char emptybuf[sizeof(double)];
+    if((flags & PyBUF_WRITABLE) && self->readonly)
+    {
+        PyErr_SetString(PyExc_BufferError, "array is read-only");
+        view->obj = NULL;
+        return -1;
+    }
+    view->buf = self->items != NULL ? self->items : (void*) emptybuf;
+    view->obj = (PyObject*) self;
+    Py_INCREF(self);
+    view->len = (Py_ssize_t) (self->size * self->t_size);
+    view->readonly = self->readonly;
+    view->itemsize = self->t_size;
+    view->format = (flags & PyBUF_FORMAT) ? self->methods->format : NULL;
+    view->ndim = 1;
+    view->shape = (flags & PyBUF_ND) ? (Py_ssize_t*) &self->size : NULL;
+    view->strides = ((flags & PyBUF_STRIDES) == PyBUF_STRIDES)
+        ? &view->itemsize : NULL;
+    view->suboffsets = NULL;
+    view->internal = NULL;
+    self->exports++;
+    return 0;
+}
+
+
+static void carray_releasebuffer(carray_object* self, Py_buffer* view)
+{
+    self->exports--;
+}
+
+
+static PyNumberMethods carray_number_methods = {
+    .nb_add = carray_add,
+    .nb_subtract = carray_subtract,
+    .nb_multiply = carray_multiply,
+    .nb_true_divide = carray_true_divide,
+    .nb_floor_divide = carray_floor_divide,
+    .nb_remainder = carray_remainder,
+    .nb_inplace_add = carray_inplace_add,
+    .nb_inplace_subtract = carray_inplace_subtract,
+    .nb_inplace_multiply = carray_inplace_multiply,
+    .nb_inplace_true_divide = carray_inplace_true_divide,
+    .nb_inplace_floor_divide = carray_inplace_floor_divide,
+    .nb_inplace_remainder = carray_inplace_remainder
+};
+
+
+static PyBufferProcs carray_buffer_methods = {
+    .bf_getbuffer = (getbufferproc) carray_getbuffer,
+    .bf_releasebuffer = (releasebufferproc) carray_releasebuffer
+};
+
+
+static PyMappingMethods carray_mapping_methods = {
+    .mp_length = (lenfunc) get_len,
+    .mp_subscript = (binaryfunc) carray_subscript,
+    .mp_ass_subscript = (objobjargproc) carray_ass_subscript
+};
+
+
+static PySequenceMethods carray_sequence_methods = {
+    .sq_length = (lenfunc) get_len,
+    .sq_ass_item = (ssizeobjargproc) set_item,
+    .sq_item = (ssizeargfunc) get_item,
+    .sq_contains = (objobjproc) carray_contains
+};
+
+
+static PyTypeObject carray_type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "carray.carray",
+    .tp_basicsize = sizeof(carray_object),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_new = carray_new,
+    .tp_init = (initproc) carray_init,
+    .tp_dealloc = (destructor) carray_dealloc,
+    .tp_richcompare = (richcmpfunc) carray_compare,
+    .tp_repr = (reprfunc) get_info,
+    .tp_str = (reprfunc) get_info,
+    .tp_iter = (getiterfunc) carray_iter,
+    .tp_methods = carray_methods,
+    .tp_getset = carray_getset,
+    .tp_as_number = &carray_number_methods,
+    .tp_as_sequence = &carray_sequence_methods,
+    .tp_as_mapping = &carray_mapping_methods,
+    .tp_as_buffer = &carray_buffer_methods
+};
+
+
+typedef struct
+{
+    PyObject_HEAD
+    short t_size;
+    object_methods* methods;
+    size_t size;
+    size_t capacity;
+    size_t head;
+    void* items;
+    Py_ssize_t maxlen;
+    Py_ssize_t exports;
+} cdeque_object;
+
+
+static char* deque_item(cdeque_object* self, size_t index)
+{
+    size_t position = self->head + index;
+    if(position >= self->capacity)
+        position -= self->capacity;
+    return (char*) self->items + position * self->t_size;
+}
+
+
+static int deque_check_resizable(cdeque_object* self)
+{
+    if(self->exports > 0)
+    {
+        PyErr_SetString(PyExc_BufferError,
+                        "cannot resize a deque that is exporting buffers");
+        return -1;
+    }
+    return 0;
+}
+
+
+static int deque_set_capacity(cdeque_object* self, size_t capacity)
+{
+    size_t t_size = self->t_size;
+    if(capacity > (size_t) PY_SSIZE_T_MAX / t_size)
+    {
+        PyErr_NoMemory();
+        return -1;
+    }
+    char* items = PyMem_Malloc(capacity * t_size);
+    if(items == NULL)
+    {
+        PyErr_NoMemory();
+        return -1;
+    }
+    size_t first = self->capacity - self->head;
+    if(first > self->size)
+        first = self->size;
+    if(self->size)
+    {
+        memcpy(items, deque_item(self, 0), first * t_size);
+        memcpy(items + first * t_size, self->items,
+               (self->size - first) * t_size);
+    }
+    PyMem_Free(self->items);
+    self->items = items;
+    self->capacity = capacity;
+    self->head = 0;
+    return 0;
+}
+
+
+static int deque_reserve(cdeque_object* self)
+{
+    if(self->maxlen >= 0 && self->size >= (size_t) self->maxlen)
+        return 1;
+    if(self->size < self->capacity)
+        return 0;
+    size_t capacity = self->capacity + self->capacity / 2 + 1;
+    if(self->maxlen >= 0 && capacity > (size_t) self->maxlen)
+        capacity = (size_t) self->maxlen;
+    return deque_set_capacity(self, capacity);
+}
+
+
+static int push_back(cdeque_object* self, const void* item)
+{
+    int full = deque_reserve(self);
+    if(full == -1)
+        return -1;
+    if(full)
+    {
+        if(self->size)
+        {
+            memcpy(deque_item(self, 0), item, self->t_size);
+            self->head = self->head + 1 < self->capacity ? self->head + 1 : 0;
+        }
+        return 0;
+    }
+    memcpy(deque_item(self, self->size), item, self->t_size);
+    self->size++;
+    return 0;
+}
+
+
+static int push_front(cdeque_object* self, const void* item)
+{
+    int full = deque_reserve(self);
+    if(full == -1)
+        return -1;
+    if(full && !self->size)
+        return 0;
+    self->head = self->head ? self->head - 1 : self->capacity - 1;
+    memcpy(deque_item(self, 0), item, self->t_size);
+    if(!full)
+        self->size++;
+    return 0;
+}
+
+
+static PyObject* deque_push(cdeque_object* self, PyObject* num,
+                            int (*push)(cdeque_object*, const void*))
+{
+    item_buffer item;
+    if(self->methods->store(num, &item) == -1
+       || deque_check_resizable(self) == -1
+       || push(self, &item) == -1)
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+
+static PyObject* cdeque_append(cdeque_object* self, PyObject* num)
+{
+    return deque_push(self, num, push_back);
+}
+
+
+static PyObject* cdeque_appendleft(cdeque_object* self, PyObject* num)
+{
+    return deque_push(self, num, push_front);
+}
+
+
+static PyObject* deque_tolist(cdeque_object* self, PyObject* args);
+
+
+static PyObject* deque_extend(cdeque_object* self, PyObject* iterable,
+                              int (*push)(cdeque_object*, const void*))
+{
+    if(deque_check_resizable(self) == -1)
+        return NULL;
+    PyObject* items = iterable == (PyObject*) self
+        ? deque_tolist(self, NULL) : iterable;
+    if(items == NULL)
+        return NULL;
+    typed_data data;
+    int result = get_typed_data(self->methods, items, &data);
+    if(items != iterable)
+        Py_DECREF(items);
+    if(result == -1)
+        return NULL;
+    for(Py_ssize_t i = 0; i < data.size && result == 0; i++)
+        result = push(self, (char*) data.items + i * self->t_size);
+    release_typed_data(&data);
+    if(result == -1)
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+
+static PyObject* cdeque_extend(cdeque_object* self, PyObject* iterable)
+{
+    return deque_extend(self, iterable, push_back);
+}
+
+
+static PyObject* cdeque_extendleft(cdeque_object* self, PyObject* iterable)
+{
+    return deque_extend(self, iterable, push_front);
+}
+
+
+static PyObject* cdeque_pop(cdeque_object* self, PyObject* args)
+{
+    if(deque_check_resizable(self) == -1)
+        return NULL;
+    if(!self->size)
+    {
+        PyErr_SetString(PyExc_IndexError, "pop from an empty deque");
+        return NULL;
+    }
+    self->size--;
+    return self->methods->load(deque_item(self, self->size));
+}
+
+
+static PyObject* cdeque_popleft(cdeque_object* self, PyObject* args)
+{
+    if(deque_check_resizable(self) == -1)
+        return NULL;
+    if(!self->size)
+    {
+        PyErr_SetString(PyExc_IndexError, "pop from an empty deque");
+        return NULL;
+    }
+    PyObject* num = self->methods->load(deque_item(self, 0));
+    self->head = self->head + 1 < self->capacity ? self->head + 1 : 0;
+    self->size--;
+    return num;
+}
+
+
+static PyObject* cdeque_clear(cdeque_object* self, PyObject* args)
+{
+    if(deque_check_resizable(self) == -1)
+        return NULL;
+    self->size = 0;
+    self->head = 0;
+    Py_RETURN_NONE;
+}
+
+
+static PyObject* deque_tolist(cdeque_object* self, PyObject* args)
+{
+    PyObject* list = PyList_New((Py_ssize_t) self->size);
+    if(list == NULL)
+        return NULL;
+    for(size_t i = 0; i < self->size; i++)
+    {
+        PyObject* item = self->methods->load(deque_item(self, i));
+        if(item == NULL)
+        {
+            Py_DECREF(list);
+            return NULL;
+        }
+        PyList_SET_ITEM(list, (Py_ssize_t) i, item);
+    }
+    return list;
+}
+
+
+static PyObject* deque_segment(cdeque_object* self, char* items, size_t size)
+{
+    carray_object* view = new_carray(self->methods, 0);
+    if(view == NULL)
+        return NULL;
+    view->base = PyMem_Malloc(sizeof(Py_buffer));
+    if(view->base == NULL)
+    {
+        Py_DECREF(view);
+        return PyErr_NoMemory();
+    }
+    PyBuffer_FillInfo(view->base, (PyObject*) self, items,
+                      (Py_ssize_t) (size * self->t_size), 0, PyBUF_SIMPLE);
+    self->exports++;
+    view->items = items;
+    view->size = size;
+    view->capacity = size;
+    return (PyObject*) view;
+}
+
+
+static PyObject* cdeque_segments(cdeque_object* self, PyObject* args)
+{
+    size_t first = self->capacity - self->head;
+    if(first >= self->size)
+    {
+        if(!self->size)
+            return PyTuple_New(0);
+        return Py_BuildValue("(N)", deque_segment(self, deque_item(self, 0),
+                                                  self->size));
+    }
+    PyObject* head = deque_segment(self, deque_item(self, 0), first);
+    PyObject* tail = head == NULL ? NULL : deque_segment(
+        self, (char*) self->items, self->size - first
+    );
+    if(tail == NULL)
+    {
+        Py_XDECREF(head);
+        return NULL;
+    }
+    return Py_BuildValue("(NN)", head, tail);
+}
+
+
+static PyObject* cdeque_sizeof(cdeque_object* self, PyObject* args)
+{
+    return PyLong_FromSize_t(sizeof(cdeque_object)
+                             + self->capacity * self->t_size);
+}
+
+
+static PyObject* get_maxlen(cdeque_object* self, void* closure)
+{
+    if(self->maxlen < 0)
+        Py_RETURN_NONE;
+    return PyLong_FromSsize_t(self->maxlen);
+}
+
+
+static Py_ssize_t cdeque_len(cdeque_object* self)
+{
+    return (Py_ssize_t) self->size;
+}
+
+
+static PyObject* cdeque_item(cdeque_object* self, Py_ssize_t index)
+{
+    if(index < 0 || (size_t) index >= self->size)
+    {
+        PyErr_SetString(PyExc_IndexError, "deque index out of range");
+        return NULL;
+    }
+    return self->methods->load(deque_item(self, (size_t) index));
+}
+
+
+static int cdeque_ass_item(cdeque_object* self, Py_ssize_t index,
+                           PyObject* num)
+{
+    if(num == NULL)
+    {
+        PyErr_SetString(PyExc_TypeError,
+                        "cdeque doesn't support item deletion");
+        return -1;
+    }
+    if(index < 0 || (size_t) index >= self->size)
+    {
+        PyErr_SetString(PyExc_IndexError, "deque index out of range");
+        return -1;
+    }
+    return self->methods->store(num, deque_item(self, (size_t) index));
+}
+
+
+static PyObject* cdeque_repr(cdeque_object* self)
+{
+    PyObject* list = deque_tolist(self, NULL);
+    if(list == NULL)
+        return NULL;
+    PyObject* repr = self->maxlen < 0
+        ? PyUnicode_FromFormat("cdeque<%s>(%R)", self->methods->name, list)
+        : PyUnicode_FromFormat("cdeque<%s>(%R, maxlen=%zd)",
+                               self->methods->name, list, self->maxlen);
+    Py_DECREF(list);
+    return repr;
+}
+
+
+static int cdeque_init(cdeque_object* self, PyObject* args, PyObject* kwds)
+{
+    static char* kwlist[] = {"typecode", "iterable", "maxlen", NULL};
+    int typecode;
+    PyObject* iterable = NULL;
+    PyObject* maxlen = Py_None;
+    if(!PyArg_ParseTupleAndKeywords(args, kwds, "C|OO", kwlist, &typecode,
+                                    &iterable, &maxlen)
+       || deque_check_resizable(self) == -1)
+        return -1;
+    object_methods* methods = find_methods(typecode);
+    if(methods == NULL)
+        return -1;
+    Py_ssize_t length = -1;
+    if(maxlen != Py_None)
+    {
+        length = PyLong_AsSsize_t(maxlen);
+        if(length == -1 && PyErr_Occurred())
+            return -1;
+        if(length < 0)
+        {
+            PyErr_SetString(PyExc_ValueError, "maxlen must be non-negative");
+            return -1;
+        }
+    }
+    PyMem_Free(self->items);
+    self->items = NULL;
+    self->methods = methods;
+    self->t_size = methods->t_size;
+    self->size = 0;
+    self->capacity = 0;
+    self->head = 0;
+    self->maxlen = length;
+    if(iterable != NULL && iterable != Py_None)
+    {
+        PyObject* result = cdeque_extend(self, iterable);
+        if(result == NULL)
+            return -1;
+        Py_DECREF(result);
+    }
+    return 0;
+}
+
+
+static void cdeque_dealloc(cdeque_object* self)
+{
+    PyMem_Free(self->items);
+    Py_TYPE(self)->tp_free(self);
+}
+
+
+static int cdeque_getbuffer(cdeque_object* self, Py_buffer* view, int flags)
+{
+    if(self->size && self->head + self->size > self->capacity)
+    {
+        PyErr_SetString(PyExc_BufferError,
+                        "deque is not contiguous, use segments()");
+        view->obj = NULL;
+        return -1;
+    }
+    static char emptybuf[sizeof(double)];
+    view->buf = self->size ? deque_item(self, 0) : (void*) emptybuf;
+    view->obj = (PyObject*) self;
+    Py_INCREF(self);
+    view->len = (Py_ssize_t) (self->size * self->t_size);
+    view->readonly = 0;
+    view->itemsize = self->t_size;
+    view->format = (flags & PyBUF_FORMAT) ? self->methods->format : NULL;
+    view->ndim = 1;
+    view->shape = (flags & PyBUF_ND) ? (Py_ssize_t*) &self->size : NULL;
+    view->strides = ((flags & PyBUF_STRIDES) == PyBUF_STRIDES)
+        ? &view->itemsize : NULL;
+    view->suboffsets = NULL;
+    view->internal = NULL;
+    self->exports++;
+    return 0;
+}
+
+
+static void cdeque_releasebuffer(cdeque_object* self, Py_buffer* view)
+{
+    self->exports--;
+}
+
+
+static PyMethodDef cdeque_methods[] = {
+    {"__sizeof__", (PyCFunction) cdeque_sizeof, METH_NOARGS, ""},
+    {"append", (PyCFunction) cdeque_append, METH_O, ""},
+    {"appendleft", (PyCFunction) cdeque_appendleft, METH_O, ""},
+    {"extend", (PyCFunction) cdeque_extend, METH_O, ""},
+    {"extendleft", (PyCFunction) cdeque_extendleft, METH_O, ""},
+    {"pop", (PyCFunction) cdeque_pop, METH_NOARGS, ""},
+    {"popleft", (PyCFunction) cdeque_popleft, METH_NOARGS, ""},
+    {"clear", (PyCFunction) cdeque_clear, METH_NOARGS, ""},
+    {"tolist", (PyCFunction) deque_tolist, METH_NOARGS, ""},
+    {"segments", (PyCFunction) cdeque_segments, METH_NOARGS, ""},
+    {NULL}
+};
+
+
+static PyGetSetDef cdeque_getset[] = {
+    {"maxlen", (getter) get_maxlen, NULL, "", NULL},
+    {NULL}
+};
+
+
+static PySequenceMethods cdeque_sequence_methods = {
+    .sq_length = (lenfunc) cdeque_len,
+    .sq_item = (ssizeargfunc) cdeque_item,
+    .sq_ass_item = (ssizeobjargproc) cdeque_ass_item
+};
+
+
+static PyBufferProcs cdeque_buffer_methods = {
+    .bf_getbuffer = (getbufferproc) cdeque_getbuffer,
+    .bf_releasebuffer = (releasebufferproc) cdeque_releasebuffer
+};
+
+
+static PyTypeObject cdeque_type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "carray.cdeque",
+    .tp_basicsize = sizeof(cdeque_object),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_new = PyType_GenericNew,
+    .tp_init = (initproc) cdeque_init,
+    .tp_dealloc = (destructor) cdeque_dealloc,
+    .tp_repr = (reprfunc) cdeque_repr,
+    .tp_methods = cdeque_methods,
+    .tp_getset = cdeque_getset,
+    .tp_as_sequence = &cdeque_sequence_methods,
+    .tp_as_buffer = &cdeque_buffer_methods
+};
+
+
+#define BLOCK_BYTES 8192
+
+
+typedef struct
+{
+    size_t size;
+    char* items;
+} block;
+
+
+typedef struct
+{
+    PyObject_HEAD
+    short t_size;
+    object_methods* methods;
+    size_t size;
+    size_t block_items;
+    size_t count;
+    size_t capacity;
+    block* blocks;
+    size_t* tree;
+} cblocklist_object;
+
+
+static PyTypeObject cblocklist_type;
+
+
+static void build_tree(cblocklist_object* self)
+{
+    for(size_t i = 1; i <= self->count; i++)
+        self->tree[i] = self->blocks[i - 1].size;
+    for(size_t i = 1; i <= self->count; i++)
+    {
+        size_t parent = i + (i & -i);
+        if(parent <= self->count)
+            self->tree[parent] += self->tree[i];
+    }
+}
+
+
+static void resize_block(cblocklist_object* self, size_t position,
+                         size_t delta)
+{
+    self->blocks[position].size += delta;
+    for(size_t i = position + 1; i <= self->count; i += i & -i)
+        self->tree[i] += delta;
+}
+
+
+static size_t find_block(cblocklist_object* self, size_t index,
+                         size_t* offset)
+{
+    size_t position = 0;
+    size_t step = self->count;
+    while(step & (step - 1))
+        step &= step - 1;
+    for(; step; step >>= 1)
+        if(position + step <= self->count
+           && self->tree[position + step] <= index)
+        {
+            position += step;
+            index -= self->tree[position];
+        }
+    *offset = index;
+    return position;
+}
+
+
+static int add_block(cblocklist_object* self, size_t position)
+{
+    if(self->count == self->capacity)
+    {
+        size_t capacity = self->capacity + self->capacity / 2 + 4;
+        block* blocks = PyMem_Realloc(self->blocks,
+                                      capacity * sizeof(block));
+        if(blocks != NULL)
+            self->blocks = blocks;
+        size_t* tree = blocks != NULL
+            ? PyMem_Realloc(self->tree, (capacity + 1) * sizeof(size_t))
+            : NULL;
+        if(tree == NULL)
+        {
+            PyErr_NoMemory();
+            return -1;
+        }
+        self->tree = tree;
+        self->capacity = capacity;
+    }
+    char* items = PyMem_Malloc(self->block_items * self->t_size);
+    if(items == NULL)
+    {
+        PyErr_NoMemory();
+        return -1;
+    }
+    memmove(&self->blocks[position + 1], &self->blocks[position],
+            (self->count - position) * sizeof(block));
+    self->blocks[position].size = 0;
+    self->blocks[position].items = items;
+    self->count++;
+    return 0;
+}
+
+
+static void drop_block(cblocklist_object* self, size_t position)
+{
+    PyMem_Free(self->blocks[position].items);
+    memmove(&self->blocks[position], &self->blocks[position + 1],
+            (self->count - position - 1) * sizeof(block));
+    self->count--;
+}
+
+
+static int split_block(cblocklist_object* self, size_t position)
+{
+    if(add_block(self, position + 1) == -1)
+        return -1;
+    block* left = &self->blocks[position];
+    block* right = &self->blocks[position + 1];
+    size_t half = left->size / 2;
+    right->size = left->size - half;
+    memcpy(right->items, left->items + half * self->t_size,
+           right->size * self->t_size);
+    left->size = half;
+    build_tree(self);
+    return 0;
+}
+
+
+static void merge_blocks(cblocklist_object* self, size_t position)
+{
+    block* current = &self->blocks[position];
+    if(!current->size)
+    {
+        drop_block(self, position);
+        build_tree(self);
+        return;
+    }
+    if(current->size >= self->block_items / 4)
+        return;
+    if(position + 1 < self->count
+       && current->size + current[1].size <= self->block_items)
+    {
+        memcpy(current->items + current->size * self->t_size,
+               current[1].items, current[1].size * self->t_size);
+        current->size += current[1].size;
+        drop_block(self, position + 1);
+        build_tree(self);
+    }
+    else if(position > 0
+            && current[-1].size + current->size <= self->block_items)
+    {
+        memcpy(current[-1].items + current[-1].size * self->t_size,
+               current->items, current->size * self->t_size);
+        current[-1].size += current->size;
+        drop_block(self, position);
+        build_tree(self);
+    }
+}
+
+
+static int insert_item(cblocklist_object* self, size_t index,
+                       const void* item)
+{
+    size_t position, offset;
+    if(index == self->size)
+    {
+        if(!self->count
+           || self->blocks[self->count - 1].size == self->block_items)
+        {
+            if(add_block(self, self->count) == -1)
+                return -1;
+            build_tree(self);
+        }
+        position = self->count - 1;
+        offset = self->blocks[position].size;
+    }
+    else
+        position = find_block(self, index, &offset);
+    if(self->blocks[position].size == self->block_items)
+    {
+        if(split_block(self, position) == -1)
+            return -1;
+        if(offset > self->blocks[position].size)
+            offset -= self->blocks[position++].size;
+    }
+    block* current = &self->blocks[position];
+    char* target = current->items + offset * self->t_size;
+    memmove(target + self->t_size, target,
+            (current->size - offset) * self->t_size);
+    memcpy(target, item, self->t_size);
+    resize_block(self, position, 1);
+    self->size++;
+    return 0;
+}
+
+
+static void delete_item(cblocklist_object* self, size_t index)
+{
+    size_t offset;
+    size_t position = find_block(self, index, &offset);
+    block* current = &self->blocks[position];
+    char* target = current->items + offset * self->t_size;
+    memmove(target, target + self->t_size,
+            (current->size - offset - 1) * self->t_size);
+    resize_block(self, position, (size_t) -1);
+    self->size--;
+    merge_blocks(self, position);
+}
+
+
+static char* blocklist_item(cblocklist_object* self, size_t index)
+{
+    size_t offset;
+    size_t position = find_block(self, index, &offset);
+    return self->blocks[position].items + offset * self->t_size;
+}
+
+
+static Py_ssize_t blocklist_find(cblocklist_object* self, const void* key)
+{
+    Py_ssize_t start = 0;
+    for(size_t i = 0; i < self->count; i++)
+    {
+        block* current = &self->blocks[i];
+        for(size_t chunk = 0; chunk < current->size; chunk += SCAN_BLOCK)
+        {
+            bool mask[SCAN_BLOCK];
+            size_t size = current->size - chunk < SCAN_BLOCK
+                ? current->size - chunk : SCAN_BLOCK;
+            self->methods->compare(Py_EQ,
+                                   current->items + chunk * self->t_size, 1,
+                                   key, 0, mask, size);
+            bool* found = memchr(mask, 1, size);
+            if(found != NULL)
+                return start + (Py_ssize_t) (chunk + (found - mask));
+        }
+        start += (Py_ssize_t) current->size;
+    }
+    return -1;
+}
+
+
+static int blocklist_extend(cblocklist_object* self, PyObject* iterable)
+{
+    typed_data data;
+    if(get_typed_data(self->methods, iterable, &data) == -1)
+        return -1;
+    const char* items = (const char*) data.items;
+    size_t left = (size_t) data.size;
+    while(left)
+    {
+        if(!self->count
+           || self->blocks[self->count - 1].size == self->block_items)
+        {
+            if(add_block(self, self->count) == -1)
+            {
+                build_tree(self);
+                release_typed_data(&data);
+                return -1;
+            }
+        }
+        block* last = &self->blocks[self->count - 1];
+        size_t size = self->block_items - last->size;
+        if(size > left)
+            size = left;
+        memcpy(last->items + last->size * self->t_size, items,
+               size * self->t_size);
+        last->size += size;
+        self->size += size;
+        items += size * self->t_size;
+        left -= size;
+    }
+    build_tree(self);
+    release_typed_data(&data);
+    return 0;
+}
+
+
+static PyObject* blocklist_tolist(cblocklist_object* self, PyObject* args)
+{
+    PyObject* list = PyList_New((Py_ssize_t) self->size);
+    if(list == NULL)
+        return NULL;
+    Py_ssize_t index = 0;
+    for(size_t i = 0; i < self->count; i++)
+        for(size_t j = 0; j < self->blocks[i].size; j++)
+        {
+            PyObject* item = self->methods->load(
+                self->blocks[i].items + j * self->t_size
+            );
+            if(item == NULL)
+            {
+                Py_DECREF(list);
+                return NULL;
+            }
+            PyList_SET_ITEM(list, index++, item);
+        }
+    return list;
+}
+
+
+static PyObject* cblocklist_append(cblocklist_object* self, PyObject* num)
+{
+    item_buffer item;
+    if(self->methods->store(num, &item) == -1
+       || insert_item(self, self->size, &item) == -1)
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+
+static PyObject* cblocklist_extend(cblocklist_object* self,
+                                   PyObject* iterable)
+{
+    PyObject* items = iterable == (PyObject*) self
+        ? blocklist_tolist(self, NULL) : iterable;
+    if(items == NULL)
+        return NULL;
+    int result = blocklist_extend(self, items);
+    if(items != iterable)
+        Py_DECREF(items);
+    if(result == -1)
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+
+static PyObject* cblocklist_insert(cblocklist_object* self, PyObject* args)
+{
+    Py_ssize_t index;
+    PyObject* num;
+    item_buffer item;
+    if(!PyArg_ParseTuple(args, "nO", &index, &num)
+       || self->methods->store(num, &item) == -1)
+        return NULL;
+    index = get_index(self->size, index);
+    if(index < 0)
+        index = 0;
+    else if((size_t) index > self->size)
+        index = (Py_ssize_t) self->size;
+    if(insert_item(self, (size_t) index, &item) == -1)
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+
+static PyObject* cblocklist_pop(cblocklist_object* self, PyObject* args)
+{
+    Py_ssize_t index = (Py_ssize_t) self->size - 1;
+    if(!PyArg_ParseTuple(args, "|n", &index))
+        return NULL;
+    index = get_index(self->size, index);
+    if(index < 0 || (size_t) index >= self->size)
+    {
+        PyErr_SetString(PyExc_IndexError, "index out of range");
+        return NULL;
+    }
+    PyObject* num = self->methods->load(blocklist_item(self, index));
+    if(num != NULL)
+        delete_item(self, (size_t) index);
+    return num;
+}
+
+
+static PyObject* cblocklist_remove(cblocklist_object* self, PyObject* num)
+{
+    item_buffer key;
+    int found = self->methods->to_key(num, &key);
+    if(found == -1)
+        return NULL;
+    Py_ssize_t index = found ? blocklist_find(self, &key) : -1;
+    if(index != -1)
+        delete_item(self, (size_t) index);
+    Py_RETURN_NONE;
+}
+
+
+static PyObject* cblocklist_compact(cblocklist_object* self, PyObject* args)
+{
+    carray_object* result = new_carray(self->methods, self->size);
+    if(result == NULL)
+        return NULL;
+    char* target = (char*) result->items;
+    for(size_t i = 0; i < self->count; i++)
+    {
+        memcpy(target, self->blocks[i].items,
+               self->blocks[i].size * self->t_size);
+        target += self->blocks[i].size * self->t_size;
+    }
+    return (PyObject*) result;
+}
+
+
+static PyObject* cblocklist_sizeof(cblocklist_object* self, PyObject* args)
+{
+    return PyLong_FromSize_t(sizeof(cblocklist_object)
+                             + self->capacity
+                               * (sizeof(block) + sizeof(size_t))
+                             + self->count * self->block_items
+                               * self->t_size);
+}
+
+
+static Py_ssize_t cblocklist_len(cblocklist_object* self)
+{
+    return (Py_ssize_t) self->size;
+}
+
+
+static PyObject* cblocklist_item(cblocklist_object* self, Py_ssize_t index)
+{
+    if(index < 0 || (size_t) index >= self->size)
+    {
+        PyErr_SetString(PyExc_IndexError, "index out of range");
+        return NULL;
+    }
+    return self->methods->load(blocklist_item(self, (size_t) index));
+}
+
+
+static int cblocklist_ass_item(cblocklist_object* self, Py_ssize_t index,
+                               PyObject* num)
+{
+    if(index < 0 || (size_t) index >= self->size)
+    {
+        PyErr_SetString(PyExc_IndexError, "index out of range");
+        return -1;
+    }
+    if(num == NULL)
+    {
+        delete_item(self, (size_t) index);
+        return 0;
+    }
+    return self->methods->store(num, blocklist_item(self, (size_t) index));
+}
+
+
+static int cblocklist_contains(cblocklist_object* self, PyObject* num)
+{
+    item_buffer key;
+    int found = self->methods->to_key(num, &key);
+    if(found != 1)
+        return found;
+    return blocklist_find(self, &key) != -1;
+}
+
+
+static PyObject* cblocklist_repr(cblocklist_object* self)
+{
+    PyObject* list = blocklist_tolist(self, NULL);
+    if(list == NULL)
+        return NULL;
+    PyObject* repr = PyUnicode_FromFormat("cblocklist<%s>(%R)",
+                                          self->methods->name, list);
+    Py_DECREF(list);
+    return repr;
+}
+
+
+static void clear_blocks(cblocklist_object* self)
+{
+    for(size_t i = 0; i < self->count; i++)
+        PyMem_Free(self->blocks[i].items);
+    PyMem_Free(self->blocks);
+    PyMem_Free(self->tree);
+    self->blocks = NULL;
+    self->tree = NULL;
+    self->count = 0;
+    self->capacity = 0;
+    self->size = 0;
+}
+
+
+static int cblocklist_init(cblocklist_object* self, PyObject* args,
+                           PyObject* kwds)
+{
+    int typecode;
+    PyObject* iterable = NULL;
+    if(!PyArg_ParseTuple(args, "C|O", &typecode, &iterable))
+        return -1;
+    object_methods* methods = find_methods(typecode);
+    if(methods == NULL)
+        return -1;
+    clear_blocks(self);
+    self->methods = methods;
+    self->t_size = methods->t_size;
+    self->block_items = BLOCK_BYTES / methods->t_size;
+    if(iterable != NULL && blocklist_extend(self, iterable) == -1)
+        return -1;
+    return 0;
+}
+
+
+static void cblocklist_dealloc(cblocklist_object* self)
+{
+    clear_blocks(self);
+    Py_TYPE(self)->tp_free(self);
+}
+
+
+typedef struct
+{
+    PyObject_HEAD
+    cblocklist_object* list;
+    size_t block;
+    size_t offset;
+} cblocklist_iterator;
+
+
+static PyTypeObject cblocklist_iterator_type;
+
+
+static PyObject* cblocklist_iter(cblocklist_object* self)
+{
+    cblocklist_iterator* iterator = PyObject_New(cblocklist_iterator,
+                                                 &cblocklist_iterator_type);
+    if(iterator == NULL)
+        return NULL;
+    Py_INCREF(self);
+    iterator->list = self;
+    iterator->block = 0;
+    iterator->offset = 0;
+    return (PyObject*) iterator;
+}
+
+
+static PyObject* cblocklist_iterator_next(cblocklist_iterator* self)
+{
+    cblocklist_object* list = self->list;
+    if(list == NULL)
+        return NULL;
+    while(self->block < list->count
+          && self->offset >= list->blocks[self->block].size)
+    {
+        self->block++;
+        self->offset = 0;
+    }
+    if(self->block >= list->count)
+    {
+        Py_CLEAR(self->list);
+        return NULL;
+    }
+    return list->methods->load(list->blocks[self->block].items
+                               + self->offset++ * list->t_size);
+}
+
+
+static void cblocklist_iterator_dealloc(cblocklist_iterator* self)
+{
+    Py_XDECREF(self->list);
+    PyObject_Free(self);
+}
+
+
+static PyTypeObject cblocklist_iterator_type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "carray.cblocklist_iterator",
+    .tp_basicsize = sizeof(cblocklist_iterator),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_dealloc = (destructor) cblocklist_iterator_dealloc,
+    .tp_iter = PyObject_SelfIter,
+    .tp_iternext = (iternextfunc) cblocklist_iterator_next
+};
+
+
+static PyMethodDef cblocklist_methods[] = {
+    {"__sizeof__", (PyCFunction) cblocklist_sizeof, METH_NOARGS, ""},
+    {"append", (PyCFunction) cblocklist_append, METH_O, ""},
+    {"extend", (PyCFunction) cblocklist_extend, METH_O, ""},
+    {"insert", (PyCFunction) cblocklist_insert, METH_VARARGS, ""},
+    {"pop", (PyCFunction) cblocklist_pop, METH_VARARGS, ""},
+    {"remove", (PyCFunction) cblocklist_remove, METH_O, ""},
+    {"tolist", (PyCFunction) blocklist_tolist, METH_NOARGS, ""},
+    {"compact", (PyCFunction) cblocklist_compact, METH_NOARGS, ""},
+    {NULL}
+};
+
+
+static PySequenceMethods cblocklist_sequence_methods = {
+    .sq_length = (lenfunc) cblocklist_len,
+    .sq_item = (ssizeargfunc) cblocklist_item,
+    .sq_ass_item = (ssizeobjargproc) cblocklist_ass_item,
+    .sq_contains = (objobjproc) cblocklist_contains
+};
+
+
+static PyTypeObject cblocklist_type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "carray.cblocklist",
+    .tp_basicsize = sizeof(cblocklist_object),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_new = PyType_GenericNew,
+    .tp_init = (initproc) cblocklist_init,
+    .tp_dealloc = (destructor) cblocklist_dealloc,
+    .tp_repr = (reprfunc) cblocklist_repr,
+    .tp_iter = (getiterfunc) cblocklist_iter,
+    .tp_methods = cblocklist_methods,
+    .tp_as_sequence = &cblocklist_sequence_methods
+};
+
+
+#define PACK_ITEMS 128
 
 
 typedef struct
 {
-    void (*null)();
-    void (*insert)(PyObject*, int, PyObject*);
-    PyObject* (*pop)(PyObject*, int);
-    void (*set_item)(PyObject*, int, PyObject*);
-    PyObject* (*get_item)(PyObject*, int);
-    int (*reversed)(PyObject*, PyObject*, int);
-    PyObject* (*get_type_info)();
-    int (*check_type)(PyObject*);
-} object_methods;
+    uint64_t first;
+    size_t offset;
+    int width;
+} packed_block;
 
 
 typedef struct
@@ -21,476 +4607,567 @@ typedef struct
     PyObject_HEAD
     short t_size;
     object_methods* methods;
-    size_t step;
+    bool is_signed;
     size_t size;
-    size_t capacity;
-    void* items;
-} carray_object;
+    size_t count;
+    packed_block* blocks;
+    uint64_t* words;
+} cpacked_object;
+
 
+static PyTypeObject cpacked_type;
 
-static int check_long(PyObject* num)
+
+static uint64_t widen_item(const void* item, short t_size, bool is_signed)
 {
-    if(PyObject_RichCompareBool(num, PyLong_FromLong(LONG_MAX), Py_GT)
-       || PyObject_RichCompareBool(num, PyLong_FromLong(LONG_MIN), Py_LT)
-       || !PyLong_Check(num))
+    switch(t_size)
     {
-        PyErr_SetString(PyExc_TypeError, "value must be C long");
-        return -1;
+        case 1:
+            return is_signed ? (uint64_t) *(const int8_t*) item
+                             : *(const uint8_t*) item;
+        case 2:
+            return is_signed ? (uint64_t) *(const int16_t*) item
+                             : *(const uint16_t*) item;
+        case 4:
+            return is_signed ? (uint64_t) *(const int32_t*) item
+                             : *(const uint32_t*) item;
+        default:
+            return *(const uint64_t*) item;
     }
-    return 0;
 }
 
 
-static int check_double(PyObject* num)
+static void narrow_item(uint64_t value, void* item, short t_size)
 {
-    if(PyObject_RichCompareBool(num, PyFloat_FromDouble(DBL_MAX), Py_GT)
-       || PyObject_RichCompareBool(num, PyFloat_FromDouble(-DBL_MAX), Py_LT))
+    switch(t_size)
     {
-        PyErr_SetString(PyExc_TypeError, "value must be C double");
-        return -1;
+        case 1: *(uint8_t*) item = (uint8_t) value; break;
+        case 2: *(uint16_t*) item = (uint16_t) value; break;
+        case 4: *(uint32_t*) item = (uint32_t) value; break;
+        default: *(uint64_t*) item = value;
     }
-    return 0;
 }
 
 
-static void set_long_item(PyObject* self, int index, PyObject* num)
+static uint64_t zigzag(uint64_t delta)
 {
-    ((long*) ((carray_object*) self)->items)[index] = PyLong_AsLong(num);
+    return (delta << 1) ^ (uint64_t) ((int64_t) delta >> 63);
 }
 
 
-static void set_double_item(PyObject* self, int index, PyObject* num)
+static uint64_t unzigzag(uint64_t value)
 {
-    ((double*) ((carray_object*) self)->items)[index] = PyFloat_AsDouble(num);
+    return (value >> 1) ^ (0 - (value & 1));
 }
 
 
-static int set_item(carray_object* self, int index, PyObject* num)
+static bool packed_less(uint64_t a, uint64_t b, bool is_signed)
 {
-    if(index >= 0 && index < self->size)
-    {
-        if(self->methods->check_type(num) == -1)
-            return -1;
-        self->methods->set_item((PyObject*) self, index, num);
-        return 0;
-    }
-    PyErr_SetString(PyExc_IndexError, "index out of range");
-    return -1;
+    return is_signed ? (int64_t) a < (int64_t) b : a < b;
 }
 
 
-static PyObject* get_long_item(PyObject* self, int index)
+static void unpack_block(const cpacked_object* self, size_t index,
+                         uint64_t* values)
 {
-    return PyLong_FromLong(
-        ((long*) ((carray_object*) self)->items)[index]
-    );
+    const packed_block* current = &self->blocks[index];
+    size_t size = index + 1 < self->count
+        ? PACK_ITEMS : self->size - index * PACK_ITEMS;
+    const uint64_t* words = self->words + current->offset;
+    int width = current->width;
+    uint64_t mask = width == 64 ? UINT64_MAX : ((uint64_t) 1 << width) - 1;
+    uint64_t value = current->first;
+    values[0] = value;
+    for(size_t i = 1; i < size; i++)
+    {
+        uint64_t delta = 0;
+        if(width)
+        {
+            size_t bit = (i - 1) * width;
+            size_t word = bit >> 6, shift = bit & 63;
+            delta = words[word] >> shift;
+            if(shift + width > 64)
+                delta |= words[word + 1] << (64 - shift);
+            delta &= mask;
+        }
+        value += unzigzag(delta);
+        values[i] = value;
+    }
 }
 
 
-static PyObject* get_double_item(PyObject* self, int index)
+static int pack_items(cpacked_object* self, const char* items)
 {
-    return PyFloat_FromDouble(
-        ((double*) ((carray_object*) self)->items)[index]
-    );
-}
+    self->count = (self->size + PACK_ITEMS - 1) / PACK_ITEMS;
+    self->blocks = PyMem_Malloc(self->count * sizeof(packed_block) + 1);
+    if(self->blocks == NULL)
+    {
+        PyErr_NoMemory();
+        return -1;
+    }
 
+    size_t words = 0;
+    for(size_t b = 0; b < self->count; b++)
+    {
+        const char* block_items = items + b * PACK_ITEMS * self->t_size;
+        size_t size = b + 1 < self->count
+            ? PACK_ITEMS : self->size - b * PACK_ITEMS;
+        uint64_t previous = widen_item(block_items, self->t_size,
+                                       self->is_signed);
+        uint64_t bits = 0;
+        self->blocks[b].first = previous;
+        for(size_t i = 1; i < size; i++)
+        {
+            uint64_t value = widen_item(block_items + i * self->t_size,
+                                        self->t_size, self->is_signed);
+            bits |= zigzag(value - previous);
+            previous = value;
+        }
+        self->blocks[b].width = bits ? 64 - __builtin_clzll(bits) : 0;
+        self->blocks[b].offset = words;
+        words += ((size - 1) * self->blocks[b].width + 63) / 64;
+    }
 
-static PyObject* get_item(carray_object* self, int index)
-{
-    if(index >= 0 && index < self->size)
+    self->words = PyMem_Calloc(words + 1, sizeof(uint64_t));
+    if(self->words == NULL)
     {
-        PyObject* item = self->methods->get_item((PyObject*) self, index);
-        Py_INCREF(item);
-        return item;
+        PyErr_NoMemory();
+        return -1;
     }
-    PyErr_SetString(PyExc_IndexError, "index out of range");
-    return NULL;
+    for(size_t b = 0; b < self->count; b++)
+    {
+        const char* block_items = items + b * PACK_ITEMS * self->t_size;
+        size_t size = b + 1 < self->count
+            ? PACK_ITEMS : self->size - b * PACK_ITEMS;
+        uint64_t* block_words = self->words + self->blocks[b].offset;
+        int width = self->blocks[b].width;
+        uint64_t previous = self->blocks[b].first;
+        for(size_t i = 1; i < size && width; i++)
+        {
+            uint64_t value = widen_item(block_items + i * self->t_size,
+                                        self->t_size, self->is_signed);
+            uint64_t delta = zigzag(value - previous);
+            size_t bit = (i - 1) * width;
+            size_t word = bit >> 6, shift = bit & 63;
+            block_words[word] |= delta << shift;
+            if(shift + width > 64)
+                block_words[word + 1] |= delta >> (64 - shift);
+            previous = value;
+        }
+    }
+    return 0;
 }
 
 
-static void increase_capacity(carray_object* self)
+static size_t packed_search(const cpacked_object* self, uint64_t key,
+                            int right)
 {
-    if(self->size >= self->capacity)
+    size_t low = 0, high = self->count;
+    while(low < high)
     {
-        self->capacity = self->capacity * 2 + 1;
-        self->items = PyMem_Realloc(
-            self->items, self->capacity * self->t_size
-        );
+        size_t middle = low + (high - low) / 2;
+        uint64_t first = self->blocks[middle].first;
+        if(right ? !packed_less(key, first, self->is_signed)
+                 : packed_less(first, key, self->is_signed))
+            low = middle + 1;
+        else
+            high = middle;
     }
-}
-
+    if(low == 0)
+        return 0;
 
-static void reduce_capacity(carray_object* self)
-{
-    if(self->size <= self->capacity / 2)
+    uint64_t values[PACK_ITEMS];
+    size_t index = low - 1;
+    size_t size = index + 1 < self->count
+        ? PACK_ITEMS : self->size - index * PACK_ITEMS;
+    unpack_block(self, index, values);
+    size_t position = 1;
+    high = size;
+    while(position < high)
     {
-        self->capacity = self->size;
-        self->items = PyMem_Realloc(
-            self->items, self->capacity * self->t_size
-        );
+        size_t middle = position + (high - position) / 2;
+        if(right ? !packed_less(key, values[middle], self->is_signed)
+                 : packed_less(values[middle], key, self->is_signed))
+            position = middle + 1;
+        else
+            high = middle;
     }
+    return index * PACK_ITEMS + position;
 }
 
 
-static PyObject* carray_append(carray_object* self, PyObject* args)
+static PyObject* cpacked_tolist(cpacked_object* self, PyObject* args)
 {
-    PyObject* num;
-    if(!PyArg_ParseTuple(args, "O", &num)
-       || self->methods->check_type(num) == -1)
+    PyObject* list = PyList_New((Py_ssize_t) self->size);
+    if(list == NULL)
         return NULL;
-    increase_capacity(self);
-    self->methods->set_item((PyObject*) self, (int) self->size, num);
-    self->size++;
-    Py_INCREF(Py_None);
-    return Py_None;
-}
-
-
-static int get_index(size_t size, int index)
-{
-    if (index < 0)
-        return (int) size + index;
-    return index;
-}
-
-
-#define INSERT(type) static void insert_##type( \
-    PyObject* self, int index, PyObject* num) \
-{ \
-    carray_object* c_self = (carray_object*) self; \
-    memmove(&((type*) c_self->items)[index + 1], \
-            &((type*) c_self->items)[index], \
-            (c_self->size - index) * c_self->t_size); \
-    set_##type##_item(self, index, num); \
-    c_self->size++; \
+    uint64_t values[PACK_ITEMS];
+    for(size_t b = 0; b < self->count; b++)
+    {
+        unpack_block(self, b, values);
+        for(size_t i = 0; i < PACK_ITEMS && b * PACK_ITEMS + i < self->size;
+            i++)
+        {
+            item_buffer item;
+            narrow_item(values[i], &item, self->t_size);
+            PyObject* num = self->methods->load(&item);
+            if(num == NULL)
+            {
+                Py_DECREF(list);
+                return NULL;
+            }
+            PyList_SET_ITEM(list, b * PACK_ITEMS + i, num);
+        }
+    }
+    return list;
 }
 
-INSERT(long)
-INSERT(double)
 
-
-static PyObject* carray_insert(carray_object* self, PyObject* args)
+static PyObject* cpacked_decompress(cpacked_object* self, PyObject* args)
 {
-    int index;
-    PyObject* num;
-    if(!PyArg_ParseTuple(args, "nO", &index, &num)
-       || self->methods->check_type(num) == -1)
+    carray_object* result = new_carray(self->methods, self->size);
+    if(result == NULL)
         return NULL;
-    index = get_index(self->size, index);
-    if(index < 0)
-        index = 0;
-    else if(index > self->size)
-        index = (int) self->size;
-    increase_capacity(self);
-    self->methods->insert((PyObject*) self, index, num);
-    Py_INCREF(Py_None);
-    return Py_None;
+    char* items = (char*) result->items;
+    uint64_t values[PACK_ITEMS];
+    BEGIN_NOGIL(result)
+    for(size_t b = 0; b < self->count; b++)
+    {
+        unpack_block(self, b, values);
+        for(size_t i = 0; i < PACK_ITEMS && b * PACK_ITEMS + i < self->size;
+            i++)
+            narrow_item(values[i], items + (b * PACK_ITEMS + i)
+                                           * self->t_size, self->t_size);
+    }
+    END_NOGIL(result)
+    return (PyObject*) result;
 }
 
 
-#define POP(type) static PyObject* pop_##type(PyObject* self, int index) \
-{ \
-    carray_object* c_self = (carray_object*) self; \
-    PyObject* num = get_##type##_item(self, index); \
-    memmove(&((type*) c_self->items)[index], \
-            &((type*) c_self->items)[index + 1], \
-            (c_self->size - index - 1) * c_self->t_size); \
-    c_self->size--; \
-    return num; \
+static Py_ssize_t packed_key(cpacked_object* self, PyObject* value,
+                             int right)
+{
+    if(PyFloat_Check(value))
+    {
+        double key = PyFloat_AS_DOUBLE(value);
+        if(isnan(key))
+            return right ? (Py_ssize_t) self->size : 0;
+        if(isinf(key))
+            return key > 0 ? (Py_ssize_t) self->size : 0;
+        if(key != floor(key))
+        {
+            key = floor(key);
+            right = 1;
+        }
+        PyObject* integer = PyLong_FromDouble(key);
+        if(integer == NULL)
+            return -1;
+        Py_ssize_t position = packed_key(self, integer, right);
+        Py_DECREF(integer);
+        return position;
+    }
+    if(!PyLong_Check(value))
+    {
+        PyErr_Format(PyExc_TypeError, "value must be int or float, not %s",
+                     Py_TYPE(value)->tp_name);
+        return -1;
+    }
+    item_buffer key;
+    if(self->methods->store(value, &key) == 0)
+        return (Py_ssize_t) packed_search(
+            self, widen_item(&key, self->t_size, self->is_signed), right
+        );
+    if(!PyErr_ExceptionMatches(PyExc_OverflowError))
+        return -1;
+    PyErr_Clear();
+    int overflow;
+    long long number = PyLong_AsLongLongAndOverflow(value, &overflow);
+    if(number == -1 && PyErr_Occurred())
+        return -1;
+    return (overflow ? overflow > 0 : number >= 0)
+        ? (Py_ssize_t) self->size : 0;
 }
 
-POP(long)
-POP(double)
-
 
-static PyObject* carray_pop(carray_object* self, PyObject* args)
+static PyObject* cpacked_searchsorted(cpacked_object* self, PyObject* args,
+                                      PyObject* kwds)
 {
-    int index = (int) self->size - 1;
-    if(!PyArg_ParseTuple(args, "|n", &index))
+    static char* kwlist[] = {"value", "side", NULL};
+    PyObject* value;
+    const char* side = "left";
+    if(!PyArg_ParseTupleAndKeywords(args, kwds, "O|s", kwlist,
+                                    &value, &side))
         return NULL;
-    index = get_index(self->size, index);
-    if(index >= 0 && index < self->size)
+    int right = strcmp(side, "right") == 0;
+    if(!right && strcmp(side, "left") != 0)
     {
-        PyObject* num = self->methods->pop((PyObject*) self, index);
-        reduce_capacity(self);
-        Py_INCREF(num);
-        return num;
+        PyErr_SetString(PyExc_ValueError, "side must be 'left' or 'right'");
+        return NULL;
     }
-    PyErr_SetString(PyExc_IndexError, "index out of range");
-    return NULL;
-}
 
+    if(PyLong_Check(value) || PyFloat_Check(value))
+    {
+        Py_ssize_t position = packed_key(self, value, right);
+        return position == -1 ? NULL : PyLong_FromSsize_t(position);
+    }
 
-static PyObject* carray_remove(carray_object* self, PyObject* args)
-{
-    PyObject* num;
-    if(!PyArg_ParseTuple(args, "O", &num))
+    PyObject* keys = value;
+    if(PyObject_CheckBuffer(value))
+        Py_INCREF(keys);
+    else if((keys = PySequence_Fast(value, "argument must be iterable"))
+            == NULL)
         return NULL;
-    Py_INCREF(Py_None);
-    if(!PyFloat_Check(num) && !PyLong_Check(num))
-        return Py_None;
-    int index = -1;
-    for(int i = 0; i < self->size; i++)
-        if(PyObject_RichCompareBool(
-            num, self->methods->get_item((PyObject*) self, i), Py_EQ
-        ))
-        {
-            index = i;
-            break;
+    typed_data data;
+    carray_object* result = NULL;
+    if(get_typed_data(self->methods, keys, &data) == 0)
+    {
+        result = new_carray(find_methods('q'), data.size);
+        if(result != NULL)
+        {
+            long long* positions = (long long*) result->items;
+            const char* items = (const char*) data.items;
+            for(Py_ssize_t i = 0; i < data.size; i++)
+                positions[i] = (long long) packed_search(
+                    self, widen_item(items + i * self->t_size, self->t_size,
+                                     self->is_signed), right
+                );
         }
-    if(index != - 1)
+        release_typed_data(&data);
+    }
+    else if(PyErr_ExceptionMatches(PyExc_OverflowError)
+            || PyErr_ExceptionMatches(PyExc_TypeError))
     {
-        self->methods->pop((PyObject*) self, index);
-        reduce_capacity(self);
+        PyErr_Clear();
+        result = search_keys(keys, (key_search) packed_key, (PyObject*) self,
+                             right);
     }
-    return Py_None;
-}
-
-
-#define GET_INFO(type) static PyObject* get_##type##_info() \
-{ \
-    return PyUnicode_FromString("carray<"#type">("); \
+    Py_DECREF(keys);
+    return (PyObject*) result;
 }
 
-GET_INFO(long)
-GET_INFO(double)
 
-
-static PyObject* get_info(carray_object* self)
+static PyObject* cpacked_sizeof(cpacked_object* self, PyObject* args)
 {
-    PyObject* info = self->methods->get_type_info();
-    for(int i = 0; i < self->size; i++)
-    {
-        info = PyUnicode_Concat(info, PyObject_Str(
-            self->methods->get_item((PyObject*) self, i)
-        ));
-        if(i < self->size - 1)
-            info = PyUnicode_Concat(info, PyUnicode_FromString(", "));
-    }
-    info = PyUnicode_Concat(info, PyUnicode_FromString(")"));
-    Py_INCREF(info);
-    return info;
+    size_t words = self->count
+        ? self->blocks[self->count - 1].offset
+          + ((self->size - (self->count - 1) * PACK_ITEMS - 1)
+             * self->blocks[self->count - 1].width + 63) / 64
+        : 0;
+    return PyLong_FromSize_t(sizeof(cpacked_object)
+                             + self->count * sizeof(packed_block)
+                             + words * sizeof(uint64_t));
 }
 
 
-static PyObject* get_sizeof(carray_object* self, PyObject* args)
+static Py_ssize_t cpacked_len(cpacked_object* self)
 {
-    PyObject* size = PyLong_FromSize_t(self->capacity * self->t_size);
-    Py_INCREF(size);
-    return size;
+    return (Py_ssize_t) self->size;
 }
 
 
-static Py_ssize_t get_len(carray_object* self)
+static PyObject* cpacked_item(cpacked_object* self, Py_ssize_t index)
 {
-    return (Py_ssize_t) self->size;
+    if(index < 0 || (size_t) index >= self->size)
+    {
+        PyErr_SetString(PyExc_IndexError, "index out of range");
+        return NULL;
+    }
+    uint64_t values[PACK_ITEMS];
+    unpack_block(self, (size_t) index / PACK_ITEMS, values);
+    item_buffer item;
+    narrow_item(values[index % PACK_ITEMS], &item, self->t_size);
+    return self->methods->load(&item);
 }
 
 
-static PyObject* carray_compare(carray_object* self, PyObject* other, int op)
+static PyObject* cpacked_repr(cpacked_object* self)
 {
-    if(op != Py_EQ)
-        return Py_NotImplemented;
-    if(self->size != PySequence_Size(other))
-        return Py_False;
-    for(int i = 0; i < self->size; i++)
-        if(!PyObject_RichCompareBool(
-                self->methods->get_item((PyObject*) self, i),
-                PySequence_GetItem(other, i), Py_EQ
-            ))
-            return Py_False;
-    return Py_True;
+    PyObject* list = cpacked_tolist(self, NULL);
+    if(list == NULL)
+        return NULL;
+    PyObject* repr = PyUnicode_FromFormat("cpacked<%s>(%R)",
+                                          self->methods->name, list);
+    Py_DECREF(list);
+    return repr;
 }
 
 
-static PyObject* carray_iter(carray_object* self)
+static void clear_packed(cpacked_object* self)
 {
-    self->step = 0;
-    Py_INCREF(self);
-    return (PyObject*) self;
+    PyMem_Free(self->blocks);
+    PyMem_Free(self->words);
+    self->blocks = NULL;
+    self->words = NULL;
+    self->count = 0;
+    self->size = 0;
 }
 
 
-static PyObject* carray_next(carray_object* self)
+static int cpacked_init(cpacked_object* self, PyObject* args, PyObject* kwds)
 {
-    if(self->step < self->size)
+    int typecode;
+    PyObject* source;
+    if(!PyArg_ParseTuple(args, "CO", &typecode, &source))
+        return -1;
+    object_methods* methods = find_methods(typecode);
+    if(methods == NULL)
+        return -1;
+    char kind = format_kind(methods->format);
+    if(kind != 'i' && kind != 'u')
     {
-        int index = (int) self->step;
-        self->step++;
-        PyObject* item = self->methods->get_item((PyObject*) self, index);
-        Py_INCREF(item);
-        return item;
+        PyErr_SetString(PyExc_TypeError,
+                        "cpacked supports only integer types");
+        return -1;
     }
-    PyErr_SetString(PyExc_StopIteration, "");
-    return NULL;
-}
-
-
-#define GET_TYPECODE(type) \
-    PyUnicode_FromString(strcmp(#type, "long") == 0 ? "i" : "d")
 
-#define REVERSED(type) static int reversed_##type( \
-    PyObject* obj, PyObject* self, int size) \
-{ \
-    Py_TYPE(obj)->tp_init( \
-        obj, PyTuple_Pack(1, GET_TYPECODE(type)), NULL \
-    ); \
-    if(!size) \
-        return 0; \
-    carray_object* c_obj = (carray_object*) obj; \
-    carray_object* c_self = (carray_object*) self; \
-    c_obj->items = PyMem_Malloc(size * c_obj->t_size); \
-    ((type*) c_obj->items)[size / 2] = ((type*) c_self->items)[size / 2]; \
-    for(int i = 0; i < size / 2; i++) \
-    { \
-        ((type*) c_obj->items)[i] = ((type*) c_self->items)[size - i - 1]; \
-        ((type*) c_obj->items)[size - i - 1] = ((type*) c_self->items)[i]; \
-    } \
-    return 0; \
+    typed_data data;
+    if(get_typed_data(methods, source, &data) == -1)
+        return -1;
+    clear_packed(self);
+    self->methods = methods;
+    self->t_size = methods->t_size;
+    self->is_signed = kind == 'i';
+    self->size = (size_t) data.size;
+    int result = pack_items(self, (const char*) data.items);
+    release_typed_data(&data);
+    if(result == -1)
+        clear_packed(self);
+    return result;
 }
 
-REVERSED(long)
-REVERSED(double)
-
 
-static PyObject* carray_reversed(carray_object* self, PyObject* args)
+static void cpacked_dealloc(cpacked_object* self)
 {
-    carray_object* r_self = (carray_object*) Py_TYPE(self)->tp_new(
-        Py_TYPE(self), NULL, NULL
-    );
-    self->methods->reversed(
-        (PyObject*) r_self, (PyObject*) self, (int) self->size
-    );
-    r_self->size = self->size;
-    r_self->capacity = self->capacity;
-    return (PyObject*) r_self;
+    clear_packed(self);
+    Py_TYPE(self)->tp_free(self);
 }
 
 
-static object_methods type_methods[] = {
-    {NULL, insert_long, pop_long, set_long_item,
-     get_long_item, reversed_long, get_long_info, check_long},
-    {NULL, insert_double, pop_double, set_double_item,
-     get_double_item, reversed_double, get_double_info, check_double}
-};
+typedef struct
+{
+    PyObject_HEAD
+    cpacked_object* packed;
+    size_t index;
+    uint64_t values[PACK_ITEMS];
+} cpacked_iterator;
 
 
-static PyMethodDef carray_methods[] = {
-    {"__sizeof__", (PyCFunction) get_sizeof, METH_NOARGS, ""},
-    {"__reversed__", (PyCFunction) carray_reversed, METH_NOARGS, ""},
-    {"append", (PyCFunction) carray_append, METH_VARARGS, ""},
-    {"insert", (PyCFunction) carray_insert, METH_VARARGS, ""},
-    {"pop", (PyCFunction) carray_pop, METH_VARARGS, ""},
-    {"remove", (PyCFunction) carray_remove, METH_VARARGS, ""},
-    {NULL}
-};
+static PyTypeObject cpacked_iterator_type;
 
 
-static PyObject* carray_new(PyTypeObject* type, PyObject* args, PyObject* kwds)
+static PyObject* cpacked_iter(cpacked_object* self)
 {
-    carray_object* self = (carray_object*) type->tp_alloc(type, 0);
-    if(self != NULL)
-    {
-        self->size = 0;
-        self->capacity = 0;
-        self->items = NULL;
-    }
+    cpacked_iterator* iterator = PyObject_New(cpacked_iterator,
+                                              &cpacked_iterator_type);
+    if(iterator == NULL)
+        return NULL;
     Py_INCREF(self);
-    return (PyObject*) self;
+    iterator->packed = self;
+    iterator->index = 0;
+    return (PyObject*) iterator;
 }
 
 
-static int carray_init(carray_object* self, PyObject* args, PyObject* kwds)
+static PyObject* cpacked_iterator_next(cpacked_iterator* self)
 {
-    int typecode;
-    PyObject* iterable = NULL;
-
-    if(!PyArg_ParseTuple(args, "C|O", &typecode, &iterable))
-        return -1;
-
-    if(typecode == 'i')
-    {
-        self->t_size = sizeof(long);
-        self->methods = &type_methods[0];
-    }
-    else if(typecode == 'd')
-    {
-        self->t_size = sizeof(double);
-        self->methods = &type_methods[1];
-    }
-    else
-    {
-        PyErr_SetString(PyExc_ValueError, "incorrect data type");
-        return -1;
-    }
-    Py_INCREF(self->methods);
-
-    if(iterable)
+    cpacked_object* packed = self->packed;
+    if(packed == NULL)
+        return NULL;
+    if(self->index >= packed->size)
     {
-        self->size = PySequence_Size(iterable);
-        if(self->size == -1)
-        {
-            PyErr_SetString(PyExc_TypeError, "argument 2 must be iterable");
-            return -1;
-        }
-        self->capacity = self->size;
-        self->items = PyMem_Malloc(self->capacity * self->t_size);
-        for(int i = 0; i < self->size; i++)
-            if(set_item(self, i, PySequence_GetItem(iterable, i)) == -1)
-            {
-                PyMem_Free(self->items);
-                return -1;
-            }
+        Py_CLEAR(self->packed);
+        return NULL;
     }
-    return 0;
+    size_t offset = self->index % PACK_ITEMS;
+    if(!offset)
+        unpack_block(packed, self->index / PACK_ITEMS, self->values);
+    self->index++;
+    item_buffer item;
+    narrow_item(self->values[offset], &item, packed->t_size);
+    return packed->methods->load(&item);
 }
 
 
-static void carray_dealloc(carray_object* self)
+static void cpacked_iterator_dealloc(cpacked_iterator* self)
 {
-    PyMem_Free(self->items);
-    Py_DECREF(self->methods);
-    Py_DECREF(self);
-    Py_TYPE(self)->tp_free(self);
+    Py_XDECREF(self->packed);
+    PyObject_Free(self);
 }
 
 
-static PySequenceMethods carray_sequence_methods = {
-    .sq_length = (lenfunc) get_len,
-    .sq_ass_item = (ssizeobjargproc) set_item,
-    .sq_item = (ssizeargfunc) get_item
+static PyTypeObject cpacked_iterator_type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "carray.cpacked_iterator",
+    .tp_basicsize = sizeof(cpacked_iterator),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_dealloc = (destructor) cpacked_iterator_dealloc,
+    .tp_iter = PyObject_SelfIter,
+    .tp_iternext = (iternextfunc) cpacked_iterator_next
 };
 
 
-static PyTypeObject carray_type = {
+static PyMethodDef cpacked_methods[] = {
+    {"__sizeof__", (PyCFunction) cpacked_sizeof, METH_NOARGS, ""},
+    {"tolist", (PyCFunction) cpacked_tolist, METH_NOARGS, ""},
+    {"decompress", (PyCFunction) cpacked_decompress, METH_NOARGS, ""},
+    {"searchsorted", (PyCFunction) cpacked_searchsorted,
+     METH_VARARGS | METH_KEYWORDS, ""},
+    {NULL}
+};
+
+
+static PySequenceMethods cpacked_sequence_methods = {
+    .sq_length = (lenfunc) cpacked_len,
+    .sq_item = (ssizeargfunc) cpacked_item
+};
+
+
+static PyTypeObject cpacked_type = {
     PyVarObject_HEAD_INIT(NULL, 0)
-    .tp_name = "carray.carray",
-    .tp_basicsize = sizeof(carray_object),
+    .tp_name = "carray.cpacked",
+    .tp_basicsize = sizeof(cpacked_object),
     .tp_itemsize = 0,
     .tp_flags = Py_TPFLAGS_DEFAULT,
-    .tp_new = carray_new,
-    .tp_init = (initproc) carray_init,
-    .tp_dealloc = (destructor) carray_dealloc,
-    .tp_richcompare = (richcmpfunc) carray_compare,
-    .tp_repr = (reprfunc) get_info,
-    .tp_str = (reprfunc) get_info,
-    .tp_iter = (getiterfunc) carray_iter,
-    .tp_iternext = (iternextfunc) carray_next,
-    .tp_methods = carray_methods,
-    .tp_as_sequence = &carray_sequence_methods
+    .tp_new = PyType_GenericNew,
+    .tp_init = (initproc) cpacked_init,
+    .tp_dealloc = (destructor) cpacked_dealloc,
+    .tp_repr = (reprfunc) cpacked_repr,
+    .tp_iter = (getiterfunc) cpacked_iter,
+    .tp_methods = cpacked_methods,
+    .tp_as_sequence = &cpacked_sequence_methods
+};
+
+
+static PyMethodDef module_methods[] = {
+    {"open", (PyCFunction) carray_open, METH_VARARGS | METH_KEYWORDS, ""},
+    {"create_shared", (PyCFunction) carray_create_shared,
+     METH_VARARGS | METH_KEYWORDS, ""},
+    {"attach_shared", (PyCFunction) carray_attach_shared,
+     METH_VARARGS | METH_KEYWORDS, ""},
+    {"unlink_shared", (PyCFunction) carray_unlink_shared, METH_VARARGS, ""},
+    {"_reconstruct", (PyCFunction) carray_reconstruct, METH_VARARGS, ""},
+    {NULL}
 };
 
 
 static PyModuleDef carray_module = {
     PyModuleDef_HEAD_INIT,
     .m_name = "carray",
-    .m_size = -1
+    .m_size = -1,
+    .m_methods = module_methods
 };
 
 
 PyMODINIT_FUNC PyInit_carray()
 {
-    if(PyType_Ready(&carray_type) < 0)
+    if(PyType_Ready(&carray_type) < 0
+       || PyType_Ready(&carray_iterator_type) < 0
+       || PyType_Ready(&cdeque_type) < 0
+       || PyType_Ready(&cblocklist_type) < 0
+       || PyType_Ready(&cblocklist_iterator_type) < 0
+       || PyType_Ready(&cpacked_type) < 0
+       || PyType_Ready(&cpacked_iterator_type) < 0)
         return NULL;
     PyObject* module = PyModule_Create(&carray_module);
     if(module == NULL)
@@ -502,5 +5179,27 @@ PyMODINIT_FUNC PyInit_carray()
         Py_DECREF(module);
         return NULL;
     }
+    Py_INCREF(&cdeque_type);
+    if(PyModule_AddObject(module, "cdeque", (PyObject*) &cdeque_type) < 0)
+    {
+        Py_DECREF(&cdeque_type);
+        Py_DECREF(module);
+        return NULL;
+    }
+    Py_INCREF(&cblocklist_type);
+    if(PyModule_AddObject(module, "cblocklist",
+                          (PyObject*) &cblocklist_type) < 0)
+    {
+        Py_DECREF(&cblocklist_type);
+        Py_DECREF(module);
+        return NULL;
+    }
+    Py_INCREF(&cpacked_type);
+    if(PyModule_AddObject(module, "cpacked", (PyObject*) &cpacked_type) < 0)
+    {
+        Py_DECREF(&cpacked_type);
+        Py_DECREF(module);
+        return NULL;
+    }
     return module;
 }
@@ -1,7 +1,17 @@
 """Тесты для модуля binary_search."""
 import unittest
+import array
+import bisect
+import concurrent.futures
+import math
+import os
+import random
+import struct
+import tempfile
+import threading
 
 import binary_search
+import carray
 
 
 TEST_DATA = [
@@ -38,3 +48,367 @@ class TestBinarySearch(unittest.TestCase):
                 self.assertEqual(
                     binary_search.binary_search(iterable_obj, item), expected
                 )
+
+    def test_binary_search_many(self):
+        """Тест пакетного поиска на тех же данных."""
+        for iterable_obj, item, expected in TEST_DATA:
+            with self.subTest(iterable_obj=iterable_obj, item=item):
+                self.assertEqual(
+                    binary_search.binary_search_many(iterable_obj, [item]),
+                    array.array('q', [-1 if expected is None else expected])
+                )
+
+    def test_binary_search_many_mutation(self):
+        """Тест изменения списка из сравнения во время пакетного поиска."""
+        data = []
+
+        class Shrinking:
+            """Ключ, очищающий список при сравнении."""
+
+            def __init__(self, value):
+                self.value = value
+
+            def __lt__(self, other):
+                data.clear()
+                queries.clear()
+                return self.value < getattr(other, 'value', other)
+
+            def __eq__(self, other):
+                return self.value == getattr(other, 'value', other)
+
+            __hash__ = None
+
+        data.extend(Shrinking(i) for i in range(100))
+        queries = [Shrinking(i) for i in range(0, 100, 7)]
+        with self.assertRaises(IndexError):
+            binary_search.binary_search_many(data, queries)
+
+    def test_binary_search_many_generator(self):
+        """Тест пакетного поиска по ключам из итератора и генератора."""
+        for sorted_obj in [[1, 2, 3, 4], carray.carray('l', [1, 2, 3, 4]),
+                           array.array('q', [1, 2, 3, 4])]:
+            for queries, expected in [([2, 3, 2 ** 70, 4], [1, 2, -1, 3]),
+                                      ([4, 1.5, 1], [3, -1, 0])]:
+                with self.subTest(sorted_obj=type(sorted_obj),
+                                  queries=queries):
+                    self.assertEqual(binary_search.binary_search_many(
+                        sorted_obj, iter(queries)
+                    ).tolist(), expected)
+                    self.assertEqual(binary_search.binary_search_many(
+                        sorted_obj, (query for query in queries)
+                    ).tolist(), expected)
+
+    def test_binary_search_many_typed(self):
+        """Тест пакетного поиска по типизированным буферам."""
+        rng = random.Random(18)
+        data = sorted(rng.choices(range(10_000), k=5000))
+        queries = rng.choices(range(-10, 10_010), k=3000)
+        expected = []
+        for query in queries:
+            index = bisect.bisect_left(data, query)
+            found = index < len(data) and data[index] == query
+            expected.append(index if found else -1)
+        for sorted_obj in [data, carray.carray('q', data),
+                           array.array('i', data)]:
+            for query_obj in [queries, carray.carray('h', queries),
+                              array.array('l', queries)]:
+                with self.subTest(sorted_obj=type(sorted_obj),
+                                  query_obj=type(query_obj)):
+                    self.assertEqual(binary_search.binary_search_many(
+                        sorted_obj, query_obj
+                    ).tolist(), expected)
+        order = sorted(range(len(queries)), key=queries.__getitem__)
+        self.assertEqual(binary_search.binary_search_many(
+            carray.carray('q', data), sorted(queries)
+        ).tolist(), [expected[i] for i in order])
+        self.assertEqual(binary_search.binary_search_many(
+            carray.carray('d', [0.5, 1.5]), [math.nan, 1.5, 1]
+        ).tolist(), [-1, 1, -1])
+        self.assertEqual(binary_search.binary_search_many(
+            carray.carray('q', [1, 2]), [2.0, 1]
+        ).tolist(), [1, 0])
+        with self.assertRaises(TypeError):
+            binary_search.binary_search_many([1, 2], 5)
+
+    def test_binary_search_typed(self):
+        """Тест поиска по типизированной памяти буферов."""
+        rng = random.Random(19)
+        for typecode, low, high in [('b', -128, 127), ('B', 0, 255),
+                                    ('h', -1000, 1000),
+                                    ('Q', 0, 2 ** 64 - 1),
+                                    ('q', -2 ** 63, 2 ** 63 - 1),
+                                    ('d', -100, 100)]:
+            data = sorted(rng.randint(low, high) for _ in range(500))
+            typed = carray.carray(typecode, data if typecode != 'd'
+                                  else [float(x) for x in data])
+            keys = data[::25] + [rng.randint(low, high) for _ in range(50)]
+            keys += [low - 1, high + 1, 0.5, float(data[7]), True]
+            for key in keys:
+                with self.subTest(typecode=typecode, key=key):
+                    index = bisect.bisect_left(data, key)
+                    expected = (index if index < len(data)
+                                and data[index] == key else None)
+                    self.assertEqual(binary_search.binary_search(typed, key),
+                                     expected)
+                    self.assertEqual(binary_search.binary_search(data, key),
+                                     expected)
+        self.assertEqual(binary_search.binary_search(b'abcd', ord('c')), 2)
+        self.assertEqual(binary_search.binary_search(
+            array.array('f', [0.5, 1.5]), 1.5
+        ), 1)
+        self.assertIsNone(binary_search.binary_search(
+            carray.carray('d', [0.5, math.nan]), math.nan
+        ))
+        with self.assertRaises(TypeError):
+            binary_search.binary_search(carray.carray('i', [1, 2]), 'a')
+
+
+    def test_bisect(self):
+        """Тест совместимости с модулем bisect, включая lo, hi и key."""
+        rng = random.Random(20)
+        data = sorted(rng.choices(range(40), k=60))
+        for sorted_obj in [data, carray.carray('i', data),
+                           carray.carray('d', data)]:
+            for item in [-1, 0, 7, 7.5, 39, 40, 2 ** 70]:
+                for lo, hi in [(0, None), (5, 30), (20, 20), (59, 60)]:
+                    with self.subTest(sorted_obj=type(sorted_obj), item=item,
+                                      lo=lo, hi=hi):
+                        end = len(data) if hi is None else hi
+                        left = bisect.bisect_left(data, item, lo, end)
+                        self.assertEqual(binary_search.bisect_left(
+                            sorted_obj, item, lo, hi
+                        ), left)
+                        self.assertEqual(binary_search.bisect_right(
+                            sorted_obj, item, lo=lo, hi=hi
+                        ), bisect.bisect_right(data, item, lo, end))
+                        found = left < end and data[left] == item
+                        self.assertEqual(binary_search.find(
+                            sorted_obj, item, lo, hi
+                        ), left if found else None)
+
+    def test_bisect_key(self):
+        """Тест поиска по ключу с вызовом key только для проб."""
+        probed = []
+
+        def key(record):
+            probed.append(record)
+            return record[1]
+
+        records = [(str(i), i * 2) for i in range(10_000)]
+        self.assertEqual(binary_search.bisect_left(records, 5000, key=key),
+                         2500)
+        self.assertLessEqual(len(probed), 15)
+        self.assertEqual(binary_search.bisect_right(records, 5000, key=key),
+                         2501)
+        self.assertEqual(binary_search.find(records, 5000, key=key), 2500)
+        self.assertIsNone(binary_search.find(records, 5001, key=key))
+        with self.assertRaises(ValueError):
+            binary_search.bisect_left(records, 1, lo=-1)
+        with self.assertRaises(TypeError):
+            binary_search.bisect_left(records, 1, 0, 10, key)
+
+    def test_index(self):
+        """Тест статического индекса в раскладке Эйтцингера."""
+        rng = random.Random(21)
+        data = sorted(rng.choices(range(500), k=1000))
+        queries = list(range(-5, 505)) + [2.5, -0.5, 1e300, 2 ** 70]
+        for sorted_obj in [data, carray.carray('H', data),
+                           carray.carray('d', data)]:
+            with self.subTest(sorted_obj=type(sorted_obj)):
+                index = binary_search.Index(sorted_obj)
+                self.assertEqual(len(index), len(data))
+                expected_bounds = [bisect.bisect_left(data, query)
+                                   for query in queries]
+                expected = [bound if bound < len(data)
+                            and data[bound] == query else None
+                            for bound, query in zip(expected_bounds, queries)]
+                self.assertEqual([index.lower_bound(query)
+                                  for query in queries], expected_bounds)
+                self.assertEqual([index.find(query) for query in queries],
+                                 expected)
+                self.assertEqual(index.lower_bound_many(queries).tolist(),
+                                 expected_bounds)
+                self.assertEqual(index.find_many(queries).tolist(),
+                                 [-1 if i is None else i for i in expected])
+        self.assertEqual(binary_search.Index(carray.carray('q', data))
+                         .find_many(carray.carray('q', data)).tolist(),
+                         [data.index(item) for item in data])
+        self.assertIsNone(binary_search.Index([]).find(1))
+
+    def test_index_failed(self):
+        """Тест ошибок построения индекса."""
+        with self.assertRaises(ValueError):
+            binary_search.Index([3, 1])
+        with self.assertRaises(ValueError):
+            binary_search.Index([1.0, math.nan])
+        with self.assertRaises(TypeError):
+            binary_search.Index(['a', 'b'])
+        with self.assertRaises(TypeError):
+            binary_search.Index([1, 2]).find('a')
+
+    def test_search_modes(self):
+        """Тест интерполяционного и экспоненциального режимов поиска."""
+        rng = random.Random(22)
+        data = sorted(rng.choices(range(10 ** 6), k=5000))
+        skewed = sorted(int(rng.paretovariate(1.2) * 100)
+                        for _ in range(5000))
+        queries = data[::7] + [-1, 10 ** 7, 2.5, 2 ** 70]
+        for values, typecode in [(data, 'q'), (data, 'L'), (skewed, 'i'),
+                                 (data, 'd')]:
+            sorted_obj = carray.carray(typecode, values)
+            expected = [binary_search.find(values, query)
+                        for query in queries + skewed[::13]]
+            for mode in ['binary', 'interpolation', 'exponential']:
+                with self.subTest(typecode=typecode, mode=mode):
+                    self.assertEqual(
+                        [binary_search.search(sorted_obj, query, mode=mode,
+                                              hint=len(values) // 2)
+                         for query in queries + skewed[::13]], expected
+                    )
+        uniform = carray.carray('q', range(0, 3 * 10 ** 5, 3))
+        _, binary_probes = binary_search.search(uniform, 123456,
+                                                probes=True)
+        _, interpolation_probes = binary_search.search(
+            uniform, 123456, mode='interpolation', probes=True
+        )
+        position, exponential_probes = binary_search.search(
+            uniform, 123456, mode='exponential', hint=41152, probes=True
+        )
+        self.assertEqual(position, 41152)
+        self.assertLessEqual(exponential_probes, 2)
+        self.assertLess(interpolation_probes, binary_probes)
+        with self.assertRaises(ValueError):
+            binary_search.search(uniform, 1, mode='linear')
+        with self.assertRaises(TypeError):
+            binary_search.search([1, 2], 1)
+        with self.assertRaises(TypeError):
+            binary_search.search(uniform, 'a')
+
+    def test_learned_index(self):
+        """Тест кусочно-линейного обучаемого индекса."""
+        rng = random.Random(22)
+        uniform = sorted(rng.choices(range(10 ** 9), k=20000))
+        skewed = sorted(int(rng.paretovariate(1.2) * 1000)
+                        for _ in range(20000))
+        queries = [-1, 2.5, 10 ** 30, 1e300] + rng.choices(range(10 ** 4),
+                                                             k=200)
+        for data in [uniform, skewed, [7] * 100, []]:
+            for epsilon in [1, 16, 64]:
+                with self.subTest(size=len(data), epsilon=epsilon):
+                    index = binary_search.LearnedIndex(data, epsilon)
+                    self.assertEqual(len(index), len(data))
+                    self.assertEqual(index.epsilon, epsilon)
+                    for query in queries + data[::97]:
+                        bound = bisect.bisect_left(data, query)
+                        self.assertEqual(index.lower_bound(query), bound)
+                        self.assertEqual(
+                            index.find(query),
+                            bound if bound < len(data)
+                            and data[bound] == query else None
+                        )
+        index = binary_search.LearnedIndex(carray.carray('Q', uniform), 8)
+        self.assertLess(index.segments, len(uniform) // 100)
+        position, probes = index.find(uniform[12345], probes=True)
+        self.assertEqual(uniform[position], uniform[12345])
+        self.assertLess(probes, math.log2(len(uniform)))
+        floats = binary_search.LearnedIndex(carray.carray('d', skewed))
+        self.assertEqual(floats.lower_bound(skewed[500] + 0.5),
+                         bisect.bisect_right(skewed, skewed[500]))
+
+    def test_learned_index_failed(self):
+        """Тест ошибок построения обучаемого индекса."""
+        with self.assertRaises(ValueError):
+            binary_search.LearnedIndex([3, 1])
+        with self.assertRaises(ValueError):
+            binary_search.LearnedIndex([1, 2], epsilon=0)
+        with self.assertRaises(TypeError):
+            binary_search.LearnedIndex(['a', 'b'])
+        with self.assertRaises(TypeError):
+            binary_search.LearnedIndex([1, 2]).lower_bound('a')
+
+    def test_record_file(self):
+        """Тест поиска по отображённому в память файлу записей."""
+        rng = random.Random(23)
+        keys = sorted(rng.choices(range(-10 ** 12, 10 ** 12), k=3000)
+                      + [7] * 50)
+        queries = keys[::11] + [7, 2.5, -10 ** 30, 10 ** 30] \
+            + rng.choices(range(-10 ** 12, 10 ** 12), k=300)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'records.bin')
+            with open(path, 'wb') as records:
+                for position, key in enumerate(keys):
+                    records.write(struct.pack('>4sqI', b'head', key,
+                                              position))
+            for stride in [0, 1, 64]:
+                with self.subTest(stride=stride), binary_search.RecordFile(
+                    path, 16, key_offset=4, key_type='>q', stride=stride
+                ) as records:
+                    self.assertEqual(len(records), len(keys))
+                    self.assertEqual(records.stride, stride)
+                    for query in queries:
+                        bound = bisect.bisect_left(keys, query)
+                        self.assertEqual(records.lower_bound(query), bound)
+                        self.assertEqual(records.upper_bound(query),
+                                         bisect.bisect_right(keys, query))
+                        self.assertEqual(
+                            records.find(query),
+                            bound if bound < len(keys)
+                            and keys[bound] == query else None
+                        )
+                    position = records.find(keys[1234])
+                    self.assertEqual(struct.unpack('>4sqI',
+                                                   records[position])[1],
+                                     keys[1234])
+            with binary_search.RecordFile(path, 16) as records:
+                self.assertGreater(records.__sizeof__(), 0)
+            with self.assertRaises(ValueError):
+                records.find(7)
+
+    def test_record_file_threads(self):
+        """Тест закрытия файла записей во время поиска в другом потоке."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'records.bin')
+            with open(path, 'wb') as records:
+                records.write(b''.join(struct.pack('q', key)
+                                       for key in range(1 << 16)))
+            records = binary_search.RecordFile(path, 8, stride=16)
+            started = threading.Event()
+
+            def search():
+                count = 0
+                while True:
+                    try:
+                        records.lower_bound(count % (1 << 16))
+                    except ValueError:
+                        return count
+                    count += 1
+                    started.set()
+
+            with concurrent.futures.ThreadPoolExecutor(1) as executor:
+                future = executor.submit(search)
+                started.wait()
+                records.close()
+                self.assertGreater(future.result(), 0)
+            with self.assertRaises(ValueError):
+                records.upper_bound(0)
+
+    def test_record_file_failed(self):
+        """Тест ошибок открытия файла записей."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'records.bin')
+            with open(path, 'wb') as records:
+                records.write(bytes(20))
+            with self.assertRaises(ValueError):
+                binary_search.RecordFile(path, 16)
+            with self.assertRaises(ValueError):
+                binary_search.RecordFile(path, 10, key_offset=4)
+            with self.assertRaises(ValueError):
+                binary_search.RecordFile(path, 10, key_type='s')
+            with self.assertRaises(ValueError):
+                binary_search.RecordFile(path, 10, stride=-1)
+            with self.assertRaises(TypeError):
+                binary_search.RecordFile(path, 10).find('a')
+            with self.assertRaises(IndexError):
+                binary_search.RecordFile(path, 10)[2]
+            with self.assertRaises(FileNotFoundError):
+                binary_search.RecordFile(os.path.join(directory, 'no'), 8)
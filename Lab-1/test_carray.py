@@ -1,13 +1,25 @@
 """Тесты для модуля carray."""
 import unittest
 import array
+import bisect
+import collections
+import concurrent.futures
+import copy
+import io
+import itertools
+import math
+import operator
+import os
+import pickle
+import random
+import tempfile
 import time
 
 import carray
 
 
 TEST_INIT_ERROR = [
-    ('f', [], ValueError),
+    ('x', [], ValueError),
     ('int', [], TypeError),
     (0, [], TypeError),
     ('d', 'test', TypeError),
@@ -66,8 +78,38 @@ TEST_SET_VALUE_ERROR = [
     ('i', [1], 1.9, array.array('i', [1])),
     ('i', [1], 'i', array.array('i', [1])),
     ('i', [2], 'test', array.array('i', [2])),
+    ('B', [2], -1.0, array.array('B', [2])),
+    ('f', [2.0], 'test', array.array('f', [2.0])),
+    ('?', [True], 'test', array.array('b', [1]))
+]
+
+
+TEST_SET_OVERFLOW = [
     ('i', [2], 999999999999999999999999999999, array.array('i', [2])),
-    ('i', [1], -999999999999999999999999999999, array.array('i', [1]))
+    ('i', [1], -999999999999999999999999999999, array.array('i', [1])),
+    ('i', [1], 2 ** 31, array.array('i', [1])),
+    ('b', [1], 128, array.array('b', [1])),
+    ('B', [1], -1, array.array('B', [1])),
+    ('H', [1], 2 ** 16, array.array('H', [1])),
+    ('Q', [1], 2 ** 64, array.array('Q', [1])),
+    ('f', [1.0], 1e39, array.array('f', [1.0])),
+    ('?', [False], 2, array.array('b', [0]))
+]
+
+
+TEST_TYPES = [
+    ('b', -2 ** 7, 2 ** 7 - 1),
+    ('B', 0, 2 ** 8 - 1),
+    ('h', -2 ** 15, 2 ** 15 - 1),
+    ('H', 0, 2 ** 16 - 1),
+    ('i', -2 ** 31, 2 ** 31 - 1),
+    ('I', 0, 2 ** 32 - 1),
+    ('l', -2 ** 63, 2 ** 63 - 1),
+    ('L', 0, 2 ** 64 - 1),
+    ('q', -2 ** 63, 2 ** 63 - 1),
+    ('Q', 0, 2 ** 64 - 1),
+    ('f', -3.4028234663852886e38, 3.4028234663852886e38),
+    ('d', -1.7976931348623157e308, 1.7976931348623157e308)
 ]
 
 
@@ -165,6 +207,166 @@ TEST_EQ = [
 ]
 
 
+TEST_BUFFER = [
+    ('d', [], 'd'),
+    ('d', [1.0, -2.5, 3.0], 'd'),
+    ('i', [], 'i'),
+    ('i', [1, -2, 3], 'i'),
+    ('H', [], 'H'),
+    ('H', [1, 65535, 3], 'H'),
+    ('f', [], 'f'),
+    ('f', [1.0, -2.5, 3.0], 'f')
+]
+
+
+TEST_EXTEND = [
+    ('d', [], [1.0, 2.0], array.array('d', [1.0, 2.0])),
+    ('d', [1.0], (2, 3.5), array.array('d', [1.0, 2.0, 3.5])),
+    ('d', [1.0], array.array('d', [2.0, 3.0]),
+     array.array('d', [1.0, 2.0, 3.0])),
+    ('d', [1.0], array.array('l', [2, 3]), array.array('d', [1.0, 2.0, 3.0])),
+    ('d', [1.0], (x / 2 for x in range(3)),
+     array.array('d', [1.0, 0.0, 0.5, 1.0])),
+    ('d', [1.0], [], array.array('d', [1.0])),
+    ('i', [], [1, 2], array.array('l', [1, 2])),
+    ('i', [1], (2, -3), array.array('l', [1, 2, -3])),
+    ('i', [1], array.array('l', [2, 3]), array.array('l', [1, 2, 3])),
+    ('i', [1], array.array('q', [2, 3]), array.array('l', [1, 2, 3])),
+    ('i', [1], array.array('h', [2, 3]), array.array('l', [1, 2, 3])),
+    ('i', [1], range(2, 5), array.array('l', [1, 2, 3, 4])),
+    ('i', [1], carray.carray('i', [7]), array.array('l', [1, 7])),
+    ('i', [1], [], array.array('l', [1]))
+]
+
+
+TEST_EXTEND_ERROR = [
+    ('d', [1.0], [2.0, 'test'], TypeError),
+    ('d', [1.0], 5, TypeError),
+    ('i', [1], [2, 3.5], TypeError),
+    ('i', [1], array.array('d', [2.0]), TypeError),
+    ('i', [1], [2, 999999999999999999999999999999], OverflowError),
+    ('H', [1], array.array('h', [2, -3]), OverflowError),
+    ('i', [1], None, TypeError)
+]
+
+
+TEST_REDUCE = [
+    ('d', [1.0], 1.0, 1.0, 1.0, 0, 0),
+    ('d', [2.0, -1.5, 4.0, -1.5], 3.0, -1.5, 4.0, 1, 2),
+    ('d', [0.1] * 10, 1.0, 0.1, 0.1, 0, 0),
+    ('d', [float(i % 7) for i in range(100_000)],
+     sum(float(i % 7) for i in range(100_000)), 0.0, 6.0, 0, 6),
+    ('i', [1], 1, 1, 1, 0, 0),
+    ('i', [2, -1, 4, -1, 4], 8, -1, 4, 1, 2),
+    ('q', [2 ** 62, 2 ** 62, 2 ** 62], 3 * 2 ** 62, 2 ** 62, 2 ** 62, 0, 0),
+    ('q', [-2 ** 63, -2 ** 63, 2 ** 63 - 1],
+     -2 ** 63 - 1, -2 ** 63, 2 ** 63 - 1, 0, 2),
+    ('i', [i % 7 for i in range(100_000)],
+     sum(i % 7 for i in range(100_000)), 0, 6, 0, 6),
+    ('Q', [2 ** 64 - 1, 2 ** 64 - 1, 1], 2 ** 65 - 1, 1, 2 ** 64 - 1, 2, 0),
+    ('b', [-128, 127, -128], -129, -128, 127, 0, 1),
+    ('B', [255] * 100_000, 255 * 100_000, 255, 255, 0, 0),
+    ('f', [0.5, -1.5, 2.25], 1.25, -1.5, 2.25, 1, 2),
+    ('?', [True, False, True], 2, False, True, 1, 0)
+]
+
+
+TEST_SORT = [
+    ('i', []),
+    ('i', [1]),
+    ('i', [3, -1, 2, -1]),
+    ('b', [random.randint(-128, 127) for _ in range(1000)]),
+    ('H', [random.randint(0, 2 ** 16 - 1) for _ in range(1000)]),
+    ('q', [random.randint(-2 ** 63, 2 ** 63 - 1) for _ in range(100_000)]),
+    ('Q', [random.randint(0, 2 ** 64 - 1) for _ in range(1000)]),
+    ('?', [True, False, True, False]),
+    ('d', [2.5, -1.0, 0.0, -0.0, float('inf')]),
+    ('f', [random.uniform(-1e3, 1e3) for _ in range(1000)]),
+    ('d', [random.random() for _ in range(100_000)]),
+    ('d', [1.0] * 1000),
+    ('d', [float(i) for i in range(1000, 0, -1)])
+]
+
+
+TEST_ARITHMETIC = [
+    ('i', [7, -7, 5], [2, 2, -3]),
+    ('i', [7, -7, 5], 3),
+    ('q', [2 ** 40, -3, 7], [-7, 3, 5]),
+    ('d', [7.5, -7.5, 0.25], [2.0, 2.0, -0.5]),
+    ('d', [7.5, -7.5, 0.25], 1.5),
+    ('f', [2.0, -0.5, 4.0], [0.5, 2.0, -8.0])
+]
+
+
+TEST_OPERATORS = [operator.add, operator.sub, operator.mul,
+                  operator.floordiv, operator.mod]
+
+
+TEST_COUNT = [
+    ('d', [1.0, 2.0, 1.0], 1.0, 2, 0),
+    ('d', [1.0, 2.0, 1.0], 2, 1, 1),
+    ('d', [1.0, 2.0, 1.0], 3.0, 0, None),
+    ('d', [1.0, 2.0, 1.0], float('nan'), 0, None),
+    ('d', [1.0, 2.0, 1.0], '1.0', 0, None),
+    ('d', [9007199254740992.0], 2 ** 53 + 1, 0, None),
+    ('d', [], 1.0, 0, None),
+    ('i', [1, 2, 1], 1, 2, 0),
+    ('i', [1, 2, 1], 2.0, 1, 1),
+    ('i', [1, 2, 1], 2.5, 0, None),
+    ('i', [1, 2, 1], 2 ** 70, 0, None),
+    ('i', [1, 2, 1], '1', 0, None),
+    ('i', [], 1, 0, None),
+    ('i', list(range(100_000)) * 2, 99_999, 2, 99_999)
+]
+
+
+TEST_INDEX_RANGE = [
+    ('i', [1, 2, 1, 2], 2, 2, None, 3),
+    ('i', [1, 2, 1, 2], 1, -2, None, 2),
+    ('i', [1, 2, 1, 2], 2, 0, 1, None),
+    ('i', [1, 2, 1, 2], 1, 10, None, None),
+    ('d', [1.0, 2.0, 1.0], 1.0, 1, 3, 2),
+    ('d', [1.0, 2.0, 1.0], 1.0, 1, -1, None)
+]
+
+
+TEST_SLICE = [
+    slice(None), slice(2, 5), slice(-3, None), slice(5, 2),
+    slice(None, None, 2), slice(1, -1, 3), slice(None, None, -1),
+    slice(-2, 1, -2), slice(100, None), slice(-100, 100)
+]
+
+
+TEST_SET_SLICE = [
+    ('d', [1.0, 2.0, 3.0], slice(0, 2), [5.0, 6.0], [5.0, 6.0, 3.0]),
+    ('d', [1.0, 2.0, 3.0], slice(1, 2), [5.0, 6.0, 7.0],
+     [1.0, 5.0, 6.0, 7.0, 3.0]),
+    ('d', [1.0, 2.0, 3.0], slice(0, 3), [], []),
+    ('d', [1.0, 2.0, 3.0], slice(None, None, 2), (8, 9), [8.0, 2.0, 9.0]),
+    ('i', [1, 2, 3], slice(1, 1), [7, 8], [1, 7, 8, 2, 3]),
+    ('i', [1, 2, 3], slice(3, None), array.array('l', [4, 5]),
+     [1, 2, 3, 4, 5]),
+    ('i', [1, 2, 3, 4], slice(None, None, -2), [0, 0], [1, 0, 3, 0]),
+    ('i', [1, 2, 3, 4], slice(1, None), carray.carray('i', [9]), [1, 9])
+]
+
+
+TEST_DEL_SLICE = [
+    ('i', [1, 2, 3, 4, 5], slice(1, 3), [1, 4, 5]),
+    ('i', [1, 2, 3, 4, 5], slice(None, None, 2), [2, 4]),
+    ('i', [1, 2, 3, 4, 5], slice(None, None, -2), [2, 4]),
+    ('i', [1, 2, 3, 4, 5], slice(3, 0), [1, 2, 3, 4, 5]),
+    ('d', [1.0, 2.0, 3.0], 1, [1.0, 3.0]),
+    ('d', [1.0, 2.0, 3.0], -1, [1.0, 2.0])
+]
+
+
+def shared_sum(name):
+    """Суммирование разделяемого массива в другом процессе."""
+    with carray.attach_shared(name, readonly=True) as shared:
+        return shared.sum()
+
+
 class TestCarray(unittest.TestCase):
     """Тест-кейс модуля carray."""
 
@@ -205,6 +407,48 @@ class TestCarray(unittest.TestCase):
                     for _ in range(len(expected) + 1):
                         next(test_array)
 
+    def test_iter_nested(self):
+        """Тест независимости вложенных итераторов."""
+        for typecode, data, expected in TEST_ITER:
+            with self.subTest(typecode=typecode, data=data):
+                test_array = carray.carray(typecode, data)
+                pairs = [(a, b) for a in test_array for b in test_array]
+                self.assertEqual(pairs, [(a, b) for a in expected
+                                         for b in expected])
+
+    def test_iter_length_hint(self):
+        """Тест метода __length_hint__ итератора."""
+        test_array = carray.carray('i', [1, 2, 3])
+        first, second = iter(test_array), iter(test_array)
+        self.assertEqual(first.__length_hint__(), 3)
+        next(first)
+        self.assertEqual(first.__length_hint__(), 2)
+        self.assertEqual(second.__length_hint__(), 3)
+        self.assertEqual(list(first), [2, 3])
+        self.assertEqual(first.__length_hint__(), 0)
+        self.assertEqual(list(second), [1, 2, 3])
+
+    def test_iter_shrink(self):
+        """Тест итерации по массиву, уменьшающемуся во время обхода."""
+        test_array = carray.carray('i', [1, 2, 3, 4])
+        items = []
+        for item in test_array:
+            items.append(item)
+            test_array.pop()
+        self.assertEqual(items, [1, 2])
+
+    def test_tolist(self):
+        """Тест методов tolist и преобразования в tuple."""
+        for typecode, data, expected in TEST_ITER + TEST_REVERSED[::4]:
+            with self.subTest(typecode=typecode, data=data):
+                test_array = carray.carray(typecode, data)
+                self.assertEqual(test_array.tolist(), list(expected))
+                self.assertEqual(tuple(test_array), tuple(expected))
+                for item in test_array.tolist():
+                    self.assertIsInstance(
+                        item, float if typecode == 'd' else int
+                    )
+
     def test_getitem(self):
         """Тест индексации."""
         for typecode, data, array_len in TEST_GETITEM:
@@ -326,6 +570,63 @@ class TestCarray(unittest.TestCase):
                         self.assertTrue(isinstance(array_item, int))
                     self.assertEqual(array_item, expected_item)
 
+    def test_overflow_failed(self):
+        """Тест исключения OverflowError для __setitem__, append и insert."""
+        for typecode, data, value, expected in TEST_SET_OVERFLOW:
+            test_array = carray.carray(typecode, data)
+            with self.subTest(typecode=typecode, value=value):
+                with self.assertRaises(OverflowError):
+                    test_array[0] = value
+                with self.assertRaises(OverflowError):
+                    test_array.append(value)
+                with self.assertRaises(OverflowError):
+                    test_array.insert(0, value)
+                self.assertEqual(test_array, expected)
+
+    def test_types(self):
+        """Тест граничных значений и размера элемента для всех типов."""
+        for typecode, minimum, maximum in TEST_TYPES:
+            with self.subTest(typecode=typecode):
+                test_array = carray.carray(typecode, [minimum, 0, maximum])
+                self.assertEqual(test_array, [minimum, 0, maximum])
+                with memoryview(test_array) as view:
+                    self.assertEqual(view.format, typecode)
+                    self.assertEqual(view.itemsize,
+                                     array.array(typecode).itemsize)
+                self.assertEqual(
+                    test_array.tobytes(),
+                    array.array(typecode, [minimum, 0, maximum]).tobytes()
+                )
+
+    def test_bool(self):
+        """Тест массива логических значений."""
+        test_array = carray.carray('?', [True, 0, 1, False])
+        self.assertEqual(test_array.tolist(), [True, False, True, False])
+        self.assertIs(test_array[0], True)
+        self.assertIs(test_array.pop(), False)
+        self.assertEqual(memoryview(test_array).itemsize, 1)
+
+    def test_float32(self):
+        """Тест округления и поиска в массиве float."""
+        test_array = carray.carray('f', [0.1, 0.5, float('inf')])
+        self.assertNotEqual(test_array[0], 0.1)
+        self.assertEqual(test_array.count(0.5), 1)
+        self.assertEqual(test_array.count(0.1), 0)
+        self.assertEqual(test_array.max(), float('inf'))
+
+    def test_sizeof(self):
+        """Тест реального размера массива в памяти."""
+        empty = carray.carray('H').__sizeof__()
+        for typecode in ['b', 'H', 'f', 'q']:
+            with self.subTest(typecode=typecode):
+                test_array = carray.carray(typecode, [1] * 1000)
+                itemsize = array.array(typecode).itemsize
+                self.assertGreaterEqual(test_array.__sizeof__(),
+                                        empty + 1000 * itemsize)
+                self.assertLess(test_array.__sizeof__(),
+                                empty + 3000 * itemsize)
+                self.assertEqual(test_array[10:20].__sizeof__(), empty)
+
     def test_remove(self):
         """Тест метода remove."""
         for typecode, data, item, expected in TEST_REMOVE:
@@ -395,6 +696,752 @@ class TestCarray(unittest.TestCase):
                 my_array = carray.carray(typecode, data)
                 self.assertEqual(my_array, expected)
 
+    def test_buffer(self):
+        """Тест экспорта буфера через memoryview."""
+        for typecode, data, expected_format in TEST_BUFFER:
+            with self.subTest(typecode=typecode, data=data):
+                test_array = carray.carray(typecode, data)
+                with memoryview(test_array) as view:
+                    self.assertEqual(view.format, expected_format)
+                    self.assertEqual(view.itemsize,
+                                     array.array(expected_format).itemsize)
+                    self.assertEqual(view.shape, (len(data),))
+                    self.assertEqual(view.strides, (view.itemsize,))
+                    self.assertFalse(view.readonly)
+                    self.assertTrue(view.c_contiguous)
+                    self.assertEqual(view.tolist(), data)
+                    self.assertEqual(
+                        view.tobytes(),
+                        array.array(expected_format, data).tobytes()
+                    )
+
+    def test_buffer_zero_copy(self):
+        """Тест общей памяти carray и memoryview."""
+        for typecode, data, _ in TEST_BUFFER[1::2]:
+            with self.subTest(typecode=typecode, data=data):
+                test_array = carray.carray(typecode, data)
+                with memoryview(test_array) as view:
+                    view[0] = 42
+                    self.assertEqual(test_array[0], 42)
+                    test_array[1] = 7
+                    self.assertEqual(view[1], 7)
+
+    def test_buffer_resize_failed(self):
+        """Тест запрета изменения размера при экспорте буфера."""
+        for typecode, data, _ in TEST_BUFFER[1::2]:
+            with self.subTest(typecode=typecode, data=data):
+                test_array = carray.carray(typecode, data)
+                view = memoryview(test_array)
+                with self.assertRaises(BufferError):
+                    test_array.append(1)
+                with self.assertRaises(BufferError):
+                    test_array.insert(0, 1)
+                with self.assertRaises(BufferError):
+                    test_array.pop()
+                with self.assertRaises(BufferError):
+                    test_array.remove(data[0])
+                self.assertEqual(view.tolist(), data)
+                view.release()
+                test_array.append(1)
+                self.assertEqual(len(test_array), len(data) + 1)
+
+    def test_extend(self):
+        """Тест метода extend."""
+        for typecode, data, other, expected in TEST_EXTEND:
+            with self.subTest(typecode=typecode, data=data, other=other):
+                test_array = carray.carray(typecode, data)
+                test_array.extend(other)
+                self.assertEqual(test_array, expected)
+
+    def test_extend_self(self):
+        """Тест расширения массива самим собой."""
+        for typecode, data in [('d', [1.0, 2.0]), ('i', [1, 2]), ('i', [])]:
+            with self.subTest(typecode=typecode, data=data):
+                test_array = carray.carray(typecode, data)
+                test_array.extend(test_array)
+                self.assertEqual(test_array, data * 2)
+
+    def test_extend_failed(self):
+        """Тест исключений в extend без изменения массива."""
+        for typecode, data, other, exception in TEST_EXTEND_ERROR:
+            with self.subTest(typecode=typecode, data=data, other=other):
+                test_array = carray.carray(typecode, data)
+                with self.assertRaises(exception):
+                    test_array.extend(other)
+                self.assertEqual(test_array, data)
+
+    def test_bytes(self):
+        """Тест методов frombytes и tobytes."""
+        for typecode, data, expected_format in TEST_BUFFER:
+            with self.subTest(typecode=typecode, data=data):
+                raw = array.array(expected_format, data).tobytes()
+                test_array = carray.carray(typecode, data)
+                self.assertEqual(test_array.tobytes(), raw)
+                test_array.frombytes(raw)
+                self.assertEqual(test_array, data * 2)
+                with self.assertRaises(ValueError):
+                    test_array.frombytes(b'\x00' * 3)
+                self.assertEqual(test_array, data * 2)
+
+    def test_file(self):
+        """Тест методов tofile и fromfile."""
+        for typecode, data, _ in TEST_BUFFER:
+            with self.subTest(typecode=typecode, data=data):
+                file = io.BytesIO()
+                carray.carray(typecode, data).tofile(file)
+                file.seek(0)
+                test_array = carray.carray(typecode)
+                test_array.fromfile(file, len(data))
+                self.assertEqual(test_array, data)
+                with self.assertRaises(EOFError):
+                    test_array.fromfile(file, 1)
+                self.assertEqual(test_array, data)
+
+    def test_file_large(self):
+        """Тест записи в файл массива больше одного блока."""
+        test_array = carray.carray('i', range(100_000))
+        file = io.BytesIO()
+        test_array.tofile(file)
+        file.seek(0)
+        loaded = carray.carray('i')
+        loaded.fromfile(file, 100_000)
+        self.assertEqual(loaded.tobytes(), test_array.tobytes())
+
+    def test_reduce(self):
+        """Тест методов sum, mean, min, max, argmin и argmax."""
+        for (typecode, data, expected_sum, expected_min, expected_max,
+             expected_argmin, expected_argmax) in TEST_REDUCE:
+            with self.subTest(typecode=typecode, data=data[:10]):
+                test_array = carray.carray(typecode, data)
+                if typecode == 'd':
+                    self.assertAlmostEqual(test_array.sum(), expected_sum)
+                    self.assertAlmostEqual(test_array.mean(),
+                                           expected_sum / len(data))
+                else:
+                    self.assertEqual(test_array.sum(), expected_sum)
+                    self.assertEqual(test_array.mean(),
+                                     expected_sum / len(data))
+                self.assertEqual(test_array.min(), expected_min)
+                self.assertEqual(test_array.max(), expected_max)
+                self.assertEqual(test_array.argmin(), expected_argmin)
+                self.assertEqual(test_array.argmax(), expected_argmax)
+
+    def test_reduce_empty(self):
+        """Тест редукций пустого массива."""
+        for typecode in ['d', 'i']:
+            with self.subTest(typecode=typecode):
+                test_array = carray.carray(typecode)
+                self.assertEqual(test_array.sum(), 0)
+                for method in [test_array.mean, test_array.min,
+                               test_array.max, test_array.argmin,
+                               test_array.argmax]:
+                    with self.assertRaises(ValueError):
+                        method()
+
+    def test_reduce_nan(self):
+        """Тест распространения NaN в min и max."""
+        test_array = carray.carray('d', [2.0, float('nan'), -1.0])
+        self.assertTrue(math.isnan(test_array.min()))
+        self.assertTrue(math.isnan(test_array.max()))
+        self.assertEqual(test_array.argmin(), 1)
+        self.assertEqual(test_array.argmax(), 1)
+
+    def test_count(self):
+        """Тест методов count, index и оператора in."""
+        for typecode, data, item, expected_count, expected_index \
+                in TEST_COUNT:
+            with self.subTest(typecode=typecode, data=data[:10], item=item):
+                test_array = carray.carray(typecode, data)
+                self.assertEqual(test_array.count(item), expected_count)
+                self.assertEqual(item in test_array, expected_count > 0)
+                if expected_index is None:
+                    with self.assertRaises(ValueError):
+                        test_array.index(item)
+                else:
+                    self.assertEqual(test_array.index(item), expected_index)
+
+    def test_index_range(self):
+        """Тест метода index с границами поиска."""
+        for typecode, data, item, start, stop, expected in TEST_INDEX_RANGE:
+            with self.subTest(typecode=typecode, data=data, item=item,
+                              start=start, stop=stop):
+                test_array = carray.carray(typecode, data)
+                args = (start,) if stop is None else (start, stop)
+                if expected is None:
+                    with self.assertRaises(ValueError):
+                        test_array.index(item, *args)
+                else:
+                    self.assertEqual(test_array.index(item, *args), expected)
+
+    def test_slice(self):
+        """Тест получения срезов."""
+        for typecode, data in [('d', [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]),
+                               ('i', [1, 2, 3, 4, 5, 6, 7])]:
+            test_array = carray.carray(typecode, data)
+            for index in TEST_SLICE:
+                with self.subTest(typecode=typecode, index=index):
+                    self.assertEqual(test_array[index], data[index])
+
+    def test_slice_view(self):
+        """Тест среза как представления над памятью родителя."""
+        test_array = carray.carray('i', [1, 2, 3, 4, 5])
+        view = test_array[1:4]
+        view[0] = 42
+        test_array[3] = 7
+        self.assertEqual(test_array, [1, 42, 3, 7, 5])
+        self.assertEqual(view, [42, 3, 7])
+        self.assertEqual(view[1:], [3, 7])
+        self.assertEqual(view.sum(), 52)
+        with self.assertRaises(BufferError):
+            test_array.append(6)
+        with self.assertRaises(BufferError):
+            view.append(6)
+        del test_array
+        self.assertEqual(view, [42, 3, 7])
+
+    def test_slice_view_release(self):
+        """Тест снятия блокировки размера после удаления представления."""
+        test_array = carray.carray('d', [1.0, 2.0, 3.0])
+        view = test_array[:2]
+        del view
+        test_array.append(4.0)
+        self.assertEqual(test_array, [1.0, 2.0, 3.0, 4.0])
+
+    def test_set_slice(self):
+        """Тест присваивания срезам."""
+        for typecode, data, index, value, expected in TEST_SET_SLICE:
+            with self.subTest(typecode=typecode, data=data, index=index,
+                              value=value):
+                test_array = carray.carray(typecode, data)
+                test_array[index] = value
+                self.assertEqual(test_array, expected)
+
+    def test_set_slice_self(self):
+        """Тест присваивания срезу самого массива."""
+        test_array = carray.carray('i', [1, 2, 3])
+        test_array[1:2] = test_array
+        self.assertEqual(test_array, [1, 1, 2, 3, 3])
+        test_array[::2] = test_array[1:4]
+        self.assertEqual(test_array, [1, 1, 2, 3, 3])
+
+    def test_set_slice_overlap(self):
+        """Тест присваивания срезу перекрывающегося представления."""
+        test_array = carray.carray('l', [1, 2, 3, 4, 5, 6])
+        test_array[::2] = test_array[0:3]
+        self.assertEqual(test_array, [1, 2, 2, 4, 3, 6])
+        test_array = carray.carray('l', [1, 2, 3, 4, 5, 6])
+        test_array[1::2] = test_array[0:3]
+        self.assertEqual(test_array, [1, 1, 3, 2, 5, 3])
+        test_array = carray.carray('l', [1, 2, 3, 4, 5, 6])
+        test_array[::-2] = memoryview(test_array)[3:]
+        self.assertEqual(test_array, [1, 6, 3, 5, 5, 4])
+
+    def test_set_slice_failed(self):
+        """Тест исключений при присваивании срезам."""
+        test_array = carray.carray('i', [1, 2, 3, 4])
+        with self.assertRaises(ValueError):
+            test_array[::2] = [1, 2, 3]
+        with self.assertRaises(TypeError):
+            test_array[1:2] = [1.5]
+        with self.assertRaises(TypeError):
+            test_array['a'] = 1
+        self.assertEqual(test_array, [1, 2, 3, 4])
+
+    def test_del_slice(self):
+        """Тест удаления элементов и срезов."""
+        for typecode, data, index, expected in TEST_DEL_SLICE:
+            with self.subTest(typecode=typecode, data=data, index=index):
+                test_array = carray.carray(typecode, data)
+                del test_array[index]
+                self.assertEqual(test_array, expected)
+
+    def test_mmap(self):
+        """Тест отображения файла без заголовка в память."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'data.bin')
+            with open(path, 'wb') as file:
+                array.array('H', [1, 2, 3]).tofile(file)
+            with carray.open(path, 'H', 'r+') as test_array:
+                self.assertEqual(test_array, [1, 2, 3])
+                self.assertEqual(test_array.__sizeof__(),
+                                 carray.carray('H').__sizeof__())
+                test_array[0] = 7
+                test_array.extend([i % 1000 for i in range(100_000)])
+                test_array.append(65535)
+                test_array.flush()
+                self.assertEqual(os.path.getsize(path), 2 * 100_004)
+                del test_array[1:]
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(), b'\x07\x00')
+
+    def test_mmap_header(self):
+        """Тест файла с заголовком, хранящим тип и длину."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'data.carray')
+            test_array = carray.open(path, 'f', 'w+', header=True)
+            test_array.extend([1.5, -2.0])
+            test_array.append(3.25)
+            test_array.close()
+            self.assertEqual(len(test_array), 0)
+            with carray.open(path, mode='r+', header=True) as test_array:
+                self.assertEqual(test_array, [1.5, -2.0, 3.25])
+            with carray.open(path, header=True) as test_array:
+                self.assertEqual(test_array, [1.5, -2.0, 3.25])
+                self.assertEqual(memoryview(test_array).format, 'f')
+            with self.assertRaises(ValueError):
+                carray.open(path, 'd', header=True)
+            with self.assertRaises(ValueError):
+                carray.open(path, 'd')
+
+    def test_mmap_readonly(self):
+        """Тест запрета изменения файла, открытого для чтения."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'data.bin')
+            with carray.open(path, 'q', 'w+') as test_array:
+                test_array.extend([5, 6, 7])
+            test_array = carray.open(path, 'q')
+            self.assertEqual(test_array.sum(), 18)
+            self.assertEqual(test_array[1:], [6, 7])
+            with self.assertRaises(TypeError):
+                test_array[0] = 1
+            with self.assertRaises(TypeError):
+                test_array.append(1)
+            with self.assertRaises(TypeError):
+                test_array[1:][0] = 1
+            with self.assertRaises(TypeError):
+                memoryview(test_array).cast('B')[0] = 1
+            self.assertTrue(memoryview(test_array).readonly)
+            test_array.close()
+
+    def test_shared(self):
+        """Тест массива в именованной разделяемой памяти."""
+        name = f'carray_test_{os.getpid()}'
+        owner = carray.create_shared(name, 'q', range(1000))
+        try:
+            with self.assertRaises(FileExistsError):
+                carray.create_shared(name, 'q')
+            with carray.attach_shared(name) as attached:
+                self.assertEqual(attached, list(range(1000)))
+                attached[0] = 1000
+                self.assertEqual(owner[0], 1000)
+                with self.assertRaises(BufferError):
+                    attached.append(1)
+                with self.assertRaises(BufferError):
+                    owner.pop()
+            with concurrent.futures.ProcessPoolExecutor(2) as executor:
+                self.assertEqual(list(executor.map(shared_sum, [name] * 2)),
+                                 [sum(range(1000)) + 1000] * 2)
+            with self.assertRaises(TypeError):
+                carray.attach_shared(name, readonly=True)[0] = 1
+        finally:
+            owner.close()
+            carray.unlink_shared(name)
+        with self.assertRaises(FileNotFoundError):
+            carray.attach_shared(name)
+        with self.assertRaises(FileNotFoundError):
+            carray.unlink_shared(name)
+        with self.assertRaises(ValueError):
+            carray.create_shared(name, 'x')
+
+    def test_mmap_failed(self):
+        """Тест исключений при открытии файла."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'data.bin')
+            with self.assertRaises(OSError):
+                carray.open(path, 'i')
+            with open(path, 'wb') as file:
+                file.write(b'\x00' * 5)
+            with self.assertRaises(ValueError):
+                carray.open(path, 'i')
+            with self.assertRaises(ValueError):
+                carray.open(path, 'i', 'x')
+            with self.assertRaises(TypeError):
+                carray.open(path)
+            with self.assertRaises(ValueError):
+                carray.open(path, header=True)
+            test_array = carray.open(path, 'b', 'r+')
+            view = memoryview(test_array)
+            with self.assertRaises(BufferError):
+                test_array.close()
+            view.release()
+            test_array.close()
+
+    def test_pickle(self):
+        """Тест сериализации массива всеми протоколами pickle."""
+        for typecode, data, _ in TEST_BUFFER:
+            for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                with self.subTest(typecode=typecode, protocol=protocol):
+                    test_array = carray.carray(typecode, data)
+                    loaded = pickle.loads(pickle.dumps(test_array, protocol))
+                    self.assertEqual(loaded, data)
+                    self.assertEqual(memoryview(loaded).format, typecode)
+
+    def test_pickle_out_of_band(self):
+        """Тест передачи данных вне потока в протоколе 5."""
+        test_array = carray.carray('d', [float(i) for i in range(10_000)])
+        buffers = []
+        dumped = pickle.dumps(test_array, 5, buffer_callback=buffers.append)
+        self.assertLess(len(dumped), 100)
+        self.assertEqual(len(buffers), 1)
+        self.assertEqual(buffers[0].raw().nbytes, 80_000)
+        loaded = pickle.loads(dumped, buffers=buffers)
+        self.assertEqual(loaded.tobytes(), test_array.tobytes())
+
+    def test_copy(self):
+        """Тест методов __copy__ и __deepcopy__."""
+        test_array = carray.carray('h', [1, -2, 3])
+        for copied in [copy.copy(test_array), copy.deepcopy(test_array),
+                       copy.copy(test_array[1:])]:
+            with self.subTest(copied=copied):
+                copied[0] = 9
+                self.assertEqual(test_array, [1, -2, 3])
+                copied.append(4)
+                self.assertEqual(memoryview(copied).format, 'h')
+
+    def test_sort(self):
+        """Тест метода sort."""
+        for typecode, data in TEST_SORT:
+            for reverse in [False, True]:
+                with self.subTest(typecode=typecode, data=data[:10],
+                                  reverse=reverse):
+                    test_array = carray.carray(typecode, data)
+                    expected = sorted(test_array.tolist(), reverse=reverse)
+                    test_array.sort(reverse=reverse)
+                    self.assertEqual(test_array.tolist(), expected)
+
+    def test_sort_nan(self):
+        """Тест размещения NaN в конце отсортированного массива."""
+        test_array = carray.carray('d', [2.0, float('nan'), -1.0,
+                                         float('nan'), 0.5])
+        test_array.sort()
+        self.assertEqual(test_array[:3], [-1.0, 0.5, 2.0])
+        self.assertTrue(all(math.isnan(x) for x in test_array[3:]))
+        self.assertEqual(test_array.searchsorted(float('nan')), 3)
+        self.assertEqual(test_array.searchsorted(3.0), 3)
+
+    def test_sort_view(self):
+        """Тест сортировки среза-представления и запрета для чтения."""
+        test_array = carray.carray('i', [5, 4, 3, 2, 1])
+        test_array[1:4].sort()
+        self.assertEqual(test_array, [5, 2, 3, 4, 1])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'data.bin')
+            with open(path, 'wb') as file:
+                test_array.tofile(file)
+            with carray.open(path, 'i') as mapped:
+                with self.assertRaises(TypeError):
+                    mapped.sort()
+
+    def test_searchsorted(self):
+        """Тест метода searchsorted для одного значения и пакета."""
+        data = sorted(random.randint(-50, 50) for _ in range(1000))
+        test_array = carray.carray('h', data)
+        values = list(range(-60, 61))
+        for side, search in [('left', bisect.bisect_left),
+                             ('right', bisect.bisect_right)]:
+            with self.subTest(side=side):
+                expected = [search(data, value) for value in values]
+                self.assertEqual(
+                    [test_array.searchsorted(value, side=side)
+                     for value in values], expected
+                )
+                positions = test_array.searchsorted(
+                    carray.carray('h', values), side
+                )
+                self.assertEqual(memoryview(positions).format, 'q')
+                self.assertEqual(positions, expected)
+                self.assertEqual(test_array.searchsorted(values, side),
+                                 expected)
+
+    def test_searchsorted_failed(self):
+        """Тест исключений в searchsorted."""
+        test_array = carray.carray('B', [1, 2, 3])
+        with self.assertRaises(ValueError):
+            test_array.searchsorted(1, side='middle')
+        with self.assertRaises(TypeError):
+            test_array.searchsorted(['a'])
+
+    def test_searchsorted_out_of_range(self):
+        """Тест searchsorted для значений вне диапазона типа."""
+        data = [1, 2, 2, 3]
+        test_array = carray.carray('B', data)
+        for value in [256, -1, 2 ** 70, -2 ** 70, 1.5, 2.0, 1e300,
+                      -math.inf, math.inf]:
+            for side, search in [('left', bisect.bisect_left),
+                                 ('right', bisect.bisect_right)]:
+                with self.subTest(value=value, side=side):
+                    self.assertEqual(test_array.searchsorted(value, side),
+                                     search(data, value))
+        values = [1.5, -1, 2, 256, -math.inf, 2.0]
+        for side, search in [('left', bisect.bisect_left),
+                             ('right', bisect.bisect_right)]:
+            with self.subTest(values=values, side=side):
+                expected = [search(data, value) for value in values]
+                self.assertEqual(test_array.searchsorted(values, side),
+                                 expected)
+                self.assertEqual(test_array.searchsorted(iter(values), side),
+                                 expected)
+                self.assertEqual(
+                    test_array.searchsorted(array.array('d', values), side),
+                    expected
+                )
+
+    def test_searchsorted_threads(self):
+        """Тест запрета перераспределения во время пакетного поиска."""
+        size = 1 << 17
+        test_array = carray.carray('q', range(size))
+        queries = carray.carray('q', range(0, 1 << 21, 3))
+        failures = 0
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            future = executor.submit(test_array.searchsorted, queries)
+            while not future.done():
+                try:
+                    test_array.reserve(2 * size)
+                    test_array.shrink_to_fit()
+                except BufferError:
+                    failures += 1
+            positions = future.result()
+        self.assertGreater(failures, 0)
+        self.assertEqual(positions, [min(query, size) for query in queries])
+
+    def test_capacity(self):
+        """Тест роста ёмкости при добавлении элементов."""
+        test_array = carray.carray('i')
+        self.assertEqual(test_array.capacity, 0)
+        capacities = set()
+        for i in range(10_000):
+            test_array.append(i)
+            self.assertGreaterEqual(test_array.capacity, len(test_array))
+            capacities.add(test_array.capacity)
+        self.assertLess(len(capacities), 30)
+        self.assertLess(test_array.capacity, 15_000)
+
+    def test_capacity_hysteresis(self):
+        """Тест отсутствия перераспределений около границы ёмкости."""
+        test_array = carray.carray('d', [1.0] * 100)
+        test_array.shrink_to_fit()
+        test_array.append(1.0)
+        capacity = test_array.capacity
+        for _ in range(100):
+            test_array.pop()
+            test_array.pop()
+            self.assertEqual(test_array.capacity, capacity)
+            test_array.append(2.0)
+            test_array.append(2.0)
+            self.assertEqual(test_array.capacity, capacity)
+        del test_array[10:]
+        self.assertLess(test_array.capacity, capacity)
+        self.assertGreaterEqual(test_array.capacity, 10)
+
+    def test_reserve(self):
+        """Тест методов reserve, shrink_to_fit и clear."""
+        test_array = carray.carray('H', [1, 2, 3])
+        test_array.reserve(1000)
+        self.assertEqual(test_array.capacity, 1000)
+        test_array.reserve(10)
+        self.assertEqual(test_array.capacity, 1000)
+        test_array.extend(range(997))
+        self.assertEqual(test_array.capacity, 1000)
+        test_array.clear()
+        self.assertEqual(len(test_array), 0)
+        self.assertEqual(test_array.capacity, 1000)
+        test_array.extend([4, 5])
+        test_array.shrink_to_fit()
+        self.assertEqual(test_array.capacity, 2)
+        self.assertEqual(test_array, [4, 5])
+        test_array.clear(keep_capacity=False)
+        self.assertEqual(test_array.capacity, 0)
+
+    def test_reserve_failed(self):
+        """Тест исключений в методах управления ёмкостью."""
+        test_array = carray.carray('i', [1, 2, 3])
+        with self.assertRaises(ValueError):
+            test_array.reserve(-1)
+        with self.assertRaises(MemoryError):
+            test_array.reserve(2 ** 62)
+        view = test_array[1:]
+        for method in [lambda: view.reserve(10), view.shrink_to_fit,
+                       view.clear]:
+            with self.assertRaises(BufferError):
+                method()
+        with self.assertRaises(BufferError):
+            test_array.clear()
+        with self.assertRaises(AttributeError):
+            test_array.capacity = 10
+        self.assertEqual(test_array, [1, 2, 3])
+
+    def test_arithmetic(self):
+        """Тест поэлементных арифметических операций."""
+        for typecode, data, other in TEST_ARITHMETIC:
+            items = other if isinstance(other, list) else [other] * len(data)
+            for func in TEST_OPERATORS + [operator.truediv]:
+                with self.subTest(typecode=typecode, other=other,
+                                  func=func.__name__):
+                    test_array = carray.carray(typecode, data)
+                    expected = [func(x, y) for x, y in zip(data, items)]
+                    self.assertEqual(func(test_array, other), expected)
+                    self.assertEqual(func(test_array, array.array(
+                        typecode, items)), expected)
+                    self.assertEqual(
+                        func(other, test_array),
+                        [func(y, x) for x, y in zip(data, items)]
+                    )
+                    self.assertEqual(test_array, data)
+
+    def test_arithmetic_types(self):
+        """Тест типа результата и переполнения целых типов."""
+        test_array = carray.carray('B', [200, 100])
+        self.assertEqual(test_array + 100, [44, 200])
+        self.assertEqual(memoryview(test_array * 2).format, 'B')
+        self.assertEqual(memoryview(test_array / 8).format, 'd')
+        self.assertEqual(test_array / 8, [25.0, 12.5])
+        self.assertEqual(memoryview(carray.carray('f', [1.0]) / 2).format,
+                         'f')
+
+    def test_arithmetic_inplace(self):
+        """Тест операций на месте, в том числе для представлений."""
+        test_array = carray.carray('i', [1, 2, 3, 4])
+        same = test_array
+        test_array += 1
+        test_array *= [1, 2, 3, 4]
+        test_array -= carray.carray('i', [1, 1, 1, 1])
+        test_array //= 2
+        test_array %= 5
+        self.assertIs(test_array, same)
+        self.assertEqual(test_array, [0, 2, 0, 4])
+        test_array[1:] += test_array[:-1]
+        self.assertEqual(test_array, [0, 2, 2, 4])
+        with self.assertRaises(TypeError):
+            test_array /= 2
+        float_array = carray.carray('d', [1.0, 2.0])
+        float_array /= 4
+        self.assertEqual(float_array, [0.25, 0.5])
+
+    def test_arithmetic_failed(self):
+        """Тест исключений арифметических операций."""
+        test_array = carray.carray('i', [1, 2, 3])
+        for func, other, exception in [
+            (operator.add, [1, 2], ValueError),
+            (operator.add, 1.5, TypeError),
+            (operator.add, None, TypeError),
+            (operator.mul, 2 ** 40, OverflowError),
+            (operator.floordiv, 0, ZeroDivisionError),
+            (operator.mod, [1, 0, 1], ZeroDivisionError),
+            (operator.truediv, 0, ZeroDivisionError)
+        ]:
+            with self.subTest(func=func.__name__, other=other):
+                with self.assertRaises(exception):
+                    func(test_array, other)
+        with self.assertRaises(TypeError):
+            carray.carray('?', [True]) + 1
+        self.assertEqual(test_array, [1, 2, 3])
+
+    def test_compare_mask(self):
+        """Тест сравнений, возвращающих логические маски."""
+        test_array = carray.carray('d', [1.0, 2.0, float('nan'), 4.0])
+        mask = test_array > 1.5
+        self.assertEqual(memoryview(mask).format, '?')
+        self.assertEqual(mask, [False, True, False, True])
+        self.assertEqual(test_array <= [1.0, 1.0, 1.0, 5.0],
+                         [True, False, False, True])
+        self.assertEqual(2.0 <= test_array, [False, True, False, True])
+        self.assertEqual(test_array >= test_array,
+                         [True, True, False, True])
+        self.assertEqual(carray.carray('i', [1, 2]) < 2, [True, False])
+        self.assertTrue(carray.carray('i', [1, 2]) != [1, 3])
+        self.assertFalse(carray.carray('i', [1, 2]) != [1, 2])
+        self.assertEqual(carray.carray('i', [1, 2]),
+                         carray.carray('i', [1, 2]))
+        self.assertNotEqual(test_array, test_array)
+        with self.assertRaises(TypeError):
+            test_array < None
+
+    def test_compare_mask_scalars(self):
+        """Тест сравнений со скалярами вне типа элементов."""
+        operators = [operator.lt, operator.le, operator.gt, operator.ge]
+        scalars = [2.5, -2.5, 2.0, 0.5, math.nan, math.inf, -math.inf, 300,
+                   -300, 2 ** 64, -1, 10 ** 20, -10 ** 20, 10 ** 400, 1e300]
+        for typecode, data in [('b', [-128, -3, 0, 5, 127]),
+                               ('B', [0, 3, 255]), ('i', [-5, 1, 2, 3]),
+                               ('Q', [0, 1, 2 ** 64 - 1]), ('?', [0, 1]),
+                               ('f', [-math.inf, 0.5, 3.0, math.nan]),
+                               ('d', [-1.5, 0.0, 2.0, math.inf])]:
+            test_array = carray.carray(typecode, data)
+            for op, scalar in itertools.product(operators, scalars):
+                with self.subTest(typecode=typecode, op=op, scalar=scalar):
+                    self.assertEqual(op(test_array, scalar),
+                                     [op(item, scalar) for item in test_array])
+        self.assertEqual(carray.carray('i', [1, 2, 3]) < 2.5,
+                         [True, True, False])
+        self.assertEqual(carray.carray('b', [1, 2]) > 300, [False, False])
+        self.assertEqual(carray.carray('i', [1, 2]) > 10 ** 20,
+                         [False, False])
+
+    def test_compress_take(self):
+        """Тест методов compress и take."""
+        test_array = carray.carray('h', [5, -1, 7, 3])
+        self.assertEqual(test_array.compress(test_array > 2), [5, 7, 3])
+        self.assertEqual(test_array.compress([0, 0, 0, 0]), [])
+        self.assertEqual(test_array.take([3, 0, -1, 0]), [3, 5, 3, 5])
+        self.assertEqual(test_array.take(carray.carray('q', [2])), [7])
+        with self.assertRaises(ValueError):
+            test_array.compress([True])
+        with self.assertRaises(IndexError):
+            test_array.take([4])
+        with self.assertRaises(IndexError):
+            test_array.take([-5])
+
+    def test_repr(self):
+        """Тест строкового представления с сокращением длинных массивов."""
+        self.assertEqual(repr(carray.carray('d', [1.5, float('nan'), 1e16])),
+                         'carray<double>(1.5, nan, 1e+16)')
+        self.assertEqual(str(carray.carray('?', [True, False])),
+                         'carray<bool>(True, False)')
+        self.assertEqual(repr(carray.carray('H')), 'carray<unsigned short>()')
+        self.assertEqual(repr(carray.carray('i', range(1000))),
+                         f'carray<int>({", ".join(map(str, range(1000)))})')
+        self.assertEqual(repr(carray.carray('q', range(100_000))),
+                         'carray<long long>(0, 1, 2, ..., 99997, 99998, 99999)')
+
+    def test_tostring_fromstring(self):
+        """Тест текстовой сериализации с разделителем."""
+        for typecode, values in [('b', [-128, 0, 127]),
+                                 ('Q', [0, 2 ** 64 - 1]),
+                                 ('d', [1.5, -math.inf, 0.1, 1e-300]),
+                                 ('?', [True, False])]:
+            with self.subTest(typecode=typecode):
+                test_array = carray.carray(typecode, values)
+                text = test_array.tostring()
+                self.assertEqual(text, ','.join(map(str, values)))
+                restored = carray.carray(typecode)
+                restored.fromstring(text)
+                self.assertEqual(restored, values)
+        test_array = carray.carray('i', [1])
+        test_array.fromstring(' 2 ;3\n', sep=';')
+        test_array.fromstring('  ')
+        self.assertEqual(test_array.tostring(sep=' | '), '1 | 2 | 3')
+        self.assertEqual(carray.carray('f').tostring(), '')
+
+    def test_fromstring_failed(self):
+        """Тест ошибок разбора текста."""
+        test_array = carray.carray('B', [1])
+        for text, sep, error in [('-1', ',', OverflowError),
+                                 ('256', ',', OverflowError),
+                                 ('2,,3', ',', ValueError),
+                                 ('2,x', ',', ValueError),
+                                 ('1.5', ',', ValueError),
+                                 ('1', '', ValueError)]:
+            with self.subTest(text=text, sep=sep):
+                with self.assertRaises(error):
+                    test_array.fromstring(text, sep=sep)
+                self.assertEqual(test_array, [1])
+        with self.assertRaises(OverflowError):
+            carray.carray('f').fromstring('1e39')
+        with self.assertRaises(ValueError):
+            carray.carray('?').fromstring('yes')
+        with self.assertRaises(BufferError):
+            test_array[:].fromstring('1')
+
     def test_timeout_append(self):
         """Тест времени выполнения метода append."""
         start = time.time()
@@ -404,3 +1451,245 @@ class TestCarray(unittest.TestCase):
                 my_array.append(i)
         end = time.time()
         print(f'\n\033[33mВремя вашего append: {end - start} сек.\033[0m')
+
+
+class TestCdeque(unittest.TestCase):
+    """Тесты для кольцевого буфера cdeque."""
+
+    def test_ends(self):
+        """Тест добавления и удаления с обоих концов."""
+        test_deque = carray.cdeque('H', [2, 3])
+        test_deque.appendleft(1)
+        test_deque.append(4)
+        test_deque.extend([5, 6])
+        test_deque.extendleft([0])
+        self.assertEqual(test_deque.tolist(), [0, 1, 2, 3, 4, 5, 6])
+        self.assertEqual(test_deque.popleft(), 0)
+        self.assertEqual(test_deque.pop(), 6)
+        self.assertEqual(list(test_deque), [1, 2, 3, 4, 5])
+        self.assertEqual((test_deque[0], test_deque[-1]), (1, 5))
+        test_deque[-1] = 9
+        self.assertEqual(test_deque[4], 9)
+        self.assertEqual(len(test_deque), 5)
+        self.assertIsNone(test_deque.maxlen)
+
+    def test_compare_with_deque(self):
+        """Тест совпадения поведения с collections.deque."""
+        for maxlen in [None, 0, 1, 5]:
+            with self.subTest(maxlen=maxlen):
+                test_deque = carray.cdeque('i', maxlen=maxlen)
+                expected = collections.deque(maxlen=maxlen)
+                for i in range(200):
+                    if i % 7 < 3:
+                        test_deque.append(i)
+                        expected.append(i)
+                    elif i % 7 < 5:
+                        test_deque.appendleft(i)
+                        expected.appendleft(i)
+                    elif i % 7 == 5 and expected:
+                        self.assertEqual(test_deque.popleft(),
+                                         expected.popleft())
+                    elif expected:
+                        self.assertEqual(test_deque.pop(), expected.pop())
+                    self.assertEqual(test_deque.tolist(), list(expected))
+
+    def test_segments(self):
+        """Тест представления содержимого двумя сегментами без копий."""
+        test_deque = carray.cdeque('d', maxlen=4)
+        self.assertEqual(test_deque.segments(), ())
+        test_deque.extend([1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+        segments = test_deque.segments()
+        self.assertEqual(len(segments), 2)
+        self.assertEqual([x for s in segments for x in s],
+                         [3.0, 4.0, 5.0, 6.0])
+        self.assertEqual(sum(s.sum() for s in segments), 18.0)
+        segments[0][0] = 7.0
+        self.assertEqual(test_deque[0], 7.0)
+        with self.assertRaises(BufferError):
+            test_deque.append(1.0)
+        with self.assertRaises(BufferError):
+            memoryview(test_deque)
+        del segments
+        test_deque.popleft()
+        test_deque.popleft()
+        with memoryview(test_deque) as view:
+            self.assertEqual(view.tolist(), [5.0, 6.0])
+
+    def test_failed(self):
+        """Тест исключений cdeque."""
+        with self.assertRaises(ValueError):
+            carray.cdeque('i', maxlen=-1)
+        with self.assertRaises(ValueError):
+            carray.cdeque('x')
+        test_deque = carray.cdeque('b', [1])
+        with self.assertRaises(OverflowError):
+            test_deque.append(1000)
+        with self.assertRaises(TypeError):
+            test_deque.appendleft('a')
+        with self.assertRaises(IndexError):
+            test_deque[1]
+        with self.assertRaises(TypeError):
+            del test_deque[0]
+        test_deque.pop()
+        with self.assertRaises(IndexError):
+            test_deque.pop()
+        with self.assertRaises(IndexError):
+            test_deque.popleft()
+
+
+class TestCblocklist(unittest.TestCase):
+    """Тесты для блочного списка cblocklist."""
+
+    def test_compare_with_list(self):
+        """Тест совпадения поведения со списком при вставках в середину."""
+        rng = random.Random(13)
+        test_list = carray.cblocklist('i', range(5000))
+        expected = list(range(5000))
+        for _ in range(5000):
+            index = rng.randrange(-len(expected), len(expected) + 100)
+            if rng.random() < 0.5:
+                test_list.insert(index, index)
+                expected.insert(index, index)
+            else:
+                index = rng.randrange(-len(expected), len(expected))
+                self.assertEqual(test_list.pop(index), expected.pop(index))
+        self.assertEqual(len(test_list), len(expected))
+        self.assertEqual(list(test_list), expected)
+        self.assertEqual(test_list.tolist(), expected)
+
+    def test_indexing_after_edits(self):
+        """Тест индексирования после разбиения и слияния блоков."""
+        rng = random.Random(13)
+        test_list = carray.cblocklist('q', range(20000))
+        expected = list(range(20000))
+        for size in [40000, 3000, 30000, 0]:
+            while len(expected) != size:
+                index = rng.randrange(len(expected) + 1)
+                if len(expected) < size:
+                    test_list.insert(index, -index)
+                    expected.insert(index, -index)
+                else:
+                    del test_list[index % len(expected)]
+                    del expected[index % len(expected)]
+            indices = [rng.randrange(size) for _ in range(1000)] \
+                if size else []
+            self.assertEqual([test_list[i] for i in indices],
+                             [expected[i] for i in indices])
+            self.assertEqual(len(test_list), size)
+        test_list.extend(range(5000))
+        self.assertEqual(test_list[4999], 4999)
+
+    def test_sequence(self):
+        """Тест индексирования, удаления, поиска и представления."""
+        test_list = carray.cblocklist('d', [1.0, 2.0, float('nan')])
+        test_list.append(3.5)
+        test_list.extend(test_list)
+        test_list[-1] = 4.0
+        del test_list[0]
+        self.assertEqual(test_list[0], 2.0)
+        self.assertEqual(test_list[-1], 4.0)
+        self.assertIn(3.5, test_list)
+        self.assertNotIn(5.0, test_list)
+        test_list.remove(3.5)
+        test_list.remove(5.0)
+        self.assertEqual(test_list.tolist()[2:4], [1.0, 2.0])
+        self.assertEqual(repr(carray.cblocklist('h', [1, 2])),
+                         'cblocklist<short>([1, 2])')
+        with self.assertRaises(IndexError):
+            test_list[10]
+        with self.assertRaises(IndexError):
+            carray.cblocklist('i').pop()
+        with self.assertRaises(OverflowError):
+            test_list = carray.cblocklist('B', [1])
+            test_list.insert(0, 256)
+        with self.assertRaises(ValueError):
+            carray.cblocklist('x')
+
+    def test_compact(self):
+        """Тест сборки блоков обратно в непрерывный carray."""
+        test_list = carray.cblocklist('q', range(10000))
+        for i in range(0, 9000, 3):
+            del test_list[i // 3 * 2]
+        compacted = test_list.compact()
+        self.assertIsInstance(compacted, carray.carray)
+        self.assertEqual(compacted.tolist(), list(test_list))
+        self.assertEqual(memoryview(compacted).format, 'q')
+        self.assertEqual(len(carray.cblocklist('b').compact()), 0)
+
+
+class TestCpacked(unittest.TestCase):
+    """Тесты для сжатого целочисленного массива cpacked."""
+
+    def test_roundtrip(self):
+        """Тест восстановления значений всех целочисленных типов."""
+        rng = random.Random(14)
+        for typecode, low, high in [('b', -128, 127), ('B', 0, 255),
+                                    ('h', -2**15, 2**15 - 1),
+                                    ('I', 0, 2**32 - 1),
+                                    ('q', -2**63, 2**63 - 1),
+                                    ('Q', 0, 2**64 - 1)]:
+            with self.subTest(typecode=typecode):
+                values = [rng.randint(low, high) for _ in range(1000)]
+                values += [low, high, low, 0]
+                packed = carray.cpacked(typecode, values)
+                self.assertEqual(len(packed), len(values))
+                self.assertEqual(list(packed), values)
+                self.assertEqual(packed.tolist(), values)
+                self.assertEqual(packed.decompress().tolist(), values)
+                self.assertEqual(packed[-1], 0)
+                self.assertEqual(packed[129], values[129])
+
+    def test_compression(self):
+        """Тест уменьшения объёма для отсортированных идентификаторов."""
+        ids = carray.carray('q', range(10**9, 10**9 + 3 * 10**5, 3))
+        packed = carray.cpacked('q', ids)
+        self.assertLess(packed.__sizeof__() * 8, ids.__sizeof__())
+        self.assertEqual(packed.decompress().tolist(), ids.tolist())
+        self.assertEqual(carray.cpacked('i', []).tolist(), [])
+
+    def test_searchsorted(self):
+        """Тест поиска позиции по минимумам блоков."""
+        values = sorted(random.Random(14).choices(range(-5000, 5000), k=3000))
+        packed = carray.cpacked('l', values)
+        for key in range(-5100, 5100, 7):
+            self.assertEqual(packed.searchsorted(key),
+                             bisect.bisect_left(values, key))
+            self.assertEqual(packed.searchsorted(key, side='right'),
+                             bisect.bisect_right(values, key))
+        self.assertEqual(packed.searchsorted([values[0], 5000]).tolist(),
+                         [0, len(values)])
+
+    def test_searchsorted_out_of_range(self):
+        """Тест поиска значений вне диапазона типа и дробных ключей."""
+        for typecode, data in [('Q', [1, 2, 2, 3]), ('b', [-3, 0, 0, 5])]:
+            packed = carray.cpacked(typecode, carray.carray(typecode, data))
+            keys = [-1, -300, 300, 2 ** 64, -2 ** 70, 1.5, -2.5, 2.0, 0.5,
+                    math.nan, math.inf, -math.inf]
+            for side, search in [('left', bisect.bisect_left),
+                                 ('right', bisect.bisect_right)]:
+                with self.subTest(typecode=typecode, side=side):
+                    expected = [search(data, key) for key in keys]
+                    self.assertEqual([packed.searchsorted(key, side)
+                                      for key in keys], expected)
+                    self.assertEqual(packed.searchsorted(keys, side).tolist(),
+                                     expected)
+                    self.assertEqual(
+                        packed.searchsorted(iter(keys), side).tolist(),
+                        expected
+                    )
+        with self.assertRaises(TypeError):
+            packed.searchsorted(['a'])
+
+    def test_failed(self):
+        """Тест ошибок создания и доступа."""
+        with self.assertRaises(TypeError):
+            carray.cpacked('d', [1.0])
+        with self.assertRaises(OverflowError):
+            carray.cpacked('B', [256])
+        packed = carray.cpacked('i', [1, 2])
+        with self.assertRaises(IndexError):
+            packed[2]
+        with self.assertRaises(TypeError):
+            packed[0] = 3
+        with self.assertRaises(ValueError):
+            packed.searchsorted(1, side='middle')
@@ -0,0 +1,96 @@
+"""Тесты утечек памяти и ссылок в модулях carray и binary_search."""
+import unittest
+import gc
+import sys
+import tracemalloc
+
+import binary_search
+import carray
+
+
+REPEAT = 10 ** 5
+MEMORY_LIMIT = 64 * 1024
+BIG = 10 ** 12
+
+
+def run_operation(operation, repeat):
+    """Многократный вызов операции."""
+    for _ in range(repeat):
+        operation()
+
+
+def total_refcount():
+    """Общее число ссылок для отладочной сборки интерпретатора."""
+    gc.collect()
+    return sys.gettotalrefcount() if hasattr(sys, 'gettotalrefcount') else 0
+
+
+def overflow_store(test_array):
+    """Запись значения вне диапазона типа."""
+    try:
+        test_array[0] = 2 ** 64
+    except OverflowError:
+        pass
+
+
+class TestLeaks(unittest.TestCase):
+    """Тест-кейс отсутствия утечек на горячих путях."""
+
+    def assertFlatMemory(self, operation, repeat=REPEAT):
+        """Проверка неизменности памяти и числа ссылок."""
+        run_operation(operation, 1000)
+        tracemalloc.start()
+        try:
+            gc.collect()
+            refcount = total_refcount()
+            memory = tracemalloc.get_traced_memory()[0]
+            run_operation(operation, repeat)
+            gc.collect()
+            growth = tracemalloc.get_traced_memory()[0] - memory
+            refcount = total_refcount() - refcount
+        finally:
+            tracemalloc.stop()
+        self.assertLess(growth, MEMORY_LIMIT)
+        self.assertLess(refcount, 100)
+
+    def test_carray(self):
+        """Тест операций над carray."""
+        test_array = carray.carray('q', [BIG, BIG + 1, BIG + 2])
+        operations = {
+            'get_item': lambda: test_array[1],
+            'iterate': lambda: list(test_array),
+            'pop_append': lambda: test_array.append(test_array.pop()),
+            'sizeof': test_array.__sizeof__,
+            'repr': lambda: repr(test_array),
+            'store': lambda: test_array.__setitem__(0, BIG),
+            'overflow': lambda: overflow_store(test_array),
+            'slice': lambda: test_array[1:],
+            'compare': lambda: test_array == [BIG, BIG + 1, BIG + 2],
+            'sum': test_array.sum,
+            'create': lambda: carray.carray('d', [1.5, 2.5]),
+        }
+        for name, operation in operations.items():
+            with self.subTest(operation=name):
+                self.assertFlatMemory(operation)
+
+    def test_binary_search(self):
+        """Тест функции binary_search."""
+        data = [BIG + i for i in range(64)]
+        test_array = carray.carray('q', data)
+        operations = {
+            'found': lambda: binary_search.binary_search(data, BIG + 7),
+            'missing': lambda: binary_search.binary_search(data, BIG + 99),
+            'range': lambda: binary_search.binary_search(
+                range(BIG, BIG + 64), BIG + 7
+            ),
+            'carray': lambda: binary_search.binary_search(test_array,
+                                                          BIG + 7),
+            'string': lambda: binary_search.binary_search('abcd', 'c'),
+        }
+        for name, operation in operations.items():
+            with self.subTest(operation=name):
+                self.assertFlatMemory(operation)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -26,7 +26,7 @@ from random import randint
 import pygame
 import pygame_menu
 
-from particle import Particle, Vector, FPS
+from particle import ParticleSystem, FPS
 from quadtree import QuadTree, Rectangle
 
 
@@ -64,7 +64,7 @@ def resize(menu: pygame_menu.Menu, size: tuple[float]):
 
 
 def create_particles(screen: pygame.Surface, num: int, size: tuple[float],
-                     speed: tuple[float]) -> tuple[Particle]:
+                     speed: tuple[float]) -> ParticleSystem:
     """Создать частицы.
 
     Аргументы:
@@ -73,33 +73,34 @@ def create_particles(screen: pygame.Surface, num: int, size: tuple[float],
         size: tuple[float] - границы длин радиусов
         speed: tuple[float] - границы скорости
 
-    Возвращает кортеж с созданными частицами.
+    Возвращает систему с созданными частицами.
 
     """
-    particles = tuple()
+    radii, positions, speeds = [], [], []
     x, y, = 0, 0
     for _ in range(num):
         radius = randint(round(size[0]), round(size[1]))
         if x + radius * 2 + 4 >= screen.get_width():
             x = 0
             y += size[1] * 2 + 4
-        pos = Vector(x + radius + 4, y + radius + 4)
+        positions.append((x + radius + 4, y + radius + 4))
         x = x + radius * 2 + 4
         hspeed = (randint(0, 1) * 2 - 1) * randint(round(speed[0]),
                                                    round(speed[1]))
         vspeed = (randint(0, 1) * 2 - 1) * randint(round(speed[0]),
                                                    round(speed[1]))
-        particles += (Particle(screen, radius, pos, Vector(hspeed, vspeed)),)
-    return particles
+        radii.append(radius)
+        speeds.append((hspeed, vspeed))
+    return ParticleSystem(screen, radii, positions, speeds)
 
 
-def draw_particles(screen: pygame.Surface, particles: tuple[Particle],
+def draw_particles(screen: pygame.Surface, particles: ParticleSystem,
                    area: Rectangle, tree_visible: bool, area_visible: bool):
     """Отрисовать частицы.
 
     Аргументы:
         screen: pygame.Surface - экран, на котором будут отрисованы частицы
-        particles: tuple[Particle] - кортеж частиц
+        particles: ParticleSystem - система частиц
         area: Rectangle - область для проверки частиц на вхождение
         tree_visible: bool - флаг видимости дерева
         area_visible: bool - флаг видимости области
@@ -109,11 +110,14 @@ def draw_particles(screen: pygame.Surface, particles: tuple[Particle],
         None, screen, Rectangle(0, 0, *screen.get_size()), 4, tree_visible
     )
 
+    particles.dynamic()
+    particles.draw((0, 255, 0))
     for particle in particles:
-        particle.dynamic()
         quadtree.insert(particle)
 
-    quadtree.handle_collisions()
+    particles.handle_collisions([(first.index, second.index)
+                                 for first, second in quadtree.get_pairs()])
+    quadtree.draw()
 
     if area_visible:
         area.move(*pygame.mouse.get_pos())
@@ -144,7 +148,7 @@ def main():
 
     tree_visible, area_visible = False, False
     area = Rectangle(0, 0, 0, 0, (255, 255, 0), 2)
-    particles = tuple()
+    particles = ParticleSystem(screen, (), (), ())
 
     run = True
     while run:
@@ -4,6 +4,7 @@
 
 Импорты:
     from math import ... - для вычислений
+    import numpy as np - для векторизованных вычислений
     from pygame import ... - для отрисовки кадров
 
 Константы:
@@ -13,6 +14,8 @@
 Классы:
     Vector - класс вектора
     Particle - класс частицы
+    ParticleView - класс представления частицы системы
+    ParticleSystem - класс системы частиц
 
 Функции:
     check_collision - проверить, произошло ли столкновение частиц
@@ -21,6 +24,7 @@
 """
 from math import sqrt, pi
 
+import numpy as np
 from pygame import Surface, draw
 
 
@@ -132,6 +136,231 @@ class Particle:
         draw.circle(self.screen, color, (self.pos.x, self.pos.y), self.radius)
 
 
+class ParticleView:
+    """Класс представления частицы системы.
+
+    Дает доступ к одной частице системы через интерфейс Particle,
+    чтобы с ней могли работать квадродерево и отрисовка.
+
+    Методы:
+        shift - сместить
+        draw - отрисовать
+
+    """
+
+    def __init__(self, system, index: int):
+        """Инициализировать.
+
+        Аргументы:
+            system: ParticleSystem - система частиц
+            index: int - индекс частицы в системе
+
+        """
+        self.system = system
+        self.index = index
+
+    @property
+    def screen(self) -> Surface:
+        """Экран, на котором будет отрисована частица."""
+        return self.system.screen
+
+    @property
+    def radius(self) -> float:
+        """Радиус."""
+        return float(self.system.radius[self.index])
+
+    @property
+    def weight(self) -> float:
+        """Масса."""
+        return float(self.system.weight[self.index])
+
+    @property
+    def pos(self) -> Vector:
+        """Позиция."""
+        return Vector(*self.system.pos[self.index].tolist())
+
+    @pos.setter
+    def pos(self, pos: Vector):
+        self.system.pos[self.index] = pos.x, pos.y
+
+    @property
+    def speed(self) -> Vector:
+        """Скорость."""
+        return Vector(*self.system.speed[self.index].tolist())
+
+    @speed.setter
+    def speed(self, speed: Vector):
+        self.system.speed[self.index] = speed.x, speed.y
+
+    @property
+    def acceleration(self) -> Vector:
+        """Ускорение."""
+        return Vector(*self.system.acceleration[self.index].tolist())
+
+    def shift(self, shift: Vector):
+        """Сместить на shift."""
+        self.system.pos[self.index] += shift.x, shift.y
+
+    def draw(self, color):
+        """Отрисовать с цветом (color)."""
+        x, y = self.system.pos[self.index].tolist()
+        draw.circle(self.screen, color, (x, y), self.radius)
+
+
+class ParticleSystem:
+    """Класс системы частиц.
+
+    Хранит позиции, скорости, ускорения, радиусы и массы частиц
+    в непрерывных массивах NumPy и выполняет динамику сразу
+    над всеми частицами.
+
+    Методы:
+        from_particles - создать систему из частиц
+        dynamic - выполнить динамику
+        handle_border_collision - разрешить столкновения с границей экрана
+        handle_collisions - разрешить столкновения пар частиц
+        draw - отрисовать
+
+    """
+
+    def __init__(self, screen: Surface, radius, pos, speed,
+                 acceleration=None):
+        """Инициализировать.
+
+        Аргументы:
+            screen: Surface - экран, на котором будут отрисованы частицы
+            radius - радиусы, последовательность длины n
+            pos - позиции, последовательность пар (x, y) длины n
+            speed - скорости, последовательность пар (x, y) длины n
+            acceleration - ускорения, последовательность пар (x, y)
+                длины n, по умолчанию нулевые
+
+        """
+        self.screen = screen
+        self.radius = np.array(radius, dtype=np.float64)
+        self.weight = pi * self.radius ** 2
+        self.pos = np.array(pos, dtype=np.float64).reshape(-1, 2)
+        self.speed = np.array(speed, dtype=np.float64).reshape(-1, 2)
+        if acceleration is None:
+            self.acceleration = np.zeros_like(self.pos)
+        else:
+            self.acceleration = np.array(
+                acceleration, dtype=np.float64
+            ).reshape(-1, 2)
+        self._buffer = np.empty_like(self.pos)
+        self._masks = np.empty((3, *self.pos.shape), dtype=bool)
+        self._views = None
+
+    @classmethod
+    def from_particles(cls, screen: Surface, particles):
+        """Создать систему на экране (screen) из частиц (particles)."""
+        return cls(screen, [particle.radius for particle in particles],
+                   [(particle.pos.x, particle.pos.y)
+                    for particle in particles],
+                   [(particle.speed.x, particle.speed.y)
+                    for particle in particles],
+                   [(particle.acceleration.x, particle.acceleration.y)
+                    for particle in particles])
+
+    @property
+    def particles(self) -> tuple[ParticleView]:
+        """Представления частиц системы."""
+        if self._views is None:
+            self._views = tuple(ParticleView(self, index)
+                                for index in range(len(self)))
+        return self._views
+
+    def __len__(self) -> int:
+        """Получить количество частиц."""
+        return len(self.radius)
+
+    def __getitem__(self, index: int) -> ParticleView:
+        """Получить представление частицы по индексу."""
+        return self.particles[index]
+
+    def __iter__(self):
+        """Перебрать представления частиц."""
+        return iter(self.particles)
+
+    def dynamic(self):
+        """Выполнить динамику всех частиц."""
+        np.multiply(self.acceleration, DT, out=self._buffer)
+        self.speed += self._buffer
+        np.multiply(self.speed, DT, out=self._buffer)
+        self.pos += self._buffer
+        self.handle_border_collision()
+
+    def handle_border_collision(self):
+        """Разрешить столкновения с границей экрана."""
+        low, high, moving = self._masks
+        radius = self.radius[:, np.newaxis]
+        np.subtract(self.pos, radius, out=self._buffer)
+        np.less_equal(self._buffer, 0, out=low)
+        np.add(self.pos, radius, out=self._buffer)
+        np.greater_equal(self._buffer, self.screen.get_size(), out=high)
+        np.logical_not(low, out=moving)
+        high &= moving
+        np.less(self.speed, 0, out=moving)
+        low &= moving
+        np.greater(self.speed, 0, out=moving)
+        high &= moving
+        low |= high
+        np.negative(self.speed, out=self.speed, where=low)
+
+    def handle_collisions(self, pairs):
+        """Разрешить столкновения пар частиц (pairs).
+
+        Аргументы:
+            pairs - пары индексов частиц-кандидатов, массив формы (k, 2)
+
+        Повторяющиеся пары отбрасываются. Изменения скоростей от всех
+        столкновений считаются по скоростям до их разрешения и
+        суммируются, поэтому результат не зависит от порядка пар.
+
+        """
+        pairs = np.asarray(pairs, dtype=np.intp).reshape(-1, 2)
+        keys = np.minimum(pairs[:, 0], pairs[:, 1]) * len(self)
+        keys += np.maximum(pairs[:, 0], pairs[:, 1])
+        keys.sort()
+        distinct = np.empty(len(keys), dtype=bool)
+        distinct[:1] = True
+        np.not_equal(keys[1:], keys[:-1], out=distinct[1:])
+        first, second = np.divmod(keys[distinct], max(len(self), 1))
+        distinct = first != second
+        first, second = first[distinct], second[distinct]
+
+        normal = self.pos[second] - self.pos[first]
+        distance = np.hypot(normal[:, 0], normal[:, 1])
+        colliding = ((distance <= self.radius[first] + self.radius[second])
+                     & (distance > 0))
+        first, second = first[colliding], second[colliding]
+        normal = normal[colliding] / distance[colliding, np.newaxis]
+
+        first_weight, second_weight = self.weight[first], self.weight[second]
+        relative = np.einsum('ij,ij->i', normal,
+                             self.speed[second] - self.speed[first])
+        impulse = 2 * relative / (first_weight + second_weight)
+        first_change = normal * (impulse * second_weight)[:, np.newaxis]
+        second_change = normal * (-impulse * first_weight)[:, np.newaxis]
+
+        change = np.empty_like(self.speed)
+        for axis in range(2):
+            change[:, axis] = (
+                np.bincount(first, first_change[:, axis], len(self))
+                + np.bincount(second, second_change[:, axis], len(self))
+            )
+        self.speed += change
+        change *= DT
+        self.pos += change
+
+    def draw(self, color):
+        """Отрисовать все частицы с цветом (color)."""
+        for x, y, radius in zip(self.pos[:, 0].tolist(),
+                                self.pos[:, 1].tolist(),
+                                self.radius.tolist()):
+            draw.circle(self.screen, color, (x, y), radius)
+
+
 def check_collision(first: Particle, second: Particle) -> bool:
     """Проверить столкновение двух частиц."""
     return (second.pos - first.pos).length() <= first.radius + second.radius
@@ -3,6 +3,7 @@
 Содержит необходимые элементы для реализации квадродерева.
 
 Импорты:
+    from itertools import ... - для перебора пар частиц
     from math import ... - для вычислений
     from pygame import ... - для отрисовки кадров
     from particle import ... - для взаимодействия с частицами
@@ -15,6 +16,7 @@
     QuadTree - класс квадродерева
 
 """
+from itertools import combinations
 from math import sqrt
 
 from pygame import Surface, draw
@@ -98,7 +100,9 @@ class QuadTree:
         remove - удалить частицу
         get_particles - получить все частицы, попадающие в квадрант
         query - получить частицы, попадающие в область
+        get_pairs - получить пары частиц, которые могут столкнуться
         handle_collisions - разрешить столкновения частиц
+        draw - отрисовать
 
     """
 
@@ -209,6 +213,16 @@ class QuadTree:
                     particles.add(particle)
         return particles
 
+    def get_pairs(self) -> set[tuple[Particle]]:
+        """Получить пары частиц из общих квадрантов."""
+        pairs = set(combinations(self.particles, 2))
+        if self.north_west is not None:
+            pairs |= self.north_west.get_pairs()
+            pairs |= self.north_east.get_pairs()
+            pairs |= self.south_west.get_pairs()
+            pairs |= self.south_east.get_pairs()
+        return pairs
+
     def handle_collisions(self):
         """Разрешить столкновения частиц."""
         num = len(self.particles)
@@ -224,3 +238,13 @@ class QuadTree:
             self.south_east.handle_collisions()
         if self.visible:
             self.border.draw(self.screen)
+
+    def draw(self):
+        """Отрисовать границы квадрантов."""
+        if self.north_west is not None:
+            self.north_west.draw()
+            self.north_east.draw()
+            self.south_west.draw()
+            self.south_east.draw()
+        if self.visible:
+            self.border.draw(self.screen)
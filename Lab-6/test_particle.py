@@ -0,0 +1,185 @@
+"""Тесты для модулей particle и quadtree."""
+import os
+from random import Random
+from unittest import TestCase
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+from pygame import Surface
+
+from particle import (Particle, ParticleSystem, Vector, check_collision,
+                      handle_collision)
+from quadtree import QuadTree, Rectangle
+
+
+WIDTH, HEIGHT = 400, 300
+FRAMES = 240
+
+
+def create_particles(screen: Surface, num: int, seed: int) -> list:
+    """Создать частицы со случайными позициями, скоростями и ускорениями."""
+    rng = Random(seed)
+    return [Particle(screen, rng.randint(1, 20),
+                     Vector(rng.uniform(-10, WIDTH + 10),
+                            rng.uniform(-10, HEIGHT + 10)),
+                     Vector(rng.uniform(-400, 400), rng.uniform(-400, 400)),
+                     Vector(rng.uniform(-50, 50), rng.uniform(-50, 50)))
+            for _ in range(num)]
+
+
+def get_state(particles: list) -> tuple:
+    """Получить позиции и скорости частиц в виде массивов."""
+    return (np.array([(p.pos.x, p.pos.y) for p in particles]),
+            np.array([(p.speed.x, p.speed.y) for p in particles]))
+
+
+class TestParticleSystem(TestCase):
+    """Тест-кейс системы частиц."""
+
+    def setUp(self):
+        """Создать экран."""
+        self.screen = Surface((WIDTH, HEIGHT))
+
+    def test_dynamic(self):
+        """Тест совпадения динамики системы с динамикой частиц."""
+        particles = create_particles(self.screen, 300, 24)
+        system = ParticleSystem.from_particles(self.screen, particles)
+        bounces = 0
+        for _ in range(FRAMES):
+            previous = system.speed.copy()
+            for particle in particles:
+                particle.dynamic()
+            system.dynamic()
+            bounces += np.count_nonzero(np.sign(previous)
+                                        != np.sign(system.speed))
+            pos, speed = get_state(particles)
+            np.testing.assert_allclose(system.pos, pos, rtol=0, atol=1e-9)
+            np.testing.assert_allclose(system.speed, speed, rtol=0,
+                                       atol=1e-9)
+        self.assertGreater(bounces, 100)
+
+    def test_view(self):
+        """Тест представления частицы системы."""
+        system = ParticleSystem(self.screen, [2, 3], [(10, 20), (30, 40)],
+                                [(1, 2), (3, 4)])
+        self.assertEqual(len(system), 2)
+        view = system[1]
+        self.assertIs(view, system.particles[1])
+        self.assertEqual(view.pos, Vector(30, 40))
+        self.assertEqual(view.radius, 3)
+        self.assertAlmostEqual(view.weight, np.pi * 9)
+        view.shift(Vector(1, -1))
+        view.speed = Vector(5, 6)
+        self.assertEqual(system.pos[1].tolist(), [31, 39])
+        self.assertEqual(system.speed[1].tolist(), [5, 6])
+        view.draw((0, 255, 0))
+
+        quadtree = QuadTree(None, self.screen,
+                            Rectangle(0, 0, WIDTH, HEIGHT), 1, False)
+        for particle in system:
+            quadtree.insert(particle)
+        self.assertEqual(quadtree.get_particles(), set(system))
+        self.assertEqual(len(ParticleSystem(self.screen, (), (), ())), 0)
+
+
+class TestCollisions(TestCase):
+    """Тест-кейс пакетного разрешения столкновений."""
+
+    def setUp(self):
+        """Создать экран."""
+        self.screen = Surface((WIDTH, HEIGHT))
+
+    def test_disjoint_pairs(self):
+        """Тест совпадения с handle_collision для непересекающихся пар."""
+        rng = Random(25)
+        particles, pairs = [], []
+        for index in range(0, 400, 2):
+            first = Particle(self.screen, rng.randint(2, 10),
+                             Vector(rng.uniform(0, WIDTH),
+                                    rng.uniform(0, HEIGHT)),
+                             Vector(rng.uniform(-99, 99),
+                                    rng.uniform(-99, 99)))
+            angle = rng.uniform(0, 2 * np.pi)
+            distance = rng.uniform(0.5, 1.5) * (first.radius + 10)
+            second = Particle(self.screen, 10,
+                              Vector(first.pos.x + distance * np.cos(angle),
+                                     first.pos.y + distance * np.sin(angle)),
+                              Vector(rng.uniform(-99, 99),
+                                     rng.uniform(-99, 99)))
+            particles += [first, second]
+            pairs.append((index, index + 1))
+        system = ParticleSystem.from_particles(self.screen, particles)
+        colliding = 0
+        for first, second in pairs:
+            if check_collision(particles[first], particles[second]):
+                handle_collision(particles[first], particles[second])
+                colliding += 1
+        self.assertGreater(colliding, 0)
+        self.assertLess(colliding, len(pairs))
+        system.handle_collisions(pairs[::-1] + [(b, a) for a, b in pairs]
+                                 + [(0, 0)])
+        pos, speed = get_state(particles)
+        np.testing.assert_allclose(system.pos, pos, rtol=0, atol=1e-9)
+        np.testing.assert_allclose(system.speed, speed, rtol=0, atol=1e-9)
+
+    def test_several_contacts(self):
+        """Тест частицы, участвующей в нескольких столкновениях."""
+        args = (self.screen, [5, 5, 5], [(100, 100), (108, 100), (92, 100)],
+                [(10, 5), (-20, 0), (30, -5)])
+        system = ParticleSystem(*args)
+        system.handle_collisions([(0, 1), (2, 0)])
+        change = np.zeros((3, 2))
+        for pair in [(0, 1), (0, 2)]:
+            single = ParticleSystem(*args)
+            single.handle_collisions([pair])
+            change += single.speed - ParticleSystem(*args).speed
+        np.testing.assert_allclose(system.speed,
+                                   ParticleSystem(*args).speed + change)
+
+        particles = create_particles(self.screen, 500, 25)
+        first = ParticleSystem.from_particles(self.screen, particles)
+        second = ParticleSystem.from_particles(self.screen, particles)
+        momentum = (first.speed * first.weight[:, np.newaxis]).sum(axis=0)
+        pairs = [(i, j) for i in range(500) for j in range(i + 1, 500)]
+        first.handle_collisions(pairs)
+        Random(25).shuffle(pairs)
+        second.handle_collisions(np.array(pairs)[:, ::-1])
+        np.testing.assert_array_equal(first.speed, second.speed)
+        np.testing.assert_array_equal(first.pos, second.pos)
+        np.testing.assert_allclose(
+            (first.speed * first.weight[:, np.newaxis]).sum(axis=0),
+            momentum, rtol=1e-9
+        )
+
+    def test_empty_pairs(self):
+        """Тест пустого списка пар."""
+        particles = create_particles(self.screen, 10, 25)
+        system = ParticleSystem.from_particles(self.screen, particles)
+        pos, speed = system.pos.copy(), system.speed.copy()
+        system.handle_collisions([])
+        system.handle_collisions(np.empty((0, 2), dtype=int))
+        np.testing.assert_array_equal(system.pos, pos)
+        np.testing.assert_array_equal(system.speed, speed)
+        ParticleSystem(self.screen, (), (), ()).handle_collisions([])
+
+    def test_quadtree_pairs(self):
+        """Тест полноты пар-кандидатов квадродерева."""
+        system = ParticleSystem.from_particles(
+            self.screen, create_particles(self.screen, 300, 25)
+        )
+        # subdivide делит размеры нацело, поэтому граница кратна степени 2
+        quadtree = QuadTree(None, self.screen,
+                            Rectangle(0, 0, 512, 512), 4, False)
+        for particle in system:
+            quadtree.insert(particle)
+        candidates = {frozenset((first.index, second.index))
+                      for first, second in quadtree.get_pairs()}
+        inside = [particle for particle in system
+                  if quadtree.border.contains(particle)]
+        for first in inside:
+            for second in inside:
+                if (first.index < second.index
+                        and check_collision(first, second)):
+                    self.assertIn(frozenset((first.index, second.index)),
+                                  candidates)